@@ -0,0 +1,38 @@
+from datetime import date
+
+import pytest
+
+import generate_irs_audit_defense_playbook as playbook
+
+# The reference build: compact bytes are reproducible for a fixed date.
+EFFECTIVE_DATE = date(2026, 1, 15)
+
+
+def pytest_addoption(parser):
+    parser.addoption("--run-slow", action="store_true", help="also run tests marked slow (minutes each)")
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "slow: takes minutes; runs only with --run-slow")
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--run-slow"):
+        return
+    skip = pytest.mark.skip(reason="slow; run with --run-slow")
+    for item in items:
+        if "slow" in item.keywords:
+            item.add_marker(skip)
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    """Keep render, fragment and preview caches out of the user's cache directory."""
+    directory = tmp_path / "cache"
+    monkeypatch.setenv("PLAYBOOK_CACHE_DIR", str(directory))
+    return directory
+
+
+@pytest.fixture
+def options():
+    return playbook.PlaybookOptions(effective_date=EFFECTIVE_DATE, compact=True)
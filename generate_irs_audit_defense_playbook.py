@@ -5,694 +5,1214 @@ Ross Tax Prep & Bookkeeping LLC
 EIN: 33-4891499
 
 Generates a comprehensive, branded PDF playbook for IRS audit response procedures.
+
+The module is importable without side effects; reportlab is only imported when a
+document is actually rendered.
+
+    from generate_irs_audit_defense_playbook import build_playbook
+    build_playbook("playbook.pdf")          # write to a path
+    build_playbook(fileobj)                 # write to a binary file-like object
+    pdf_bytes = build_playbook()            # return the PDF as bytes
+    view = build_playbook(as_view=True)     # return a memoryview, without copying
+    build_playbook(sys.stdout.buffer)       # stream to stdout
+
+Command line:
+
+    python generate_irs_audit_defense_playbook.py [-o OUTPUT|-] [--effective-date YYYY-MM-DD]
+    python generate_irs_audit_defense_playbook.py --manifest clients.csv --output-dir out/ [--workers N]
+    python generate_irs_audit_defense_playbook.py --compact [--timestamp 2026-01-15T00:00:00]
+    python generate_irs_audit_defense_playbook.py --stream -o binder.pdf
+    python generate_irs_audit_defense_playbook.py --parallel [--workers N]
+    python generate_irs_audit_defense_playbook.py --check
+    python generate_irs_audit_defense_playbook.py --format html|markdown [-o OUTPUT|-]
+    python generate_irs_audit_defense_playbook.py --watch [-o OUTPUT]
+    python generate_irs_audit_defense_playbook.py --locale es | --locales en,es [-o OUTPUT]
+    python generate_irs_audit_defense_playbook.py --packets packets.jsonl --output-dir out/ [--workers N]
+    python generate_irs_audit_defense_playbook.py --previews [-o OUTPUT | --manifest … | --packets …]
+    python generate_irs_audit_defense_playbook.py --diff HEAD~1 [-o OUTPUT]
+    python generate_irs_audit_defense_playbook.py --encrypt [--recipient NAME -o OUTPUT | --manifest … | --packets …]
+
+``-o -`` writes the PDF to stdout and the summary to stderr. ``--compact``
+compresses page streams and writes reproducible bytes: identical inputs give
+identical files, so stored copies can be deduplicated by content hash. The
+``--manifest`` form renders one personalized playbook per client row in
+parallel (see ``playbook_batch.py``).
+
+The table of contents and the PDF outline are generated from the section
+headings, with page numbers remembered from the previous build. ``--stream``
+lays the document out in parts and writes each as it is finished, so memory
+stays flat however long it is (see ``playbook_stream.py``). ``--parallel``
+lays the sections out in worker processes and stitches the pages, adding
+running headers and "Page N of M" footers (see ``playbook_parallel.py``).
+
+``--format html`` and ``--format markdown`` emit web editions from the same
+content and brand colors, cached beside the PDFs (see
+``playbook_formats.py``). ``--check`` validates the content (markup, table
+widths against the page frame, table of contents) in milliseconds without
+rendering anything, and exits non-zero on any problem (see
+``playbook_check.py``). ``--watch`` rebuilds the PDF on every save of
+``playbook_content.py``, laying out only the sections that changed (see
+``playbook_watch.py``).
+
+``--locale es`` renders the Spanish edition; ``--locales en,es`` renders
+several languages in parallel, sharing one set of styles (see
+``playbook_locales.py``). ``--packets`` assembles evidence packets: a Script
+#2 cover letter and evidence index followed by the client's source PDFs,
+merged with bounded memory (see ``playbook_packet.py``). ``--previews`` adds
+PNG page thumbnails in a content-addressed ``previews`` directory next to
+the PDFs, drawing only pages not seen before (see ``playbook_preview.py``).
+``--diff`` re-issues the playbook after a content edit with a change log
+against an earlier version (a git revision or a copy of the content file)
+beside it, re-rendering only the changed sections (see ``playbook_diff.py``).
+``--encrypt`` password-protects each PDF for its recipient and writes a
+detached signature beside it, using keys derived from ``ENCRYPTION_KEY``
+once per worker (see ``playbook_protect.py``).
 """
 
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.pagesizes import LETTER
-from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_JUSTIFY
-from reportlab.lib import colors
-from datetime import datetime
+import argparse
+import calendar
+import io
 import os
-
-# Output file path
+import re
+import sys
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Optional
+from xml.sax.saxutils import escape, unescape
+
+from playbook_content import CLASSIFICATION_RULES
+from playbook_locales import DEFAULT_LOCALE, LOCALES, format_date, translate
+
+# Default output file path
 output_dir = os.path.dirname(os.path.abspath(__file__))
 file_path = os.path.join(output_dir, "IRS_Audit_Defense_Playbook_ROSS_TAX_PREP.pdf")
 
 # Company branding colors
-BRAND_NAVY = colors.HexColor("#0A2540")
-BRAND_GOLD = colors.HexColor("#D4AF37")
-LIGHT_GRAY = colors.HexColor("#F4F6F8")
-ACCENT_RED = colors.HexColor("#C41E3A")
-
-# Document setup
-doc = SimpleDocTemplate(
-    file_path,
-    pagesize=LETTER,
-    rightMargin=48,
-    leftMargin=48,
-    topMargin=48,
-    bottomMargin=48,
-    title="IRS Audit Defense Playbook",
-    author="Ross Tax Prep & Bookkeeping LLC",
-)
-
-# Define custom styles
-styles = getSampleStyleSheet()
-
-title_style = ParagraphStyle(
-    "TitleStyle",
-    parent=styles["Heading1"],
-    fontSize=24,
-    textColor=BRAND_NAVY,
-    alignment=TA_CENTER,
-    spaceAfter=6,
-    spaceBefore=12,
-    fontName="Helvetica-Bold"
-)
-
-subtitle_style = ParagraphStyle(
-    "SubtitleStyle",
-    parent=styles["Normal"],
-    fontSize=12,
-    textColor=BRAND_GOLD,
-    alignment=TA_CENTER,
-    spaceAfter=20,
-    fontName="Helvetica"
-)
-
-header_style = ParagraphStyle(
-    "HeaderStyle",
-    parent=styles["Heading2"],
-    fontSize=14,
-    textColor=BRAND_NAVY,
-    alignment=TA_LEFT,
-    spaceAfter=12,
-    spaceBefore=12,
-    fontName="Helvetica-Bold"
-)
-
-body_style = ParagraphStyle(
-    "BodyStyle",
-    parent=styles["Normal"],
-    fontSize=10,
-    alignment=TA_JUSTIFY,
-    spaceAfter=10,
-    leading=14,
-    fontName="Helvetica"
-)
-
-warning_style = ParagraphStyle(
-    "WarningStyle",
-    parent=styles["Normal"],
-    fontSize=10,
-    textColor=ACCENT_RED,
-    alignment=TA_LEFT,
-    spaceAfter=10,
-    fontName="Helvetica-Bold"
-)
-
-# Build document content
-content = []
-
-# ===== COVER PAGE =====
-content.append(Spacer(1, 0.5 * 72))
-content.append(Paragraph("IRS AUDIT DEFENSE PLAYBOOK", title_style))
-content.append(Paragraph("Ross Tax Prep &amp; Bookkeeping LLC", subtitle_style))
-content.append(Spacer(1, 12))
-
-# Company info
-company_info = Table(
-    [
-        ["Business Name:", "Ross Tax Prep &amp; Bookkeeping LLC"],
-        ["EIN:", "33-4891499"],
-        ["Location:", "Killeen &amp; Temple, Texas"],
-        ["Document Type:", "Confidential | Internal Use Only"],
-        ["Effective Date:", datetime.now().strftime("%B %d, %Y")],
-        ["Classification:", "CONFIDENTIAL - Attorney-Client Privileged"]
-    ],
-    colWidths=[150, 300]
-)
-company_info.setStyle(TableStyle([
-    ("BACKGROUND", (0, 0), (0, -1), LIGHT_GRAY),
-    ("TEXTCOLOR", (0, 0), (-1, -1), BRAND_NAVY),
-    ("ALIGN", (0, 0), (-1, -1), "LEFT"),
-    ("FONTNAME", (0, 0), (0, -1), "Helvetica-Bold"),
-    ("FONTSIZE", (0, 0), (-1, -1), 10),
-    ("BOTTOMPADDING", (0, 0), (-1, -1), 6),
-    ("TOPPADDING", (0, 0), (-1, -1), 6),
-    ("GRID", (0, 0), (-1, -1), 0.5, colors.grey)
-]))
-content.append(company_info)
-content.append(Spacer(1, 24))
-
-# Confidentiality notice
-content.append(Paragraph(
-    "<b>CONFIDENTIALITY NOTICE</b>",
-    header_style
-))
-content.append(Paragraph(
-    "This document is privileged and confidential attorney work product and is intended solely for the use "
-    "of Ross Tax Prep &amp; Bookkeeping LLC and its authorized representatives. If you are not the intended "
-    "recipient, please do not read, distribute, or take action based on this document. Unauthorized disclosure "
-    "may waive attorney-client privilege.",
-    body_style
-))
-
-content.append(PageBreak())
-
-# ===== TABLE OF CONTENTS =====
-content.append(Paragraph("TABLE OF CONTENTS", header_style))
-content.append(Spacer(1, 12))
-
-toc_items = [
-    "1. Purpose &amp; Scope",
-    "2. Core Audit Defense Principles",
-    "3. IRS Notice Classification &amp; Response Timeline",
-    "4. Notice Receipt &amp; Logging Procedures",
-    "5. Staffing &amp; Communication Authorization Matrix",
-    "6. Evidence Retention &amp; Document Management",
-    "7. Approved IRS Communication Scripts",
-    "8. Audit Response Procedures",
-    "9. Escalation Thresholds &amp; Triggers",
-    "10. Staff Training &amp; Compliance",
-    "11. Post-Audit Review &amp; Remediation",
-    "12. Emergency Contact Protocols",
-]
-
-for item in toc_items:
-    content.append(Paragraph(item, body_style))
-
-content.append(PageBreak())
-
-# ===== SECTION 1: PURPOSE & SCOPE =====
-content.append(Paragraph("1. PURPOSE &amp; SCOPE", header_style))
-content.append(Spacer(1, 8))
-
-content.append(Paragraph(
-    "<b>Objective:</b> This playbook establishes centralized procedures for managing IRS notices, audit inquiries, "
-    "and related compliance matters to minimize risk, protect client confidentiality, and ensure consistent, defensible responses.",
-    body_style
-))
-
-content.append(Spacer(1, 12))
-content.append(Paragraph(
-    "<b>Scope:</b> This playbook applies to all staff members, contractors, and partners involved in tax preparation, "
-    "audit defense, or IRS communication at Ross Tax Prep &amp; Bookkeeping LLC.",
-    body_style
-))
-
-content.append(Spacer(1, 12))
-content.append(Paragraph(
-    "<b>Authority:</b> This procedure is authorized under IRC &#167;6001 (Records), Treasury Regulation &#167;1.6001-1 "
-    "(Records and their retention), and Circular 230 (Standards for tax practitioners).",
-    body_style
-))
-
-# ===== SECTION 2: CORE PRINCIPLES =====
-content.append(Spacer(1, 16))
-content.append(Paragraph("2. CORE AUDIT DEFENSE PRINCIPLES", header_style))
-content.append(Spacer(1, 8))
-
-principles_data = [
-    [Paragraph("<b>Principle</b>", styles["Normal"]), Paragraph("<b>Description</b>", styles["Normal"])],
-    [
-        Paragraph("Centralized Communication", body_style),
-        Paragraph(
-            "All IRS communication is handled exclusively by the Audit Defense Team (Admin + CTO). "
-            "No direct staff-to-IRS contact is permitted.",
-            body_style
+BRAND_NAVY = "#0A2540"
+BRAND_GOLD = "#D4AF37"
+LIGHT_GRAY = "#F4F6F8"
+ACCENT_RED = "#C41E3A"
+
+DOCUMENT_TITLE = "IRS Audit Defense Playbook"
+DOCUMENT_AUTHOR = "Ross Tax Prep & Bookkeeping LLC"
+
+# Layout passes allowed when the table of contents' page numbers turn out stale
+MAX_LAYOUT_PASSES = 3
+
+# Parsed paragraph markups kept per process (see ParagraphCache)
+PARAGRAPH_CACHE_ENTRIES = 4096
+
+# Response deadlines from the Section 3 classification table, in days from the notice date
+RESPONSE_DEADLINE_DAYS = {rule["classification"]: rule["deadline_days"] for rule in CLASSIFICATION_RULES}
+
+_styles = None
+_table_styles = None
+_compiled = None
+_localized = {}
+_anchor_class = None
+_page_numbers = {}
+_paragraphs = None
+
+
+@dataclass
+class PlaybookOptions:
+    """Per-build inputs for the playbook. Client fields personalize the document."""
+
+    effective_date: Optional[date] = None  # defaults to today
+    client_name: Optional[str] = None
+    notice_code: Optional[str] = None
+    notice_date: Optional[date] = None
+    classification: Optional[str] = None
+    # Size-optimized, reproducible output: compressed page streams and
+    # reportlab's invariant mode, with ``timestamp`` (default: midnight UTC on
+    # the effective date) as the creation date.
+    compact: bool = False
+    timestamp: Optional[datetime] = None
+    # Language of the document; see playbook_locales.LOCALES.
+    locale: str = DEFAULT_LOCALE
+
+    def effective_date_text(self):
+        return format_date(self.effective_date or date.today(), self.locale)
+
+    @property
+    def personalized(self):
+        return any((self.client_name, self.notice_code, self.notice_date, self.classification))
+
+    def creation_timestamp(self):
+        """Epoch seconds to record as the creation date of a compact build, else None."""
+        if not self.compact:
+            return None
+        if self.timestamp is not None:
+            if self.timestamp.tzinfo is None:
+                return calendar.timegm(self.timestamp.timetuple())
+            return self.timestamp.timestamp()
+        return calendar.timegm((self.effective_date or date.today()).timetuple())
+
+    def response_deadline(self):
+        """Deadline per the Section 3 table, or None if the notice date or classification is unknown."""
+        if self.notice_date is None or self.classification is None:
+            return None
+        try:
+            days = RESPONSE_DEADLINE_DAYS[self.classification]
+        except KeyError:
+            raise ValueError(f"Unknown notice classification: {self.classification!r}") from None
+        return self.notice_date + timedelta(days=days)
+
+
+def build_styles():
+    """Return the sample style sheet extended with the playbook's custom styles."""
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_JUSTIFY
+    from reportlab.lib import colors
+
+    styles = getSampleStyleSheet()
+
+    styles.add(ParagraphStyle(
+        "TitleStyle",
+        parent=styles["Heading1"],
+        fontSize=24,
+        textColor=colors.HexColor(BRAND_NAVY),
+        alignment=TA_CENTER,
+        spaceAfter=6,
+        spaceBefore=12,
+        fontName="Helvetica-Bold"
+    ))
+
+    styles.add(ParagraphStyle(
+        "SubtitleStyle",
+        parent=styles["Normal"],
+        fontSize=12,
+        textColor=colors.HexColor(BRAND_GOLD),
+        alignment=TA_CENTER,
+        spaceAfter=20,
+        fontName="Helvetica"
+    ))
+
+    styles.add(ParagraphStyle(
+        "HeaderStyle",
+        parent=styles["Heading2"],
+        fontSize=14,
+        textColor=colors.HexColor(BRAND_NAVY),
+        alignment=TA_LEFT,
+        spaceAfter=12,
+        spaceBefore=12,
+        fontName="Helvetica-Bold"
+    ))
+
+    styles.add(ParagraphStyle(
+        "BodyStyle",
+        parent=styles["Normal"],
+        fontSize=10,
+        alignment=TA_JUSTIFY,
+        spaceAfter=10,
+        leading=14,
+        fontName="Helvetica"
+    ))
+
+    styles.add(ParagraphStyle(
+        "WarningStyle",
+        parent=styles["Normal"],
+        fontSize=10,
+        textColor=colors.HexColor(ACCENT_RED),
+        alignment=TA_LEFT,
+        spaceAfter=10,
+        fontName="Helvetica-Bold"
+    ))
+
+    return styles
+
+
+def get_styles():
+    """Return the process-wide style sheet, building it on first use."""
+    global _styles
+    if _styles is None:
+        _styles = build_styles()
+    return _styles
+
+
+class ParagraphCache:
+    """
+    Size-bounded LRU of parsed paragraph markup, keyed by (text, style).
+
+    Table cells such as "IMMEDIATE" or "30 days from notice date" repeat
+    within a document, and every static paragraph repeats across batch
+    renders. Each call still returns a new Paragraph, since layout keeps
+    state on it, but a repeated (text, style) reuses the parsed fragments
+    instead of running reportlab's markup parser again.
+
+    With ``text_metrics`` the paragraphs also reuse the line breaks of an
+    identical paragraph wrapped to the same width, and renders measure text
+    from cached glyph and word widths (see ``playbook_fonts.py``).
+    """
+
+    def __init__(self, max_entries=PARAGRAPH_CACHE_ENTRIES, text_metrics=True):
+        self.max_entries = max_entries
+        self.text_metrics = text_metrics
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def paragraph(self, text, style):
+        """A Paragraph of ``text`` in ``style``, parsed at most once while it stays cached."""
+        if self.text_metrics:
+            from playbook_fonts import line_break_paragraph_class
+
+            paragraph_class, extra = line_break_paragraph_class(), {"line_key": text}
+        else:
+            from reportlab.platypus import Paragraph as paragraph_class
+
+            extra = {}
+
+        key = (text, style)
+        parsed = self._entries.get(key)
+        if parsed is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            cleaned, parsed_style, bullet_text, frags = parsed
+            return paragraph_class(cleaned, parsed_style, bullet_text, frags=list(frags), **extra)
+
+        self.misses += 1
+        p = paragraph_class(text, style, **extra)
+        if self.max_entries:
+            self._entries[key] = (p.text, p.style, p.bulletText, tuple(p.frags))
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return p
+
+    def clear(self):
+        self._entries.clear()
+
+
+def get_paragraph_cache():
+    """Return the process-wide ParagraphCache."""
+    global _paragraphs
+    if _paragraphs is None:
+        _paragraphs = ParagraphCache()
+    return _paragraphs
+
+
+@contextmanager
+def paragraph_cache(cache):
+    """
+    Build paragraphs through ``cache`` in place of the process-wide
+    ParagraphCache inside the block.
+
+    Documents whose text does not repeat, such as streamed exports, pass
+    ``ParagraphCache(max_entries=0)``: their entries would never be reused
+    and would only grow memory with the page count.
+    """
+    global _paragraphs
+    saved = _paragraphs
+    _paragraphs = cache
+    try:
+        yield cache
+    finally:
+        _paragraphs = saved
+
+
+def warm():
+    """Import reportlab and build the style sheets and compiled content ahead of the first render."""
+    import reportlab.platypus  # noqa: F401
+
+    get_compiled()
+
+
+def _table_style_commands(spec, colors, navy, light_gray):
+    padding = spec.get("padding", 6)
+    if spec.get("header"):
+        return [
+            ("BACKGROUND", (0, 0), (-1, 0), navy),
+            ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
+            ("ALIGN", (0, 0), (-1, -1), spec.get("align", "LEFT")),
+            ("VALIGN", (0, 0), (-1, -1), spec.get("valign", "TOP")),
+            ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+            ("FONTSIZE", (0, 0), (-1, -1), spec.get("font_size", 9)),
+            ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, light_gray]),
+            ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
+            ("TOPPADDING", (0, 0), (-1, -1), padding),
+            ("BOTTOMPADDING", (0, 0), (-1, -1), padding),
+        ]
+    if spec.get("contents"):
+        return [
+            ("TEXTCOLOR", (0, 0), (-1, -1), navy),
+            ("ALIGN", (0, 0), (0, -1), "LEFT"),
+            ("ALIGN", (-1, 0), (-1, -1), "RIGHT"),
+            ("FONTNAME", (0, 0), (-1, -1), "Helvetica"),
+            ("FONTSIZE", (0, 0), (-1, -1), spec.get("font_size", 9)),
+            ("LINEBELOW", (0, 0), (-1, -1), 0.25, light_gray),
+            ("TOPPADDING", (0, 0), (-1, -1), padding),
+            ("BOTTOMPADDING", (0, 0), (-1, -1), padding),
+        ]
+    if spec.get("label_column"):
+        return [
+            ("BACKGROUND", (0, 0), (0, -1), light_gray),
+            ("TEXTCOLOR", (0, 0), (-1, -1), navy),
+            ("ALIGN", (0, 0), (-1, -1), "LEFT"),
+            ("FONTNAME", (0, 0), (0, -1), "Helvetica-Bold"),
+            ("FONTSIZE", (0, 0), (-1, -1), spec.get("font_size", 9)),
+            ("BOTTOMPADDING", (0, 0), (-1, -1), padding),
+            ("TOPPADDING", (0, 0), (-1, -1), padding),
+            ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
+        ]
+    return [
+        ("BACKGROUND", (0, 0), (-1, -1), light_gray),
+        ("TEXTCOLOR", (0, 0), (-1, -1), navy),
+        ("ALIGN", (0, 0), (-1, -1), "LEFT"),
+        ("FONTNAME", (0, 0), (-1, -1), "Helvetica"),
+        ("FONTSIZE", (0, 0), (-1, -1), spec.get("font_size", 9)),
+        ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
+        ("TOPPADDING", (0, 0), (-1, -1), padding),
+        ("BOTTOMPADDING", (0, 0), (-1, -1), padding),
+    ]
+
+
+def build_table_styles():
+    """Return one ``TableStyle`` per entry in ``playbook_content.TABLE_STYLES``."""
+    from reportlab.platypus import TableStyle
+    from reportlab.lib import colors
+    from playbook_content import TABLE_STYLES
+
+    navy = colors.HexColor(BRAND_NAVY)
+    light_gray = colors.HexColor(LIGHT_GRAY)
+    return {
+        name: TableStyle(_table_style_commands(spec, colors, navy, light_gray))
+        for name, spec in TABLE_STYLES.items()
+    }
+
+
+def get_table_styles():
+    """Return the process-wide table styles, building them on first use."""
+    global _table_styles
+    if _table_styles is None:
+        _table_styles = build_table_styles()
+    return _table_styles
+
+
+_PLACEHOLDER = re.compile(r"\{(effective_date|client_name|notice_code)\}")
+
+
+def _fill(text, values):
+    return _PLACEHOLDER.sub(lambda m: values[m.group(1)], text) if "{" in text else text
+
+
+class CompiledPlaybook:
+    """
+    The section model compiled against a style sheet.
+
+    Compilation resolves every block's paragraph and table style once; each
+    build then only instantiates fresh flowables from the compiled steps.
+    """
+
+    def __init__(self, sections, styles, table_styles):
+        self.sections = sections
+        self.styles = styles
+        self.table_styles = table_styles
+        self._sections = [
+            (section, [self._compile_block(block) for block in section["blocks"]])
+            for section in sections
+        ]
+
+    def _style(self, name):
+        return self.styles[PARAGRAPH_STYLES[name]]
+
+    def _compile_block(self, block):
+        from reportlab.platypus import Spacer, Table
+
+        # Steps look the cache up when they run, so a build can scope its own
+        # (see ``paragraph_cache``).
+        kind = block["type"]
+        if kind == "spacer":
+            height = block["height"]
+            return lambda values, options: [Spacer(1, height)]
+
+        if kind in ("paragraph", "bullets"):
+            style = self._style(block.get("style", "body"))
+            text = block_text(block)
+            return lambda values, options: [get_paragraph_cache().paragraph(_fill(text, values), style)]
+
+        if kind == "table":
+            table_style = self.table_styles[block["style"]]
+            col_widths = block["col_widths"]
+            header_style = self.styles["Normal"]
+            cell_style = self._style("body")
+            header = [f"<b>{cell}</b>" for cell in block.get("header", ())]
+            rows = block["rows"]
+
+            def table(values, options):
+                paragraph = get_paragraph_cache().paragraph
+                data = []
+                if header:
+                    data.append([paragraph(cell, header_style) for cell in header])
+                data.extend([paragraph(_fill(cell, values), cell_style) for cell in row] for row in rows)
+                t = Table(data, colWidths=col_widths)
+                t.setStyle(table_style)
+                return [t]
+
+            return table
+
+        if kind == "info_table":
+            table_style = self.table_styles["info"]
+            col_widths = block["col_widths"]
+            rows = block["rows"]
+
+            def info_table(values, options):
+                t = Table([[_fill(cell, values) for cell in row] for row in rows], colWidths=col_widths)
+                t.setStyle(table_style)
+                return [t]
+
+            return info_table
+
+        if kind == "toc":
+            table_style = self.table_styles["toc"]
+            col_widths = block["col_widths"]
+            entries = [
+                (section["id"], unescape(toc_label(section["heading"])))
+                for section in self.sections
+                if section.get("heading") and section.get("toc", True)
+            ]
+
+            def toc(values, options):
+                pages = values.get("toc_pages") or {}
+                rows = [[label, str(pages.get(section_id, ""))] for section_id, label in entries]
+                t = Table(rows, colWidths=col_widths)
+                t.setStyle(table_style)
+                return [t]
+
+            return toc
+
+        if kind == "client_info":
+            table_style = self.table_styles["info"]
+            col_widths = block["col_widths"]
+
+            def client_info(values, options):
+                if not options.personalized:
+                    return []
+                t = Table(client_info_rows(options), colWidths=col_widths)
+                t.setStyle(table_style)
+                return [t, Spacer(1, 24)]
+
+            return client_info
+
+        raise ValueError(f"Unknown block type: {kind!r}")
+
+    def iter_sections(self, options, toc_pages=None, page_log=None, sections=None):
+        """
+        Yield ``(section, flowables)`` for each section, headings included.
+
+        ``toc_pages`` maps section ids to the page numbers printed in the table
+        of contents. Each heading is followed by an anchor that adds it to the
+        PDF outline and, when drawn, records its page into ``page_log``.
+
+        ``sections``, any iterable of section dicts, is compiled one section at
+        a time as it is consumed, in place of the precompiled model.
+        """
+        from reportlab.platypus import Spacer
+
+        paragraph = get_paragraph_cache().paragraph
+        values = dict(placeholder_values(options), toc_pages=toc_pages)
+        header_style = self._style("header")
+        if sections is None:
+            compiled = self._sections
+        else:
+            compiled = ((section, [self._compile_block(block) for block in section["blocks"]]) for section in sections)
+        for section, steps in compiled:
+            flowables = []
+            if section.get("space_before") and not section.get("new_page", True):
+                flowables.append(Spacer(1, section["space_before"]))
+            if section.get("heading"):
+                flowables.append(paragraph(section["heading"], header_style))
+                flowables.append(heading_anchor(section["id"], unescape(toc_label(section["heading"])), page_log))
+                flowables.append(Spacer(1, section.get("heading_space", 8)))
+            for step in steps:
+                flowables.extend(step(values, options))
+            yield section, flowables
+
+    def iter_flowables(self, options, on_section=None, toc_pages=None, page_log=None, sections=None):
+        """
+        Yield the document's flowables section by section, with page breaks between sections.
+
+        ``on_section(section, flowables)`` is called for each section, if given.
+        """
+        from reportlab.platypus import PageBreak
+
+        first = True
+        for section, flowables in self.iter_sections(options, toc_pages, page_log, sections):
+            if on_section is not None:
+                on_section(section, flowables)
+            if not first and section.get("new_page", True):
+                yield PageBreak()
+            first = False
+            yield from flowables
+
+    def flowables(self, options, on_section=None, toc_pages=None, page_log=None):
+        """Return the complete flowable list (see ``iter_flowables``)."""
+        return list(self.iter_flowables(options, on_section, toc_pages, page_log))
+
+
+# Paragraph style names used by the section model
+PARAGRAPH_STYLES = {
+    "title": "TitleStyle",
+    "subtitle": "SubtitleStyle",
+    "header": "HeaderStyle",
+    "body": "BodyStyle",
+    "warning": "WarningStyle",
+}
+
+
+def block_text(block):
+    """Markup for a paragraph or bullets block."""
+    if block["type"] == "bullets":
+        return "<br/>".join([f"<b>{block['title']}</b>"] + ["- " + item for item in block["items"]])
+    return block["text"]
+
+
+_TOC_UPPER = {"IRS", "CTO", "EIN"}
+_TOC_LOWER = {
+    "A", "AN", "AND", "FOR", "OF", "THE", "TO",
+    # Spanish headings (playbook_locales)
+    "CON", "DE", "DEL", "EL", "EN", "LA", "LAS", "LOS", "PARA", "POR", "Y",
+}
+
+
+def toc_label(heading):
+    """Table of contents wording for a heading: "3. IRS NOTICE CLASSIFICATION" -> "3. IRS Notice Classification"."""
+    words = []
+    for i, word in enumerate(heading.split(" ")):
+        if word in _TOC_UPPER or not word.replace("-", "").isalpha():
+            words.append(word)
+        elif word in _TOC_LOWER and i > 0:
+            words.append(word.lower())
+        else:
+            words.append("-".join(part.capitalize() for part in word.split("-")))
+    return " ".join(words)
+
+
+def heading_anchor(section_id, title, page_log=None):
+    """
+    A zero-size flowable placed after a heading: bookmarks the page, adds an
+    outline entry and records the page number into ``page_log``.
+    """
+    global _anchor_class
+    if _anchor_class is None:
+        from reportlab.platypus import Flowable
+
+        class HeadingAnchor(Flowable):
+            def __init__(self, section_id, title, page_log):
+                super().__init__()
+                self.section_id = section_id
+                self.title = title
+                self._page_log = page_log
+
+            def wrap(self, availWidth, availHeight):
+                return 0, 0
+
+            def draw(self):
+                canv = self.canv
+                key = f"section-{self.section_id}"
+                canv.bookmarkPage(key)
+                canv.addOutlineEntry(self.title, key, level=0)
+                canv.showOutline()
+                if self._page_log is not None:
+                    self._page_log[self.section_id] = canv.getPageNumber()
+
+        _anchor_class = HeadingAnchor
+    return _anchor_class(section_id, title, page_log)
+
+
+def placeholder_values(options):
+    return {
+        "effective_date": options.effective_date_text(),
+        "client_name": escape(options.client_name) if options.client_name else translate("[CLIENT NAME]", options.locale),
+        "notice_code": escape(options.notice_code) if options.notice_code else translate("[NOTICE CODE]", options.locale),
+    }
+
+
+def client_info_rows(options):
+    """Plain-text rows of the per-client notice summary on the cover page."""
+    rows = [
+        ["Client:", options.client_name or ""],
+        ["Notice Code:", options.notice_code or ""],
+    ]
+    if options.notice_date:
+        rows.append(["Notice Date:", format_date(options.notice_date, options.locale)])
+    if options.classification:
+        rows.append(["Classification:", options.classification])
+    deadline = options.response_deadline()
+    if deadline:
+        rows.append(["Response Deadline:", format_date(deadline, options.locale)])
+    return [[translate(label, options.locale), value] for label, value in rows]
+
+
+def compile_playbook(sections=None, styles=None):
+    """Compile a section model (default: ``playbook_content.SECTIONS``) into a CompiledPlaybook."""
+    if sections is None:
+        from playbook_content import SECTIONS as sections
+    if styles is None:
+        styles = get_styles()
+    return CompiledPlaybook(sections, styles, get_table_styles())
+
+
+def get_compiled(locale=None):
+    """Return the process-wide compiled playbook for ``locale`` (default: English), compiling it on first use."""
+    global _compiled
+    if locale is not None and locale != DEFAULT_LOCALE:
+        if locale not in _localized:
+            from playbook_content import SECTIONS
+            from playbook_locales import localize_sections
+
+            _localized[locale] = compile_playbook(localize_sections(SECTIONS, locale))
+        return _localized[locale]
+    if _compiled is None:
+        _compiled = compile_playbook()
+    return _compiled
+
+
+def build_content(options, on_section=None, toc_pages=None, page_log=None):
+    """Build the list of flowables that make up the playbook."""
+    return get_compiled(options.locale).flowables(options, on_section, toc_pages, page_log)
+
+
+def layout_key(options):
+    """Pages only move when the sections or the cover's client summary change."""
+    sections = [s["id"] for s in get_compiled(options.locale).sections]
+    return "|".join(sections + [str(options.personalized), options.locale])
+
+
+def page_number_cache(cache=None):
+    """The heading page numbers kept beside ``cache`` (a RenderCache), or in this process only."""
+    from playbook_cache import PageNumberCache
+
+    directory = cache.directory if cache is not None else None
+    if directory not in _page_numbers:
+        path = os.path.join(directory, "toc_pages.json") if directory else None
+        _page_numbers[directory] = PageNumberCache(path)
+    return _page_numbers[directory]
+
+
+def doc_settings(options=None):
+    """SimpleDocTemplate keyword arguments for a build with ``options``."""
+    from reportlab.lib.pagesizes import LETTER
+
+    settings = dict(
+        pagesize=LETTER,
+        rightMargin=48,
+        leftMargin=48,
+        topMargin=48,
+        bottomMargin=48,
+        title=DOCUMENT_TITLE,
+        author=DOCUMENT_AUTHOR,
+    )
+    if options is not None and options.compact:
+        settings.update(pageCompression=1, invariant=1)
+    if options is not None and options.locale != DEFAULT_LOCALE:
+        settings.update(lang=options.locale)
+    return settings
+
+
+def cache_settings(options=None):
+    """Everything besides the content that determines the output bytes; part of the cache key."""
+    settings = doc_settings(options)
+    if options is not None:
+        settings["timestamp"] = options.creation_timestamp()
+    return settings
+
+
+def _timestamped_canvas(epoch):
+    """A Canvas class that records ``epoch`` as the document's creation date."""
+    import time
+    from reportlab.pdfgen.canvas import Canvas
+    from reportlab.lib.utils import TimeStamp
+
+    class TimestampedCanvas(Canvas):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            stamp = TimeStamp(invariant=1)
+            stamp.t = epoch
+            stamp.lt = time.gmtime(epoch)
+            stamp.YMDhms = tuple(stamp.lt)[:6]
+            self._doc._timeStamp = stamp
+
+    return TimestampedCanvas
+
+
+class FlowableStream(list):
+    """
+    A flowable list that refills itself from an iterator as layout consumes it.
+
+    ``doc.build()`` only ever looks at the front of its list, so feeding it a
+    ``FlowableStream`` keeps at most ``lookahead`` pending flowables (plus any
+    split remainders) alive however long the iterator runs.
+
+    While ``paused`` the stream reports itself empty, which ends the current
+    ``doc.build()``; the pending flowables are kept for the next one.
+    """
+
+    def __init__(self, iterable, lookahead=4):
+        super().__init__()
+        self._source = iter(iterable)
+        self._lookahead = lookahead
+        self.paused = False
+
+    @property
+    def exhausted(self):
+        return self._source is None and not super().__len__()
+
+    def __len__(self):
+        if self.paused:
+            return 0
+        size = super().__len__()
+        while size < self._lookahead and self._source is not None:
+            try:
+                self.append(next(self._source))
+            except StopIteration:
+                self._source = None
+                break
+            size += 1
+        return size
+
+
+def render(content, target, metrics=None, options=None):
+    """
+    Lay out ``content`` and write the PDF to ``target`` (a path or binary file-like object).
+
+    Layout is recorded into ``metrics`` (a ``playbook_metrics.BuildMetrics``) when given.
+    """
+    if metrics is None:
+        from reportlab.platypus import SimpleDocTemplate as doc_class
+    else:
+        from playbook_metrics import instrumented_doc_template
+
+        doc_class = instrumented_doc_template(metrics)
+
+    from playbook_fonts import measured_text
+
+    doc = doc_class(target, **doc_settings(options))
+    epoch = options.creation_timestamp() if options is not None else None
+    if epoch is None:
+        with measured_text(get_paragraph_cache().text_metrics):
+            doc.build(content)
+        return
+
+    # Compact builds write raw Flate streams; the ASCII85 wrapper reportlab
+    # adds by default costs a quarter of every stream's size.
+    from reportlab import rl_config
+
+    use_a85 = rl_config.useA85
+    rl_config.useA85 = 0
+    try:
+        with measured_text(get_paragraph_cache().text_metrics):
+            doc.build(content, canvasmaker=_timestamped_canvas(epoch))
+    finally:
+        rl_config.useA85 = use_a85
+
+
+def write_output(data, output, as_view=False):
+    """
+    Deliver rendered PDF bytes to ``output``.
+
+    Returns the data when ``output`` is None: as ``bytes``, or as a
+    ``memoryview`` over it when ``as_view`` is true.
+    """
+    if output is None:
+        if as_view:
+            return data if isinstance(data, memoryview) else memoryview(data)
+        return bytes(data) if isinstance(data, memoryview) else data
+    if isinstance(output, (str, os.PathLike)):
+        with open(output, "wb") as f:
+            f.write(data)
+    else:
+        output.write(data)
+    return None
+
+
+def build_playbook(output=None, options=None, cache=None, fragments=None, as_view=False, on_metrics=None):
+    """
+    Render the playbook.
+
+    ``output`` may be a filesystem path, a writable binary stream (an open
+    file, ``sys.stdout.buffer``, a socket's ``makefile("wb")``, an HTTP
+    response body), or ``None`` to have the PDF returned as ``bytes``. With
+    ``as_view=True`` the return value is a ``memoryview`` over the render
+    buffer instead of a copy of it. Pass a
+    ``playbook_cache.RenderCache`` as ``cache`` to reuse a previous render when
+    nothing that affects the output has changed, and a
+    ``playbook_fragments.FragmentCache`` as ``fragments`` to re-render only the
+    page runs that differ from earlier builds and splice in the rest.
+
+    The table of contents is printed with the heading pages of the previous
+    build of the same layout (see ``page_number_cache``). Layout records where
+    the headings actually landed; only if that differs is the document laid
+    out again with the corrected numbers.
+
+    ``on_metrics`` is called with a ``playbook_metrics.BuildMetrics`` describing
+    per-section layout cost once the PDF has been written.
+    """
+    options = options or PlaybookOptions()
+    # Spliced and directly rendered PDFs show the same pages but differ in
+    # bytes, so the build mode is part of the cache key.
+    mode = "fragments" if fragments is not None else "direct"
+    metrics = None
+    if on_metrics is not None:
+        from playbook_metrics import BuildMetrics
+
+        metrics = BuildMetrics(mode=mode)
+        paragraphs = get_paragraph_cache()
+        parsed, reused = paragraphs.misses, paragraphs.hits
+    if cache is not None:
+        from playbook_cache import cache_key
+
+    page_numbers = page_number_cache(cache)
+    layout = layout_key(options)
+    toc_pages = page_numbers.get(layout) or {}
+
+    for layout_pass in range(MAX_LAYOUT_PASSES):
+        if metrics is not None and layout_pass:
+            metrics.restart()
+        page_log = {}
+        content = build_content(options, metrics.assign if metrics is not None else None, toc_pages, page_log)
+
+        key = None
+        if cache is not None:
+            key = cache_key(content, dict(cache_settings(options), mode=mode))
+            data = cache.get(key)
+            if metrics is not None:
+                metrics.cache = "miss" if data is None else "hit"
+            if data is not None:
+                # Only renders whose page numbers checked out are ever stored.
+                break
+
+        if fragments is not None:
+            from playbook_fragments import splice
+
+            data = splice(content, fragments, metrics, options, page_log)
+        else:
+            buf = io.BytesIO()
+            render(content, buf, metrics, options)
+            data = buf.getbuffer()
+        if page_log == toc_pages:
+            if key is not None:
+                cache.put(key, data)
+            break
+        # Pagination moved: lay out again with the pages just recorded. After
+        # MAX_LAYOUT_PASSES the last render is kept, uncached.
+        toc_pages = page_log
+    page_numbers.put(layout, toc_pages)
+
+    result = write_output(data, output, as_view)
+    if metrics is not None:
+        metrics.paragraphs_parsed = paragraphs.misses - parsed
+        metrics.paragraphs_reused = paragraphs.hits - reused
+        metrics.finish(len(data))
+        on_metrics(metrics)
+    return result
+
+
+def fragment_cache_dir(cache_dir=None):
+    """Directory holding pre-rendered page runs, inside the render cache directory."""
+    from playbook_cache import default_cache_dir
+
+    return os.path.join(cache_dir or default_cache_dir(), "fragments")
+
+
+def parse_date(value):
+    """Parse a YYYY-MM-DD string."""
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate the IRS Audit Defense Playbook PDF.")
+    parser.add_argument("-o", "--output", default=file_path, help="output PDF path, or - for stdout")
+    parser.add_argument(
+        "--effective-date",
+        type=parse_date,
+        help="effective date printed on the cover and footer (YYYY-MM-DD, default: today)",
+    )
+    parser.add_argument("--manifest", help="CSV or JSONL client manifest; renders one playbook per row")
+    parser.add_argument(
+        "--packets",
+        metavar="MANIFEST",
+        help="JSON or JSONL packet manifest; assembles one evidence packet (cover letter, index, source PDFs) per entry",
+    )
+    parser.add_argument("--output-dir", default=output_dir, help="output directory for --manifest and --packets")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes for --manifest, --packets and --parallel (default: CPU count)")
+    parser.add_argument("--no-cache", action="store_true", help="always re-render instead of using the render cache")
+    parser.add_argument("--cache-dir", default=None, help="render cache directory (default: $PLAYBOOK_CACHE_DIR or ~/.cache)")
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="compress page streams and write reproducible bytes for identical inputs",
+    )
+    parser.add_argument(
+        "--timestamp",
+        type=datetime.fromisoformat,
+        help="creation date recorded by --compact builds (ISO 8601, default: the effective date)",
+    )
+    parser.add_argument("--metrics", metavar="PATH", help="write per-section build metrics as JSON (- for stdout)")
+    parser.add_argument(
+        "--fragments",
+        action="store_true",
+        help="reuse pre-rendered static sections and render only the pages that changed (requires pypdf)",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="lay out and write pages in parts with bounded memory, for very long documents (requires pypdf)",
+    )
+    parser.add_argument(
+        "--parallel",
+        action="store_true",
+        help="lay out sections in worker processes and stitch the pages, with running headers and footers (requires pypdf)",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="rebuild whenever playbook_content.py changes, re-rendering only the changed sections (requires pypdf)",
+    )
+    parser.add_argument(
+        "--format",
+        choices=("pdf", "html", "markdown"),
+        default="pdf",
+        help="output format; html and markdown are emitted from the same content without reportlab",
+    )
+    parser.add_argument("--locale", choices=LOCALES, default=DEFAULT_LOCALE, help="document language")
+    parser.add_argument(
+        "--locales",
+        help="comma-separated languages to render in parallel, each to OUTPUT with a _<locale> suffix",
+    )
+    parser.add_argument(
+        "--previews",
+        action="store_true",
+        help="also write PNG page thumbnails next to each PDF, drawing only pages that changed (requires pypdf, pypdfium2 and Pillow)",
+    )
+    parser.add_argument(
+        "--encrypt",
+        action="store_true",
+        help="encrypt each PDF for its recipient and sign it, with keys from $ENCRYPTION_KEY (requires pypdf and cryptography)",
+    )
+    parser.add_argument(
+        "--recipient",
+        help="whose password opens an --encrypt single build (manifests use each row's recipient or client_name)",
+    )
+    parser.add_argument(
+        "--diff",
+        metavar="OLD",
+        help="re-issue with a change log against OLD, a git revision or path of playbook_content.py, written to OUTPUT_changes.pdf (requires pypdf)",
+    )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="validate the content (markup, table widths, table of contents) without rendering",
+    )
+    args = parser.parse_args(argv)
+
+    if args.encrypt:
+        from playbook_protect import load_keys, require_cipher
+
+        if args.previews:
+            parser.error("--previews would store the pages of --encrypt documents unencrypted")
+        if args.format != "pdf" or args.locales or args.watch or args.diff:
+            parser.error("--encrypt applies to PDF builds, --manifest and --packets")
+        try:
+            load_keys()
+            require_cipher()
+        except ValueError as e:
+            parser.error(str(e))
+    if args.previews:
+        from playbook_preview import require_renderer
+
+        try:
+            require_renderer()
+        except ValueError as e:
+            parser.error(str(e))
+
+    if args.check:
+        from playbook_check import check_sections, print_report
+
+        return print_report(check_sections())
+
+    if args.locales:
+        from playbook_batch import run_locales
+
+        locales = [locale.strip() for locale in args.locales.split(",") if locale.strip()]
+        if not locales:
+            parser.error("--locales needs at least one locale, e.g. --locales en,es")
+        unknown = [locale for locale in locales if locale not in LOCALES]
+        if unknown:
+            parser.error(f"unknown locale(s) for --locales: {', '.join(unknown)} (expected {', '.join(LOCALES)})")
+        report = run_locales(
+            locales,
+            args.output,
+            PlaybookOptions(
+                effective_date=args.effective_date, compact=args.compact, timestamp=args.timestamp
+            ),
+            workers=args.workers,
+            fragments=args.fragments,
         )
-    ],
-    [
-        Paragraph("Written Responses Only", body_style),
-        Paragraph(
-            "All IRS responses are provided in writing with documented delivery. Verbal responses are prohibited "
-            "unless explicitly authorized by legal counsel.",
-            body_style
+        print(f"✅ Locales complete: {report.succeeded}/{report.total} documents")
+        for path in report.outputs:
+            print(f"📄 File: {path}")
+        print(f"⏱️  Elapsed: {report.elapsed:.2f}s")
+        for failure in report.failures:
+            print(f"❌ Locale {failure.client_name}: {failure.error}")
+        return 1 if report.failures else 0
+
+    if args.packets:
+        from playbook_packet import run_packets
+
+        report = run_packets(
+            args.packets,
+            args.output_dir,
+            workers=args.workers,
+            effective_date=args.effective_date,
+            compact=args.compact,
+            previews=args.previews,
+            protect=args.encrypt,
         )
-    ],
-    [
-        Paragraph("No Admissions of Liability", body_style),
-        Paragraph(
-            "Staff are trained to never admit fault, speculate about corrections, or volunteer additional "
-            "information beyond what is directly requested.",
-            body_style
+        print(f"✅ Packets complete: {report.succeeded}/{report.total} packets")
+        print(f"📁 Output: {args.output_dir}")
+        print(f"⏱️  Elapsed: {report.elapsed:.2f}s ({report.docs_per_sec:.1f} packets/sec)")
+        for failure in report.failures:
+            print(f"❌ Packet {failure.index} ({failure.client_name}): {failure.error}")
+        return 1 if report.failures else 0
+
+    if args.manifest:
+        from playbook_batch import run_batch
+
+        report = run_batch(
+            args.manifest,
+            args.output_dir,
+            workers=args.workers,
+            effective_date=args.effective_date,
+            fragments=args.fragments,
+            compact=args.compact,
+            previews=args.previews,
+            protect=args.encrypt,
         )
-    ],
-    [
-        Paragraph("24-72 Hour Buffer", body_style),
-        Paragraph(
-            "No response is sent within 24 hours of receipt. This ensures review, legal analysis, and quality control. "
-            "Responses are sent within 72 hours or deadline, whichever is sooner.",
-            body_style
+        print(f"✅ Batch complete: {report.succeeded}/{report.total} documents")
+        print(f"📁 Output: {args.output_dir}")
+        print(f"⏱️  Elapsed: {report.elapsed:.2f}s ({report.docs_per_sec:.1f} docs/sec)")
+        for failure in report.failures:
+            print(f"❌ Row {failure.index} ({failure.client_name}): {failure.error}")
+        return 1 if report.failures else 0
+
+    cache = None
+    if not args.no_cache:
+        from playbook_cache import RenderCache
+
+        cache = RenderCache(args.cache_dir)
+
+    fragments = None
+    if args.fragments:
+        from playbook_cache import RenderCache
+        from playbook_fragments import FragmentCache
+
+        fragments = FragmentCache(None if args.no_cache else RenderCache(fragment_cache_dir(args.cache_dir)))
+
+    def write_metrics(metrics):
+        report = metrics.to_json()
+        if args.metrics == "-":
+            print(report, file=sys.stderr if args.output == "-" else sys.stdout)
+        else:
+            with open(args.metrics, "w", encoding="utf-8") as f:
+                f.write(report + "\n")
+
+    on_metrics = write_metrics if args.metrics else None
+    options = PlaybookOptions(
+        effective_date=args.effective_date,
+        compact=args.compact,
+        timestamp=args.timestamp,
+        locale=args.locale,
+    )
+    if args.diff:
+        from playbook_diff import issue_revision
+
+        if args.output == "-":
+            parser.error("--diff writes the playbook and its change log to files; give -o PATH")
+        return issue_revision(args.diff, args.output, options, args.cache_dir)
+    if args.format != "pdf":
+        from playbook_formats import FORMATS, build_format
+
+        output = args.output
+        if output == file_path:
+            output = os.path.splitext(file_path)[0] + FORMATS[args.format]
+        if output == "-":
+            build_format(args.format, sys.stdout, options, cache)
+        else:
+            build_format(args.format, output, options, cache)
+            print(f"✅ {args.format.upper()} Generated Successfully!")
+            print(f"📄 File: {output}")
+            print(f"📊 Size: {os.path.getsize(output) / 1024:.1f} KB")
+        return 0
+    if args.watch:
+        from playbook_fragments import FragmentCache
+        from playbook_watch import Watcher
+
+        Watcher(args.output, options, fragments or FragmentCache()).run()
+        return 0
+    if args.encrypt:
+        from playbook_protect import protect_pdf
+
+        if args.output == "-" or not args.recipient:
+            parser.error("--encrypt needs -o PATH for the signature and --recipient for the password")
+        protect_pdf(build_playbook(options=options, cache=cache, fragments=fragments, on_metrics=on_metrics),
+                    args.output, args.recipient)
+        size, log = os.path.getsize(args.output), sys.stdout
+    elif args.stream:
+        from playbook_stream import stream_playbook
+
+        page_numbers = page_number_cache(cache)
+        if args.output == "-":
+            stream_playbook(sys.stdout.buffer, options, page_numbers=page_numbers)
+            sys.stdout.buffer.flush()
+            size, log = None, sys.stderr
+        else:
+            stream_playbook(args.output, options, page_numbers=page_numbers)
+            size, log = os.path.getsize(args.output), sys.stdout
+        cache = None
+    elif args.parallel:
+        from playbook_parallel import parallel_playbook
+
+        page_numbers = page_number_cache(cache)
+        if args.output == "-":
+            pdf = parallel_playbook(options=options, workers=args.workers, page_numbers=page_numbers, as_view=True)
+            sys.stdout.buffer.write(pdf)
+            sys.stdout.buffer.flush()
+            size, log = len(pdf), sys.stderr
+        else:
+            parallel_playbook(args.output, options, workers=args.workers, page_numbers=page_numbers)
+            size, log = os.path.getsize(args.output), sys.stdout
+        cache = None
+    elif args.output == "-":
+        pdf = build_playbook(
+            options=options, cache=cache, fragments=fragments, as_view=True, on_metrics=on_metrics
         )
-    ],
-]
-
-principles_table = Table(principles_data, colWidths=[140, 360])
-principles_table.setStyle(TableStyle([
-    ("BACKGROUND", (0, 0), (-1, 0), BRAND_NAVY),
-    ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
-    ("ALIGN", (0, 0), (-1, -1), "LEFT"),
-    ("VALIGN", (0, 0), (-1, -1), "TOP"),
-    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-    ("FONTSIZE", (0, 0), (-1, -1), 9),
-    ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, LIGHT_GRAY]),
-    ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
-    ("TOPPADDING", (0, 0), (-1, -1), 8),
-    ("BOTTOMPADDING", (0, 0), (-1, -1), 8),
-]))
-
-content.append(principles_table)
-
-content.append(PageBreak())
-
-# ===== SECTION 3: NOTICE CLASSIFICATION =====
-content.append(Paragraph("3. IRS NOTICE CLASSIFICATION &amp; RESPONSE TIMELINE", header_style))
-content.append(Spacer(1, 8))
-
-content.append(Paragraph(
-    "All IRS notices must be immediately classified by the Audit Defense Team. Classification determines "
-    "response timeline, escalation, and required documentation.",
-    body_style
-))
-content.append(Spacer(1, 12))
-
-notice_data = [
-    [
-        Paragraph("<b>Classification</b>", styles["Normal"]),
-        Paragraph("<b>Examples</b>", styles["Normal"]),
-        Paragraph("<b>Response Deadline</b>", styles["Normal"]),
-        Paragraph("<b>Escalation</b>", styles["Normal"])
-    ],
-    [
-        Paragraph("INFORMATION REQUEST", body_style),
-        Paragraph("CP2000, Math verification, Routine inquiry", body_style),
-        Paragraph("30 days from notice date", body_style),
-        Paragraph("Manager review if &gt; $5K change", body_style)
-    ],
-    [
-        Paragraph("AUDIT NOTICE (Low Risk)", body_style),
-        Paragraph("Correspondence audit, Form inquiry", body_style),
-        Paragraph("30 days from notice date", body_style),
-        Paragraph("CTO + Legal if &gt; $10K", body_style)
-    ],
-    [
-        Paragraph("AUDIT NOTICE (High Risk)", body_style),
-        Paragraph("Office audit, Fieldwork notice, Criminal referral", body_style),
-        Paragraph("15 days from notice date", body_style),
-        Paragraph("IMMEDIATE: Legal counsel", body_style)
-    ],
-    [
-        Paragraph("PENALTY NOTICE", body_style),
-        Paragraph("Accuracy-related, Negligence, Fraud penalty", body_style),
-        Paragraph("30 days or as specified", body_style),
-        Paragraph("IMMEDIATE: Legal counsel", body_style)
-    ],
-]
-
-notice_table = Table(notice_data, colWidths=[120, 120, 130, 130])
-notice_table.setStyle(TableStyle([
-    ("BACKGROUND", (0, 0), (-1, 0), BRAND_NAVY),
-    ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
-    ("ALIGN", (0, 0), (-1, -1), "LEFT"),
-    ("VALIGN", (0, 0), (-1, -1), "TOP"),
-    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-    ("FONTSIZE", (0, 0), (-1, -1), 9),
-    ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, LIGHT_GRAY]),
-    ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
-    ("TOPPADDING", (0, 0), (-1, -1), 6),
-    ("BOTTOMPADDING", (0, 0), (-1, -1), 6),
-]))
-
-content.append(notice_table)
-
-content.append(PageBreak())
-
-# ===== SECTION 4: NOTICE RECEIPT PROCEDURES =====
-content.append(Paragraph("4. NOTICE RECEIPT &amp; LOGGING PROCEDURES", header_style))
-content.append(Spacer(1, 8))
-
-content.append(Paragraph(
-    "<b>Step 1: Receipt &amp; Initial Review (Same Day)</b><br/>"
-    "- Any staff member receiving an IRS notice must immediately notify the Admin<br/>"
-    "- Notice is logged in centralized Notice Tracking Spreadsheet with timestamp<br/>"
-    "- Notice is scanned and securely stored in shared drive",
-    body_style
-))
-
-content.append(Spacer(1, 12))
-content.append(Paragraph(
-    "<b>Step 2: Classification (Within 2 Hours)</b><br/>"
-    "- Admin classifies notice using Notice Classification Matrix (Section 3)<br/>"
-    "- Response deadline is calculated and entered into Notice Log<br/>"
-    "- If HIGH RISK or PENALTY NOTICE: CTO and legal counsel are notified within 2 hours<br/>"
-    "- Client is notified of notice receipt and planned response timeline",
-    body_style
-))
-
-content.append(Spacer(1, 12))
-content.append(Paragraph(
-    "<b>Step 3: Evidence Gathering (Within 24 Hours)</b><br/>"
-    "- Audit Defense Team retrieves engagement letter, tax return, and workpapers<br/>"
-    "- Review for completeness, accuracy, and discrepancies with IRS question<br/>"
-    "- Identify any missing documentation and request from client if needed<br/>"
-    "- All evidence is organized and indexed in Notice folder",
-    body_style
-))
-
-content.append(Spacer(1, 12))
-content.append(Paragraph(
-    "<b>Step 4: Response Preparation (Within 48-72 Hours)</b><br/>"
-    "- CTO prepares draft response using approved templates and scripts<br/>"
-    "- Response is reviewed for accuracy and consistency with prior positions<br/>"
-    "- Client is consulted on any changes to prior positions<br/>"
-    "- Legal counsel reviews if penalties or fraud allegations present<br/>"
-    "- Final response is approved by Admin/CTO before mailing",
-    body_style
-))
-
-content.append(PageBreak())
-
-# ===== SECTION 5: COMMUNICATION AUTHORIZATION =====
-content.append(Paragraph("5. STAFFING &amp; COMMUNICATION AUTHORIZATION MATRIX", header_style))
-content.append(Spacer(1, 8))
-
-auth_data = [
-    [
-        Paragraph("<b>Role</b>", styles["Normal"]),
-        Paragraph("<b>Authorization Level</b>", styles["Normal"]),
-        Paragraph("<b>Permitted Actions</b>", styles["Normal"])
-    ],
-    [
-        Paragraph("Preparers", body_style),
-        Paragraph("NONE", body_style),
-        Paragraph("Must escalate any IRS communication to Admin.", body_style)
-    ],
-    [
-        Paragraph("Staff", body_style),
-        Paragraph("LIMITED", body_style),
-        Paragraph("May receive/acknowledge receipt. Must immediately escalate to Audit Defense Team.", body_style)
-    ],
-    [
-        Paragraph("CTO", body_style),
-        Paragraph("FULL", body_style),
-        Paragraph("Manages all aspects: receive, classify, respond, escalate, interface with legal counsel.", body_style)
-    ],
-    [
-        Paragraph("Legal Counsel", body_style),
-        Paragraph("ADVISORY", body_style),
-        Paragraph("Consults on penalty notices, criminal referrals, fraud allegations. Reviews responses.", body_style)
-    ],
-]
-
-auth_table = Table(auth_data, colWidths=[100, 130, 220])
-auth_table.setStyle(TableStyle([
-    ("BACKGROUND", (0, 0), (-1, 0), BRAND_NAVY),
-    ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
-    ("ALIGN", (0, 0), (-1, -1), "LEFT"),
-    ("VALIGN", (0, 0), (-1, -1), "TOP"),
-    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-    ("FONTSIZE", (0, 0), (-1, -1), 9),
-    ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, LIGHT_GRAY]),
-    ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
-    ("TOPPADDING", (0, 0), (-1, -1), 6),
-    ("BOTTOMPADDING", (0, 0), (-1, -1), 6),
-]))
-
-content.append(auth_table)
-
-content.append(PageBreak())
-
-# ===== SECTION 6: EVIDENCE RETENTION =====
-content.append(Paragraph("6. EVIDENCE RETENTION &amp; DOCUMENT MANAGEMENT", header_style))
-content.append(Spacer(1, 8))
-
-content.append(Paragraph(
-    "<b>Retention Policy Summary:</b> All tax records, workpapers, engagement letters, correspondence, and IRS acknowledgments "
-    "must be retained for a minimum of <b>seven (7) years</b> from the later of: (a) tax return filing date, or (b) client "
-    "engagement termination.",
-    body_style
-))
-
-content.append(Spacer(1, 12))
-
-retention_data = [
-    [
-        Paragraph("<b>Document Type</b>", styles["Normal"]),
-        Paragraph("<b>Retention Period</b>", styles["Normal"]),
-        Paragraph("<b>Storage Location</b>", styles["Normal"])
-    ],
-    [
-        Paragraph("Tax Returns &amp; Forms", body_style),
-        Paragraph("7 years", body_style),
-        Paragraph("Secure server + encrypted backup", body_style)
-    ],
-    [
-        Paragraph("Workpapers &amp; Schedules", body_style),
-        Paragraph("7 years", body_style),
-        Paragraph("Secure server + encrypted backup", body_style)
-    ],
-    [
-        Paragraph("Engagement Letters", body_style),
-        Paragraph("7 years", body_style),
-        Paragraph("Client file + CRM system", body_style)
-    ],
-    [
-        Paragraph("IRS Correspondence", body_style),
-        Paragraph("7 years", body_style),
-        Paragraph("Compliance folder + backup DB", body_style)
-    ],
-]
-
-retention_table = Table(retention_data, colWidths=[150, 120, 180])
-retention_table.setStyle(TableStyle([
-    ("BACKGROUND", (0, 0), (-1, 0), BRAND_NAVY),
-    ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
-    ("ALIGN", (0, 0), (-1, -1), "LEFT"),
-    ("VALIGN", (0, 0), (-1, -1), "TOP"),
-    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-    ("FONTSIZE", (0, 0), (-1, -1), 9),
-    ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, LIGHT_GRAY]),
-    ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
-    ("TOPPADDING", (0, 0), (-1, -1), 6),
-    ("BOTTOMPADDING", (0, 0), (-1, -1), 6),
-]))
-
-content.append(retention_table)
-
-content.append(PageBreak())
-
-# ===== SECTION 7: COMMUNICATION SCRIPTS =====
-content.append(Paragraph("7. APPROVED IRS COMMUNICATION SCRIPTS", header_style))
-content.append(Spacer(1, 8))
-
-content.append(Paragraph(
-    "<b>Script #1: Notice Receipt Acknowledgment</b><br/>"
-    "<i>\"Thank you for contacting Ross Tax Prep &amp; Bookkeeping LLC. All IRS correspondence and inquiries are "
-    "handled by our compliance team. Please submit requests in writing to our office address.\"</i>",
-    body_style
-))
-
-content.append(Spacer(1, 12))
-
-content.append(Paragraph(
-    "<b>Script #2: Standard Response Cover Letter</b><br/>"
-    "<i>\"On behalf of [CLIENT NAME], we hereby respond to your [NOTICE CODE] as follows: [INSERT RESPONSE / ATTACHMENTS].\"</i>",
-    body_style
-))
-
-content.append(Spacer(1, 12))
-content.append(Paragraph(
-    "<b>PROHIBITED PHRASES:</b><br/>"
-    "- \"We made a mistake...\" (admission of error)<br/>"
-    "- \"The client didn't provide...\" (shifting blame)<br/>"
-    "- \"We weren't aware of...\" (lack of diligence)<br/>"
-    "- \"We assumed...\" (speculation)<br/>"
-    "- Any verbal responses or admissions to IRS agents",
-    warning_style
-))
-
-content.append(PageBreak())
-
-# ===== SECTION 8: ESCALATION THRESHOLDS =====
-content.append(Paragraph("8. ESCALATION THRESHOLDS &amp; TRIGGERS", header_style))
-content.append(Spacer(1, 8))
-
-escalation_data = [
-    [
-        Paragraph("<b>Trigger</b>", styles["Normal"]),
-        Paragraph("<b>Action</b>", styles["Normal"]),
-        Paragraph("<b>Timeline</b>", styles["Normal"])
-    ],
-    [
-        Paragraph("Penalty &gt; $10,000", body_style),
-        Paragraph("Notify legal counsel. Prepare penalty defense memo.", body_style),
-        Paragraph("Within 2 hours", body_style)
-    ],
-    [
-        Paragraph("Criminal Referral Language", body_style),
-        Paragraph("STOP all communications. Retain criminal tax attorney immediately.", body_style),
-        Paragraph("IMMEDIATE", body_style)
-    ],
-    [
-        Paragraph("Fraud Allegation", body_style),
-        Paragraph("Treat as criminal matter. Engage specialized tax attorney.", body_style),
-        Paragraph("IMMEDIATE", body_style)
-    ],
-]
-
-escalation_table = Table(escalation_data, colWidths=[130, 220, 100])
-escalation_table.setStyle(TableStyle([
-    ("BACKGROUND", (0, 0), (-1, 0), BRAND_NAVY),
-    ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
-    ("ALIGN", (0, 0), (-1, -1), "LEFT"),
-    ("VALIGN", (0, 0), (-1, -1), "TOP"),
-    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-    ("FONTSIZE", (0, 0), (-1, -1), 9),
-    ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, LIGHT_GRAY]),
-    ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
-    ("TOPPADDING", (0, 0), (-1, -1), 6),
-    ("BOTTOMPADDING", (0, 0), (-1, -1), 6),
-]))
-
-content.append(escalation_table)
-
-content.append(PageBreak())
-
-# ===== SECTION 9: STAFF TRAINING =====
-content.append(Paragraph("9. STAFF TRAINING &amp; COMPLIANCE", header_style))
-content.append(Spacer(1, 8))
-
-content.append(Paragraph(
-    "<b>Required Training:</b><br/>"
-    "- All staff must complete IRS Audit Defense Training before handling client files<br/>"
-    "- Training covers: Notice classification, escalation procedures, approved scripts<br/>"
-    "- Annual refresher training required for all staff<br/>"
-    "- New staff must pass quiz (80% minimum) before unsupervised client access",
-    body_style
-))
-
-content.append(Spacer(1, 12))
-
-content.append(Paragraph(
-    "<b>Monitoring &amp; Compliance:</b><br/>"
-    "- All IRS communications logged in centralized tracking system<br/>"
-    "- Monthly audit of Notice Log to verify proper classification<br/>"
-    "- Quarterly compliance review with all staff<br/>"
-    "- Any violation of these procedures results in disciplinary action",
-    body_style
-))
-
-content.append(Spacer(1, 12))
-
-content.append(Paragraph(
-    "<b>Confidentiality &amp; Privilege:</b><br/>"
-    "All IRS notices, responses, and audit work are considered attorney work product. "
-    "Staff are prohibited from discussing audit matters with anyone except authorized personnel (CTO, Admin, legal counsel).",
-    body_style
-))
-
-content.append(PageBreak())
-
-# ===== SECTION 10: POST-AUDIT REVIEW =====
-content.append(Paragraph("10. POST-AUDIT REVIEW &amp; REMEDIATION", header_style))
-content.append(Spacer(1, 8))
-
-content.append(Paragraph(
-    "Upon resolution of any IRS notice, the Audit Defense Team must conduct a comprehensive review to identify root causes.",
-    body_style
-))
-
-content.append(Spacer(1, 12))
-
-content.append(Paragraph(
-    "<b>Post-Audit Review Checklist:</b><br/>"
-    "- Verify IRS determination is fully satisfied<br/>"
-    "- Analyze root cause: Return position, inadequate documentation, preparer error, or client misstatement<br/>"
-    "- Assess exposure: Would this issue affect other prior-year returns<br/>"
-    "- Update procedures: If preparer error, update SOPs<br/>"
-    "- Update workpaper: Document conclusion and any changes accepted by IRS<br/>"
-    "- Client communication: Explain outcome and lessons learned<br/>"
-    "- Firm learning: Memorialize finding in quality control database",
-    body_style
-))
-
-content.append(PageBreak())
-
-# ===== SECTION 11: EMERGENCY CONTACTS =====
-content.append(Paragraph("11. EMERGENCY CONTACT PROTOCOLS", header_style))
-content.append(Spacer(1, 8))
-
-content.append(Paragraph(
-    "In the event of a critical IRS matter, breach, or emergency, notify the following contacts in order:",
-    body_style
-))
-
-content.append(Spacer(1, 12))
-
-emergency_data = [
-    [
-        Paragraph("<b>Priority</b>", styles["Normal"]),
-        Paragraph("<b>Contact</b>", styles["Normal"]),
-        Paragraph("<b>Role</b>", styles["Normal"]),
-        Paragraph("<b>Method</b>", styles["Normal"])
-    ],
-    [
-        Paragraph("1", body_style),
-        Paragraph("CTO / Admin", body_style),
-        Paragraph("Incident Commander", body_style),
-        Paragraph("Phone + Email", body_style)
-    ],
-    [
-        Paragraph("2", body_style),
-        Paragraph("CEO", body_style),
-        Paragraph("Executive", body_style),
-        Paragraph("Phone + Email", body_style)
-    ],
-    [
-        Paragraph("3", body_style),
-        Paragraph("External Legal Counsel", body_style),
-        Paragraph("Attorney", body_style),
-        Paragraph("Direct dial (on file)", body_style)
-    ],
-]
-
-emergency_table = Table(emergency_data, colWidths=[80, 140, 140, 140])
-emergency_table.setStyle(TableStyle([
-    ("BACKGROUND", (0, 0), (-1, 0), BRAND_NAVY),
-    ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
-    ("ALIGN", (0, 0), (-1, -1), "CENTER"),
-    ("VALIGN", (0, 0), (-1, -1), "CENTER"),
-    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-    ("FONTSIZE", (0, 0), (-1, -1), 9),
-    ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, LIGHT_GRAY]),
-    ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
-    ("TOPPADDING", (0, 0), (-1, -1), 6),
-    ("BOTTOMPADDING", (0, 0), (-1, -1), 6),
-]))
-
-content.append(emergency_table)
-
-content.append(Spacer(1, 24))
-content.append(Paragraph(
-    "<b>Do NOT discuss audit matters with anyone not listed above without explicit authorization from CTO.</b>",
-    warning_style
-))
-
-content.append(PageBreak())
-
-# ===== FOOTER =====
-content.append(Spacer(1, 12))
-footer_data = [
-    [
-        Paragraph("<b>Document:</b> IRS Audit Defense Playbook", body_style),
-        Paragraph("<b>Effective:</b> " + datetime.now().strftime("%B %d, %Y"), body_style),
-        Paragraph("<b>Classification:</b> CONFIDENTIAL", body_style)
-    ]
-]
-
-footer_table = Table(footer_data, colWidths=[200, 150, 150])
-footer_table.setStyle(TableStyle([
-    ("BACKGROUND", (0, 0), (-1, -1), LIGHT_GRAY),
-    ("TEXTCOLOR", (0, 0), (-1, -1), BRAND_NAVY),
-    ("ALIGN", (0, 0), (-1, -1), "LEFT"),
-    ("FONTNAME", (0, 0), (-1, -1), "Helvetica"),
-    ("FONTSIZE", (0, 0), (-1, -1), 9),
-    ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
-    ("TOPPADDING", (0, 0), (-1, -1), 8),
-    ("BOTTOMPADDING", (0, 0), (-1, -1), 8),
-]))
-
-content.append(footer_table)
-
-# ===== BUILD PDF =====
-doc.build(content)
-
-print(f"✅ PDF Generated Successfully!")
-print(f"📄 File: {file_path}")
-print(f"📊 Size: {os.path.getsize(file_path) / 1024:.1f} KB")
-print(f"📋 Document: IRS Audit Defense Playbook")
-print(f"🏢 Organization: Ross Tax Prep & Bookkeeping LLC (EIN: 33-4891499)")
-print(f"📅 Generated: {datetime.now().strftime('%B %d, %Y at %I:%M %p')}")
+        sys.stdout.buffer.write(pdf)
+        sys.stdout.buffer.flush()
+        size, log = len(pdf), sys.stderr
+    else:
+        build_playbook(args.output, options, cache=cache, fragments=fragments, on_metrics=on_metrics)
+        size, log = os.path.getsize(args.output), sys.stdout
+
+    print(f"✅ PDF Generated Successfully!", file=log)
+    print(f"📄 File: {'<stdout>' if args.output == '-' else args.output}", file=log)
+    if size is not None:
+        print(f"📊 Size: {size / 1024:.1f} KB", file=log)
+    print(f"📋 Document: IRS Audit Defense Playbook", file=log)
+    print(f"🏢 Organization: Ross Tax Prep & Bookkeeping LLC (EIN: 33-4891499)", file=log)
+    print(f"📅 Generated: {datetime.now().strftime('%B %d, %Y at %I:%M %p')}", file=log)
+    if cache is not None:
+        print(f"♻️  Render cache: {'hit' if cache.hits else 'miss'} ({cache.directory})", file=log)
+    if args.previews and args.output != "-":
+        from playbook_preview import build_previews, print_report as print_previews
+
+        print_previews(build_previews(args.output), log)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,261 @@
+"""
+Batch generation of personalized IRS Audit Defense Playbooks.
+
+Reads a client manifest (CSV with a header row, or JSONL with one object per
+line) and renders one playbook per client across a process pool. Recognized
+columns:
+
+    client_name      Client name for the cover page and Script #2
+    notice_code      IRS notice code (e.g. CP2000)
+    notice_date      YYYY-MM-DD; with classification, sets the response deadline
+    classification   One of the Section 3 classifications
+    recipient        Optional; whose password opens the document (default: client_name)
+    output           Optional file name in the output directory (any directory
+                     part is dropped, so rows cannot write outside it)
+
+Each worker imports reportlab and builds the style sheet once, when the pool
+starts. With ``fragments=True`` each worker also keeps the rendered static
+sections and only lays out the pages that differ per client (see
+``playbook_fragments.py``), and with ``previews=True`` writes page thumbnails
+beside each PDF (see ``playbook_preview.py``). With ``protect=True`` each
+document is encrypted for its recipient and signed before it is written,
+with the keys loaded once per worker (see ``playbook_protect.py``). A failed
+row is reported and the rest of the batch continues.
+
+``run_locales`` renders one document in several languages (see
+``playbook_locales.py``) in parallel. The style sheets and compiled content
+are built once in the parent and inherited by forked workers, so every
+locale shares them.
+"""
+
+import csv
+import json
+import multiprocessing
+import os
+import re
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field, replace
+from typing import List
+
+import generate_irs_audit_defense_playbook as playbook
+
+_fragments = None
+
+
+@dataclass
+class BatchFailure:
+    index: int
+    client_name: str
+    error: str
+
+
+@dataclass
+class BatchReport:
+    total: int = 0
+    succeeded: int = 0
+    elapsed: float = 0.0
+    outputs: List[str] = field(default_factory=list)
+    failures: List[BatchFailure] = field(default_factory=list)
+
+    @property
+    def docs_per_sec(self):
+        return self.succeeded / self.elapsed if self.elapsed else 0.0
+
+
+def read_manifest(path):
+    """Yield one dict per client row from a CSV or JSONL manifest."""
+    if path.lower().endswith((".jsonl", ".ndjson", ".json")):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+    else:
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            yield from csv.DictReader(f)
+
+
+def options_from_record(record, effective_date=None):
+    """Build PlaybookOptions from a manifest row."""
+    notice_date = (record.get("notice_date") or "").strip()
+    return playbook.PlaybookOptions(
+        effective_date=effective_date,
+        client_name=(record.get("client_name") or "").strip() or None,
+        notice_code=(record.get("notice_code") or "").strip() or None,
+        notice_date=playbook.parse_date(notice_date) if notice_date else None,
+        classification=(record.get("classification") or "").strip() or None,
+    )
+
+
+def record_output(record):
+    """
+    The file name in a row's ``output`` column, without any directory part,
+    or None. ``../../x.pdf`` and ``/etc/x.pdf`` both become ``x.pdf``.
+    """
+    name = os.path.basename(str(record.get("output") or "").strip().replace("\\", "/"))
+    return name if name not in ("", ".", "..") else None
+
+
+def output_name(index, record):
+    """File name for a manifest row: the row's ``output`` column, or one derived from it."""
+    name = record_output(record)
+    if name:
+        return name
+    slug = "_".join(
+        part for part in (record.get("client_name"), record.get("notice_code")) if part
+    )
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", slug).strip("_") or "client"
+    return f"{index:05d}_{slug}.pdf"
+
+
+def _init_worker(use_fragments=False, protect=False):
+    global _fragments
+    playbook.warm()
+    if protect:
+        from playbook_protect import load_keys
+
+        load_keys()
+    if use_fragments:
+        from playbook_cache import RenderCache
+        from playbook_fragments import FragmentCache
+
+        _fragments = FragmentCache(RenderCache(playbook.fragment_cache_dir()))
+
+
+def _render_one(index, record, path, effective_date, compact=False, previews=False, protect=False):
+    try:
+        options = options_from_record(record, effective_date)
+        options.compact = compact
+        if protect:
+            from playbook_protect import protect_pdf, record_recipient
+
+            protect_pdf(playbook.build_playbook(None, options, fragments=_fragments), path, record_recipient(record))
+            return index, None
+        playbook.build_playbook(path, options, fragments=_fragments)
+        if previews:
+            from playbook_preview import build_previews
+
+            build_previews(path)
+        return index, None
+    except Exception:
+        return index, traceback.format_exc(limit=3).strip().splitlines()[-1]
+
+
+def render_record(record, effective_date=None):
+    """Render one manifest row in the current process and return the PDF bytes."""
+    options = options_from_record(record, effective_date)
+    return playbook.build_playbook(options=options, fragments=_fragments)
+
+
+def run_batch(manifest, output_dir, workers=None, effective_date=None, fragments=False, compact=False, previews=False,
+              protect=False):
+    """
+    Render every manifest row into ``output_dir``; returns a BatchReport.
+
+    With ``previews`` each worker also writes the page thumbnails of its
+    documents (see ``playbook_preview.py``); pages shared by several clients
+    are drawn once. With ``protect`` each document is encrypted for its
+    recipient and signed (see ``playbook_protect.py``); thumbnails would
+    leave its pages readable, so the two cannot be combined.
+    """
+    if protect:
+        from playbook_protect import load_keys, require_cipher
+
+        if previews:
+            raise ValueError("page previews of encrypted documents would be stored unencrypted")
+        load_keys()
+        require_cipher()
+    if previews:
+        from playbook_preview import require_renderer
+
+        require_renderer()
+    os.makedirs(output_dir, exist_ok=True)
+    records = list(read_manifest(manifest))
+    report = BatchReport(total=len(records))
+    paths = [os.path.join(output_dir, output_name(i, r)) for i, r in enumerate(records)]
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(fragments, protect)
+    ) as pool:
+        futures = [
+            pool.submit(_render_one, i, record, paths[i], effective_date, compact, previews, protect)
+            for i, record in enumerate(records)
+        ]
+        for future in as_completed(futures):
+            index, error = future.result()
+            if error is None:
+                report.succeeded += 1
+                report.outputs.append(paths[index])
+            else:
+                client = records[index].get("client_name") or ""
+                report.failures.append(BatchFailure(index, client, error))
+    report.elapsed = time.perf_counter() - start
+
+    report.outputs.sort()
+    report.failures.sort(key=lambda f: f.index)
+    return report
+
+
+def locale_path(path, locale):
+    """``playbook.pdf`` -> ``playbook_es.pdf``."""
+    stem, ext = os.path.splitext(path)
+    return f"{stem}_{locale}{ext or '.pdf'}"
+
+
+def _render_locale(index, locale, path, options):
+    try:
+        playbook.build_playbook(path, replace(options, locale=locale), fragments=_fragments)
+        return index, None
+    except Exception:
+        return index, traceback.format_exc(limit=3).strip().splitlines()[-1]
+
+
+def run_locales(locales, output, options=None, workers=None, fragments=False):
+    """
+    Render the playbook once per locale, in parallel, to ``locale_path(output, locale)``; returns a BatchReport.
+
+    Failures are reported per locale, with the locale in place of the client
+    name. Raises ValueError for an empty list or a locale without a catalog.
+    """
+    from playbook_locales import check_locale
+
+    locales = [check_locale(locale) for locale in locales]
+    if not locales:
+        raise ValueError("No locales to render")
+    options = options or playbook.PlaybookOptions()
+    report = BatchReport(total=len(locales))
+    paths = [locale_path(output, locale) for locale in locales]
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+
+    start = time.perf_counter()
+    # Build the styles and every locale's compiled content once, here; forked
+    # workers inherit them instead of rebuilding them per locale.
+    playbook.warm()
+    for locale in locales:
+        playbook.get_compiled(locale)
+    context = multiprocessing.get_context("fork") if "fork" in multiprocessing.get_all_start_methods() else None
+    with ProcessPoolExecutor(
+        max_workers=min(workers or os.cpu_count() or 1, len(locales)),
+        mp_context=context,
+        initializer=_init_worker,
+        initargs=(fragments,),
+    ) as pool:
+        futures = [
+            pool.submit(_render_locale, i, locale, paths[i], options)
+            for i, locale in enumerate(locales)
+        ]
+        for future in as_completed(futures):
+            index, error = future.result()
+            if error is None:
+                report.succeeded += 1
+                report.outputs.append(paths[index])
+            else:
+                report.failures.append(BatchFailure(index, locales[index], error))
+    report.elapsed = time.perf_counter() - start
+
+    report.outputs.sort()
+    report.failures.sort(key=lambda f: f.index)
+    return report
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for IRS Audit Defense Playbook rendering.
+
+Times each phase of a build separately:
+
+    styles      getSampleStyleSheet, the custom ParagraphStyles and the shared TableStyles
+    flowables   compiling the section model and instantiating the flowables
+    layout      wrapping, splitting and drawing inside doc.build
+    serialize   writing the PDF (canvas.save)
+
+for the stock playbook and synthetic large variants. Results can be saved as
+a baseline; later runs compare against it and exit non-zero when any phase
+is slower than the baseline by more than the threshold.
+
+    python playbook_bench.py --save-baseline
+    python playbook_bench.py --threshold 0.25
+
+``--rss`` instead checks that streaming builds (``playbook_stream.py``) keep
+peak memory flat: each size in RSS_PAGES is built in a fresh process, and the
+run fails when the largest peak RSS exceeds the smallest by more than
+RSS_TOLERANCE.
+
+    python playbook_bench.py --rss
+
+``--text-metrics`` renders each variant with and without the cached text
+measurement of ``playbook_fonts.py``, reports the layout time of the first
+(cold) and later (warm) builds, and fails unless both produce identical
+bytes.
+
+    python playbook_bench.py --text-metrics --variant table_5000
+"""
+
+import argparse
+import io
+import json
+import multiprocessing
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import generate_irs_audit_defense_playbook as playbook
+
+PHASES = ("styles", "flowables", "layout", "serialize")
+DEFAULT_BASELINE = os.path.join(playbook.output_dir, "playbook_bench_baseline.json")
+
+# Phases faster than this (seconds) are too noisy to flag as regressions.
+NOISE_FLOOR = 0.002
+
+# Page counts for --rss, and the allowed growth in peak RSS from the smallest to the largest.
+RSS_PAGES = (10, 100, 1000, 10000)
+RSS_TOLERANCE = 0.10
+
+VARIANTS = {
+    "stock": dict(copies=1, table_rows=0),
+    "sections_x10": dict(copies=10, table_rows=0),
+    "table_5000": dict(copies=1, table_rows=5000),
+}
+
+
+def synthetic_sections(copies=1, table_rows=0):
+    """The stock section model with the numbered sections repeated ``copies`` times and an optional large table."""
+    from playbook_content import SECTIONS
+
+    cover, toc, body, footer = SECTIONS[0], SECTIONS[1], SECTIONS[2:-1], SECTIONS[-1]
+    sections = [cover, toc]
+    for i in range(copies):
+        sections.extend(dict(section, id=f"{section['id']}_{i}") for section in body)
+    if table_rows:
+        sections.append({
+            "id": "synthetic_table",
+            "heading": "APPENDIX: NOTICE LOG",
+            "blocks": [{
+                "type": "table",
+                "style": "data",
+                "col_widths": [120, 120, 130, 130],
+                "header": ["Client", "Notice", "Response Deadline", "Escalation"],
+                "rows": [
+                    [f"Client {n:05d}", "CP2000", "30 days from notice date", "Manager review if &gt; $5K change"]
+                    for n in range(table_rows)
+                ],
+            }],
+        })
+    sections.append(footer)
+    return sections
+
+
+def synthetic_stream(pages):
+    """A generator of ``pages`` one-page notice sections, produced as they are consumed."""
+    for n in range(pages):
+        yield {
+            "id": f"notice_{n}",
+            "heading": f"NOTICE {n + 1:05d}",
+            "toc": False,
+            "blocks": [
+                {"type": "paragraph", "text": f"Client {n:05d} received a CP2000 notice. Response is due 30 days from the notice date."},
+                {
+                    "type": "table",
+                    "style": "data",
+                    "col_widths": [120, 120, 130, 130],
+                    "header": ["Client", "Notice", "Response Deadline", "Escalation"],
+                    "rows": [[f"Client {n:05d}", "CP2000", "30 days from notice date", "Manager review"]] * 10,
+                },
+            ],
+        }
+
+
+def _streamed_rss(pages):
+    import playbook_stream
+    from playbook_metrics import peak_rss_kb
+
+    with open(os.devnull, "wb") as out:
+        playbook_stream.stream_playbook(out, sections=synthetic_stream(pages))
+    return peak_rss_kb()
+
+
+def streamed_rss(sizes=RSS_PAGES):
+    """Return ``{pages: peak RSS in KiB}``, each streamed build in a fresh process."""
+    results = {}
+    for pages in sizes:
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+            results[pages] = pool.submit(_streamed_rss, pages).result()
+    return results
+
+
+def time_build(sections, options=None):
+    """Build once; returns a dict of seconds per phase."""
+    from reportlab.pdfgen.canvas import Canvas
+    from reportlab.platypus import SimpleDocTemplate
+
+    options = options or playbook.PlaybookOptions()
+    timings = {}
+
+    t0 = time.perf_counter()
+    styles = playbook.build_styles()
+    table_styles = playbook.build_table_styles()
+    t1 = time.perf_counter()
+    content = playbook.CompiledPlaybook(sections, styles, table_styles).flowables(options)
+    t2 = time.perf_counter()
+
+    saved = []
+
+    class TimedCanvas(Canvas):
+        def save(self):
+            start = time.perf_counter()
+            super().save()
+            saved.append(time.perf_counter() - start)
+
+    from playbook_fonts import measured_text
+
+    doc = SimpleDocTemplate(io.BytesIO(), **playbook.doc_settings())
+    with measured_text(playbook.get_paragraph_cache().text_metrics):
+        doc.build(content, canvasmaker=TimedCanvas)
+    t3 = time.perf_counter()
+
+    timings["styles"] = t1 - t0
+    timings["flowables"] = t2 - t1
+    timings["serialize"] = sum(saved)
+    timings["layout"] = (t3 - t2) - timings["serialize"]
+    return timings
+
+
+def run(variants=None, repeat=3):
+    """Return ``{variant: {phase: median seconds}}``."""
+    playbook.warm()
+    results = {}
+    for name in variants or VARIANTS:
+        sections = synthetic_sections(**VARIANTS[name])
+        samples = [time_build(sections) for _ in range(repeat)]
+        results[name] = {phase: statistics.median(s[phase] for s in samples) for phase in PHASES}
+    return results
+
+
+def text_metrics_comparison(variants=None, repeat=3):
+    """
+    Return ``{variant: {"uncached": [...], "cached": [...], "identical": bool}}``
+    with the render seconds of ``repeat`` builds each, without and with the
+    text measurement caches.
+    """
+    from datetime import date
+
+    import playbook_fonts
+
+    playbook.warm()
+    options = playbook.PlaybookOptions(effective_date=date(2026, 1, 15), compact=True)
+    styles, table_styles = playbook.get_styles(), playbook.get_table_styles()
+    saved = playbook._paragraphs
+    results = {}
+    try:
+        for name in variants or VARIANTS:
+            sections = synthetic_sections(**VARIANTS[name])
+            result = results[name] = {"identical": True}
+            outputs = set()
+            for mode in ("uncached", "cached"):
+                playbook._paragraphs = playbook.ParagraphCache(text_metrics=mode == "cached")
+                playbook_fonts.clear()
+                result[mode] = []
+                for _ in range(repeat):
+                    content = playbook.CompiledPlaybook(sections, styles, table_styles).flowables(options)
+                    buf = io.BytesIO()
+                    start = time.perf_counter()
+                    playbook.render(content, buf, None, options)
+                    result[mode].append(time.perf_counter() - start)
+                    outputs.add(buf.getvalue())
+            result["identical"] = len(outputs) == 1
+    finally:
+        playbook._paragraphs = saved
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Return ``(variant, phase, baseline, current)`` for every phase slower than ``threshold`` allows."""
+    regressions = []
+    for variant, phases in results.items():
+        for phase, current in phases.items():
+            base = baseline.get(variant, {}).get(phase)
+            if base is None:
+                continue
+            if current > base * (1 + threshold) and current - base > NOISE_FLOOR:
+                regressions.append((variant, phase, base, current))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark playbook rendering phases.")
+    parser.add_argument("--variant", action="append", choices=sorted(VARIANTS), help="variant to run (repeatable; default: all)")
+    parser.add_argument("--repeat", type=int, default=3, help="builds per variant; the median is reported")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline results file")
+    parser.add_argument("--save-baseline", action="store_true", help="write these results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown per phase (0.25 = 25%%)")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    parser.add_argument("--rss", action="store_true", help="check streaming builds keep peak RSS flat (requires pypdf)")
+    parser.add_argument(
+        "--text-metrics",
+        action="store_true",
+        help="compare renders with and without cached glyph widths and line breaks; fails unless the bytes match",
+    )
+    args = parser.parse_args(argv)
+
+    if args.text_metrics:
+        results = text_metrics_comparison(args.variant, max(args.repeat, 2))
+        print(f"{'variant':<14}{'uncached':>12}{'cold':>12}{'warm':>12}{'speedup':>10}")
+        for variant, result in results.items():
+            uncached = statistics.median(result["uncached"])
+            cold, warm = result["cached"][0], statistics.median(result["cached"][1:])
+            print(
+                f"{variant:<14}{uncached * 1000:>10.1f}ms{cold * 1000:>10.1f}ms{warm * 1000:>10.1f}ms"
+                f"{uncached / warm:>9.2f}x"
+            )
+        different = [variant for variant, result in results.items() if not result["identical"]]
+        for variant in different:
+            print(f"❌ {variant}: cached and uncached renders differ", file=sys.stderr)
+        if not different:
+            print("✅ Cached and uncached renders are byte-identical", file=sys.stderr)
+        return 1 if different else 0
+
+    if args.rss:
+        rss = streamed_rss()
+        for pages, kib in rss.items():
+            print(f"{pages:>8} pages {kib / 1024:>10.1f} MB")
+        growth = max(rss.values()) / min(rss.values()) - 1
+        if growth > RSS_TOLERANCE:
+            print(f"❌ Peak RSS grew {growth:.0%} from {min(rss)} to {max(rss)} pages", file=sys.stderr)
+            return 1
+        print(f"✅ Peak RSS flat within {RSS_TOLERANCE:.0%} ({growth:+.1%})", file=sys.stderr)
+        return 0
+
+    results = run(args.variant, args.repeat)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'variant':<14}" + "".join(f"{phase:>12}" for phase in PHASES))
+        for variant, phases in results.items():
+            print(f"{variant:<14}" + "".join(f"{phases[p] * 1000:>10.1f}ms" for p in PHASES))
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"📌 Baseline saved: {args.baseline}", file=sys.stderr)
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"⚠️  No baseline at {args.baseline}; run with --save-baseline first", file=sys.stderr)
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.threshold)
+    for variant, phase, base, current in regressions:
+        print(
+            f"❌ {variant}/{phase}: {current * 1000:.1f}ms vs baseline {base * 1000:.1f}ms "
+            f"(+{(current / base - 1) * 100:.0f}%)",
+            file=sys.stderr,
+        )
+    if not regressions:
+        print(f"✅ No phase regressed more than {args.threshold:.0%}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
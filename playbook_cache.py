@@ -0,0 +1,215 @@
+"""
+On-disk render cache for the IRS Audit Defense Playbook.
+
+Rendered PDFs are stored under a key that hashes everything that affects the
+output: the text of every flowable, the resolved paragraph styles, table column
+widths and TableStyle commands, the document template settings and the
+reportlab version. An unchanged playbook is served from disk without running
+layout. The cache is bounded in total size and evicts least recently used
+entries first.
+
+The HTML and Markdown editions are cached in the same directory and share
+its size bound; page thumbnails (``playbook_preview.py``) use a RenderCache
+of their own next to each PDF. ``PageNumberCache`` keeps the heading page
+numbers of earlier builds beside the rendered PDFs, so the table of contents
+usually needs one layout pass.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+
+CACHE_FORMAT = "1"
+# Files the cache manages: rendered PDFs, the HTML and Markdown editions
+# (see playbook_formats.py) stored beside them, and page thumbnails (see
+# playbook_preview.py).
+CACHE_SUFFIXES = (".pdf", ".html", ".md", ".png")
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def default_cache_dir():
+    """``$PLAYBOOK_CACHE_DIR``, or ``ross-tax-prep/playbook`` under the user cache directory."""
+    if os.environ.get("PLAYBOOK_CACHE_DIR"):
+        return os.environ["PLAYBOOK_CACHE_DIR"]
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "ross-tax-prep", "playbook")
+
+
+def _style_token(style):
+    props = sorted((k, getattr(style, k)) for k in style.defaults if k != "parent")
+    return f"Style:{style.name}:{props!r}"
+
+
+def _flowable_tokens(obj, styles_seen):
+    from reportlab.platypus import Paragraph, Table
+
+    if isinstance(obj, Paragraph):
+        style_id = id(obj.style)
+        if style_id not in styles_seen:
+            styles_seen[style_id] = _style_token(obj.style)
+            yield styles_seen[style_id]
+        yield f"P:{obj.style.name}:{getattr(obj, 'bulletText', None)!r}:{obj.text}"
+    elif isinstance(obj, Table):
+        yield f"T:{obj._argW!r}:{obj._argH!r}:{obj._nrows}x{obj._ncols}"
+        for cmds in (obj._bkgrndcmds, obj._linecmds, obj._spanCmds, obj._nosplitCmds):
+            yield repr(cmds)
+        for row_values, row_styles in zip(obj._cellvalues, obj._cellStyles):
+            for value, cell_style in zip(row_values, row_styles):
+                yield repr(sorted(vars(cell_style).items()))
+                if isinstance(value, (list, tuple)):
+                    for item in value:
+                        yield from _flowable_tokens(item, styles_seen)
+                elif hasattr(value, "wrapOn"):
+                    yield from _flowable_tokens(value, styles_seen)
+                else:
+                    yield f"C:{value!r}"
+    else:
+        attrs = sorted(
+            (k, v) for k, v in vars(obj).items()
+            if isinstance(v, (str, int, float, bool, tuple, type(None)))
+        )
+        yield f"{type(obj).__qualname__}:{attrs!r}"
+
+
+def cache_key(content, doc_settings):
+    """Hash the flowables in ``content`` plus the document settings into a hex key."""
+    import reportlab
+    from reportlab import rl_config
+
+    h = hashlib.sha256()
+    h.update(
+        f"{CACHE_FORMAT}|{reportlab.Version}|{rl_config.invariant}|{rl_config.pageCompression}|{rl_config.useA85}".encode()
+    )
+    h.update(repr(sorted(doc_settings.items())).encode())
+    styles_seen = {}
+    for flowable in content:
+        for token in _flowable_tokens(flowable, styles_seen):
+            h.update(token.encode("utf-8", "surrogatepass"))
+            h.update(b"\0")
+    return h.hexdigest()
+
+
+class RenderCache:
+    """Size-bounded LRU cache of rendered PDFs (and other editions), one file per key and suffix."""
+
+    def __init__(self, directory=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory or default_cache_dir()
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key, suffix=".pdf"):
+        return os.path.join(self.directory, key + suffix)
+
+    def get(self, key, suffix=".pdf"):
+        """Return cached bytes for ``key`` and mark the entry as recently used, or None."""
+        path = self._path(key, suffix)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits += 1
+        return data
+
+    def touch(self, key, suffix=".pdf"):
+        """Mark the entry for ``key`` as recently used without reading it; returns whether it exists."""
+        try:
+            os.utime(self._path(key, suffix))
+        except FileNotFoundError:
+            return False
+        return True
+
+    def put(self, key, data, suffix=".pdf", evict=True):
+        """
+        Store ``data`` under ``key`` atomically, then evict down to ``max_bytes``.
+
+        Pass ``evict=False`` when storing many entries in a row and call
+        ``evict()`` once after the last.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, self._path(key, suffix))
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+        if evict:
+            self.evict()
+
+    def evict(self):
+        """Remove least recently used entries until the cache fits in ``max_bytes``."""
+        entries = []
+        total = 0
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.endswith(CACHE_SUFFIXES) and entry.is_file():
+                    st = entry.stat()
+                    entries.append((st.st_mtime, st.st_size, entry.path))
+                    total += st.st_size
+        entries.sort()
+        for _mtime, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def clear(self):
+        if not os.path.isdir(self.directory):
+            return
+        for name in os.listdir(self.directory):
+            if name.endswith(CACHE_SUFFIXES):
+                os.unlink(os.path.join(self.directory, name))
+
+
+class PageNumberCache:
+    """Heading page numbers per layout from earlier builds; persisted as JSON when ``path`` is given."""
+
+    def __init__(self, path=None):
+        self.path = path
+        self._entries = None
+
+    def _load(self):
+        if self._entries is None:
+            self._entries = {}
+            if self.path:
+                try:
+                    with open(self.path, encoding="utf-8") as f:
+                        self._entries = json.load(f)
+                except (FileNotFoundError, ValueError):
+                    pass
+        return self._entries
+
+    def get(self, key):
+        return self._load().get(key)
+
+    def put(self, key, pages):
+        entries = self._load()
+        if entries.get(key) == pages:
+            return
+        entries[key] = pages
+        if not self.path:
+            return
+        directory = os.path.dirname(self.path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entries, f)
+            os.replace(tmp, self.path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Validate the playbook's section model without rendering it.
+
+Catches content mistakes that would otherwise only surface as an error (or a
+wrong-looking page) from a full ``doc.build``:
+
+- paragraph, bullet, heading and table-cell markup that reportlab cannot
+  parse: a bare ``&`` where ``&amp;`` is meant, unbalanced ``<b>``, unknown
+  tags or entities;
+- unknown ``{placeholders}``, block types, paragraph styles and table styles;
+- table rows whose cell count does not match ``col_widths``, and tables wider
+  than the page frame (LETTER less the 48pt margins);
+- markup in plain-text cells (info tables), which would be printed literally;
+- duplicate section ids, a missing or repeated table of contents, and
+  numbered headings that skip or repeat a number;
+- translations (``playbook_locales.CATALOGS``) with bad markup, or whose
+  English source text is no longer in the content.
+
+Only the section data and the page geometry are loaded; neither the
+reportlab paragraph parser nor the PDF canvas is imported, so a check takes
+milliseconds.
+
+    python generate_irs_audit_defense_playbook.py --check
+    python playbook_check.py
+"""
+
+import argparse
+import re
+import sys
+import time
+import xml.etree.ElementTree as ElementTree
+from dataclasses import dataclass
+from html.entities import name2codepoint
+from typing import List
+
+import generate_irs_audit_defense_playbook as playbook
+
+# Intra-paragraph tags understood by reportlab's paragraph parser
+MARKUP_TAGS = {
+    "a", "b", "br", "em", "font", "i", "img", "link", "span", "strike",
+    "strong", "sub", "sup", "super", "u", "unichar",
+}
+
+_ANY_PLACEHOLDER = re.compile(r"\{(\w+)\}")
+_PLACEHOLDERS = {"effective_date", "client_name", "notice_code"}
+_NUMBERED = re.compile(r"(\d+)\.\s")
+_HTML_ENTITY = re.compile(r"&(\w+);")
+_MARKUP_IN_PLAIN = re.compile(r"<[a-zA-Z/][^>]*>|&(?:[a-zA-Z]+|#\d+);")
+
+
+@dataclass
+class Problem:
+    section_id: str
+    where: str
+    message: str
+
+    def __str__(self):
+        location = f"{self.section_id}: {self.where}" if self.where else self.section_id
+        return f"{location}: {self.message}"
+
+
+@dataclass
+class CheckReport:
+    problems: List[Problem]
+    sections: int = 0
+    texts: int = 0
+    tables: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def ok(self):
+        return not self.problems
+
+
+def frame_width():
+    """Width available to flowables on a page: LETTER less the left and right margins."""
+    settings = playbook.doc_settings()
+    return settings["pagesize"][0] - settings["leftMargin"] - settings["rightMargin"]
+
+
+def markup_error(text):
+    """Why reportlab would reject ``text`` as paragraph markup, or None."""
+    # reportlab also accepts the HTML named entities, which expat does not;
+    # blank them out at the same length so error columns still line up.
+    xml = _HTML_ENTITY.sub(lambda m: " " * len(m.group(0)) if m.group(1) in name2codepoint else m.group(0), text)
+    parser = ElementTree.XMLParser()
+    try:
+        parser.feed(f"<para>{xml}</para>")
+        root = parser.close()
+    except ElementTree.ParseError as e:
+        line, column = e.position
+        # Report the column within ``text``, not within the <para> wrapper.
+        return f"malformed markup at column {column - 5 if line == 1 else column + 1}: {text!r}"
+    for element in root.iter():
+        if element is not root and element.tag not in MARKUP_TAGS:
+            return f"unknown tag <{element.tag}>: {text!r}"
+    return None
+
+
+class _Checker:
+    def __init__(self, width):
+        self.width = width
+        self.problems = []
+        self.texts = 0
+        self.tables = 0
+
+    def problem(self, section_id, where, message):
+        self.problems.append(Problem(section_id, where, message))
+
+    def text(self, section_id, where, text):
+        self.texts += 1
+        if not isinstance(text, str):
+            self.problem(section_id, where, f"expected text, got {type(text).__name__}")
+            return
+        for name in _ANY_PLACEHOLDER.findall(text):
+            if name not in _PLACEHOLDERS:
+                self.problem(section_id, where, f"unknown placeholder {{{name}}}")
+        error = markup_error(text)
+        if error:
+            self.problem(section_id, where, error)
+
+    def plain(self, section_id, where, text):
+        self.texts += 1
+        if _MARKUP_IN_PLAIN.search(text):
+            self.problem(section_id, where, f"plain-text cell contains markup, printed literally: {text!r}")
+
+    def columns(self, section_id, where, block, rows):
+        self.tables += 1
+        col_widths = block.get("col_widths") or []
+        total = sum(col_widths)
+        if total > self.width:
+            self.problem(section_id, where, f"columns are {total:g}pt wide; the frame is {self.width:g}pt")
+        for r, row in enumerate(rows):
+            if len(row) != len(col_widths):
+                self.problem(section_id, f"{where} row {r + 1}", f"{len(row)} cells for {len(col_widths)} columns")
+
+    def block(self, section_id, where, block):
+        kind = block.get("type")
+        if kind in ("paragraph", "bullets"):
+            style = block.get("style", "body")
+            if style not in playbook.PARAGRAPH_STYLES:
+                self.problem(section_id, where, f"unknown paragraph style {style!r}")
+            if kind == "bullets":
+                self.text(section_id, f"{where} title", block.get("title"))
+                for i, item in enumerate(block.get("items", ())):
+                    self.text(section_id, f"{where} item {i + 1}", item)
+            else:
+                self.text(section_id, where, block.get("text"))
+        elif kind == "table":
+            from playbook_content import TABLE_STYLES
+
+            if block.get("style") not in TABLE_STYLES:
+                self.problem(section_id, where, f"unknown table style {block.get('style')!r}")
+            header = block.get("header")
+            rows = ([header] if header else []) + list(block.get("rows", ()))
+            self.columns(section_id, where, block, rows)
+            for r, row in enumerate(rows):
+                for c, cell in enumerate(row):
+                    self.text(section_id, f"{where} row {r + 1} cell {c + 1}", cell)
+        elif kind == "info_table":
+            rows = block.get("rows", ())
+            self.columns(section_id, where, block, rows)
+            for r, row in enumerate(rows):
+                for c, cell in enumerate(row):
+                    self.plain(section_id, f"{where} row {r + 1} cell {c + 1}", cell)
+        elif kind in ("toc", "client_info"):
+            self.columns(section_id, where, block, [[None, None]])
+        elif kind == "spacer":
+            if not isinstance(block.get("height"), (int, float)):
+                self.problem(section_id, where, "spacer needs a numeric height")
+        else:
+            self.problem(section_id, where, f"unknown block type {kind!r}")
+
+    def contents(self, sections):
+        ids = [section.get("id") for section in sections]
+        for section_id in sorted({i for i in ids if ids.count(i) > 1}):
+            self.problem(section_id, "", "duplicate section id")
+
+        toc_sections = [
+            section["id"] for section in sections
+            if any(block.get("type") == "toc" for block in section.get("blocks", ()))
+        ]
+        listed = [section for section in sections if section.get("heading") and section.get("toc", True)]
+        if listed and not toc_sections:
+            self.problem("", "", "headings are listed for a table of contents, but no section has a toc block")
+        for section_id in toc_sections[1:]:
+            self.problem(section_id, "", "second table of contents")
+
+        expected = 1
+        labels = {}
+        for section in listed:
+            label = playbook.toc_label(section["heading"])
+            if label in labels:
+                self.problem(section["id"], "heading", f"same table of contents entry as {labels[label]!r}")
+            labels.setdefault(label, section["id"])
+            match = _NUMBERED.match(section["heading"])
+            if match:
+                number = int(match.group(1))
+                if number != expected:
+                    self.problem(section["id"], "heading", f"numbered {number}, expected {expected}")
+                expected += 1
+
+
+def check_sections(sections=None):
+    """Check a section model (default: ``playbook_content.SECTIONS``); returns a CheckReport."""
+    started = time.perf_counter()
+    default_content = sections is None
+    if default_content:
+        from playbook_content import SECTIONS as sections
+
+    checker = _Checker(frame_width())
+    for section in sections:
+        section_id = section.get("id") or "?"
+        if section.get("heading") is not None:
+            checker.text(section_id, "heading", section["heading"])
+        for b, block in enumerate(section.get("blocks", ())):
+            checker.block(section_id, f"block {b + 1} ({block.get('type')})", block)
+    checker.contents(sections)
+    if default_content:
+        from playbook_locales import CATALOGS, stale_entries
+
+        for locale, catalog in CATALOGS.items():
+            for source, translation in catalog.items():
+                checker.text(f"locale {locale}", f"translation of {source[:40]!r}", translation)
+            for source in stale_entries(locale, sections):
+                checker.problem(f"locale {locale}", "", f"no longer in the content, update the catalog: {source!r}")
+    return CheckReport(
+        checker.problems,
+        sections=len(sections),
+        texts=checker.texts,
+        tables=checker.tables,
+        elapsed=time.perf_counter() - started,
+    )
+
+
+def print_report(report, log=sys.stdout):
+    """Print ``report`` in the CLI's summary style; returns the exit status."""
+    for problem in report.problems:
+        print(f"❌ {problem}", file=log)
+    summary = f"{report.sections} sections, {report.texts} texts, {report.tables} tables in {report.elapsed * 1000:.1f}ms"
+    if report.ok:
+        print(f"✅ Content check passed: {summary}", file=log)
+        return 0
+    print(f"❌ Content check failed: {len(report.problems)} problem(s) in {summary}", file=log)
+    return 1
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Validate the playbook content without rendering it.")
+    parser.parse_args(argv)
+    return print_report(check_sections())
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
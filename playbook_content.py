@@ -0,0 +1,551 @@
+"""
+Content of the IRS Audit Defense Playbook, described as data.
+
+Nothing here imports reportlab: the section model is plain dicts and lists so
+it can be validated, diffed or rendered to other formats without loading the
+PDF toolkit. ``generate_irs_audit_defense_playbook.compile_playbook`` turns it
+into flowables.
+
+Each section is a dict:
+
+    id          stable identifier
+    heading     heading text (reportlab paragraph markup); omitted for the cover
+    new_page    start the section on a new page (default True)
+    space_before  points of space before the heading when not on a new page
+    heading_space points of space after the heading (default 8)
+    toc         list the heading in the table of contents (default True)
+    blocks      list of blocks, each a dict with a ``type``:
+
+        paragraph    text, style ("body" | "warning" | "header")
+        bullets      title, items, style - rendered as a bold title and "- " lines
+        spacer       height
+        table        header (optional), rows, col_widths, style (a TABLE_STYLES name)
+        info_table   rows of plain-text [label, value] pairs, col_widths
+        client_info  the per-client notice summary; only rendered for personalized builds
+        toc          the table of contents: every listed heading with its page, col_widths
+
+Text may contain ``{effective_date}``, ``{client_name}`` and ``{notice_code}``
+placeholders, filled in per build.
+"""
+
+# Table styles shared by every table in the playbook. Each is built once per
+# process and reused by all tables (and all documents) that name it.
+TABLE_STYLES = {
+    # Header row in brand navy, alternating body rows.
+    "data": {"header": True, "align": "LEFT", "valign": "TOP", "padding": 6},
+    "data_spacious": {"header": True, "align": "LEFT", "valign": "TOP", "padding": 8},
+    "data_centered": {"header": True, "align": "CENTER", "valign": "CENTER", "padding": 6},
+    # Label/value tables on the cover page.
+    "info": {"label_column": True, "padding": 6, "font_size": 10},
+    # Shaded single-row footer.
+    "footer": {"shaded": True, "padding": 8},
+    # Table of contents: entry and right-aligned page number.
+    "toc": {"contents": True, "padding": 4, "font_size": 10},
+}
+
+# Section 3 classification matrix. The playbook table is rendered from these
+# rules and playbook_rules.py evaluates them, so the two cannot disagree.
+#
+#   deadline_days       response deadline, in days from the notice date
+#   as_specified        a deadline stated on the notice overrides deadline_days
+#   escalate_over       escalate when the proposed change exceeds this many
+#                       dollars; None escalates every notice immediately
+#   escalate_to         who the notice escalates to
+#
+# The *_text templates are formatted with the rule's own numbers: {days},
+# {to}, {amount} ($10,000) and {thousands} ($10K).
+CLASSIFICATION_RULES = [
+    {
+        "classification": "INFORMATION REQUEST",
+        "examples": "CP2000, Math verification, Routine inquiry",
+        "deadline_days": 30,
+        "as_specified": False,
+        "deadline_text": "{days} days from notice date",
+        "escalate_over": 5000,
+        "escalate_to": "Manager review",
+        "escalation_text": "{to} if &gt; {thousands} change",
+    },
+    {
+        "classification": "AUDIT NOTICE (Low Risk)",
+        "examples": "Correspondence audit, Form inquiry",
+        "deadline_days": 30,
+        "as_specified": False,
+        "deadline_text": "{days} days from notice date",
+        "escalate_over": 10000,
+        "escalate_to": "CTO + Legal",
+        "escalation_text": "{to} if &gt; {thousands}",
+    },
+    {
+        "classification": "AUDIT NOTICE (High Risk)",
+        "examples": "Office audit, Fieldwork notice, Criminal referral",
+        "deadline_days": 15,
+        "as_specified": False,
+        "deadline_text": "{days} days from notice date",
+        "escalate_over": None,
+        "escalate_to": "Legal counsel",
+        "escalation_text": "IMMEDIATE: {to}",
+    },
+    {
+        "classification": "PENALTY NOTICE",
+        "examples": "Accuracy-related, Negligence, Fraud penalty",
+        "deadline_days": 30,
+        "as_specified": True,
+        "deadline_text": "{days} days or as specified",
+        "escalate_over": None,
+        "escalate_to": "Legal counsel",
+        "escalation_text": "IMMEDIATE: {to}",
+    },
+]
+
+# Section 8 escalation triggers, evaluated per notice on top of the matrix.
+#
+#   field           the notice column the trigger reads
+#   over            fire when the column exceeds this amount; None fires on a true flag
+#   within_hours    response window; 0 means immediately
+#   escalate_to     who the notice escalates to when only this trigger fired
+TRIGGER_RULES = [
+    {
+        "trigger_text": "Penalty &gt; {amount}",
+        "field": "penalty_amount",
+        "over": 10000,
+        "action": "Notify legal counsel. Prepare penalty defense memo.",
+        "within_hours": 2,
+        "escalate_to": "Legal counsel",
+    },
+    {
+        "trigger_text": "Criminal Referral Language",
+        "field": "criminal_referral",
+        "over": None,
+        "action": "STOP all communications. Retain criminal tax attorney immediately.",
+        "within_hours": 0,
+        "escalate_to": "Criminal tax attorney",
+    },
+    {
+        "trigger_text": "Fraud Allegation",
+        "field": "fraud",
+        "over": None,
+        "action": "Treat as criminal matter. Engage specialized tax attorney.",
+        "within_hours": 0,
+        "escalate_to": "Specialized tax attorney",
+    },
+]
+
+
+def _rule_text(template, days=None, to=None, over=None):
+    amount = thousands = ""
+    if over is not None:
+        amount = f"${over:,}"
+        thousands = f"${over // 1000}K"
+    return template.format(days=days, to=to, amount=amount, thousands=thousands)
+
+
+def classification_rows(rules=CLASSIFICATION_RULES):
+    """Section 3 table rows for ``rules``."""
+    return [
+        [
+            rule["classification"],
+            rule["examples"],
+            _rule_text(rule["deadline_text"], days=rule["deadline_days"]),
+            _rule_text(rule["escalation_text"], to=rule["escalate_to"], over=rule["escalate_over"]),
+        ]
+        for rule in rules
+    ]
+
+
+def trigger_rows(rules=TRIGGER_RULES):
+    """Section 8 table rows for ``rules``."""
+    return [
+        [
+            _rule_text(rule["trigger_text"], over=rule["over"]),
+            rule["action"],
+            f"Within {rule['within_hours']} hours" if rule["within_hours"] else "IMMEDIATE",
+        ]
+        for rule in rules
+    ]
+
+
+# Approved Script #2 (Section 7), also the cover letter of evidence packets
+# (playbook_packet.py), which fill in RESPONSE_PLACEHOLDER.
+RESPONSE_PLACEHOLDER = "[INSERT RESPONSE / ATTACHMENTS]"
+RESPONSE_LETTER_SCRIPT = (
+    "On behalf of {client_name}, we hereby respond to your {notice_code} as follows: "
+    f"{RESPONSE_PLACEHOLDER}."
+)
+
+SECTIONS = [
+    {
+        "id": "cover",
+        "blocks": [
+            {"type": "spacer", "height": 36},
+            {"type": "paragraph", "style": "title", "text": "IRS AUDIT DEFENSE PLAYBOOK"},
+            {"type": "paragraph", "style": "subtitle", "text": "Ross Tax Prep &amp; Bookkeeping LLC"},
+            {"type": "spacer", "height": 12},
+            {
+                "type": "info_table",
+                "col_widths": [150, 300],
+                "rows": [
+                    ["Business Name:", "Ross Tax Prep & Bookkeeping LLC"],
+                    ["EIN:", "33-4891499"],
+                    ["Location:", "Killeen & Temple, Texas"],
+                    ["Document Type:", "Confidential | Internal Use Only"],
+                    ["Effective Date:", "{effective_date}"],
+                    ["Classification:", "CONFIDENTIAL - Attorney-Client Privileged"],
+                ],
+            },
+            {"type": "spacer", "height": 24},
+            {"type": "client_info", "col_widths": [150, 300]},
+            {"type": "paragraph", "style": "header", "text": "<b>CONFIDENTIALITY NOTICE</b>"},
+            {
+                "type": "paragraph",
+                "text": (
+                    "This document is privileged and confidential attorney work product and is intended solely for the use "
+                    "of Ross Tax Prep &amp; Bookkeeping LLC and its authorized representatives. If you are not the intended "
+                    "recipient, please do not read, distribute, or take action based on this document. Unauthorized disclosure "
+                    "may waive attorney-client privilege."
+                ),
+            },
+        ],
+    },
+    {
+        "id": "toc",
+        "heading": "TABLE OF CONTENTS",
+        "heading_space": 12,
+        "toc": False,
+        "blocks": [
+            {"type": "toc", "col_widths": [456, 60]},
+        ],
+    },
+    {
+        "id": "purpose",
+        "heading": "1. PURPOSE &amp; SCOPE",
+        "blocks": [
+            {
+                "type": "paragraph",
+                "text": (
+                    "<b>Objective:</b> This playbook establishes centralized procedures for managing IRS notices, audit inquiries, "
+                    "and related compliance matters to minimize risk, protect client confidentiality, and ensure consistent, defensible responses."
+                ),
+            },
+            {"type": "spacer", "height": 12},
+            {
+                "type": "paragraph",
+                "text": (
+                    "<b>Scope:</b> This playbook applies to all staff members, contractors, and partners involved in tax preparation, "
+                    "audit defense, or IRS communication at Ross Tax Prep &amp; Bookkeeping LLC."
+                ),
+            },
+            {"type": "spacer", "height": 12},
+            {
+                "type": "paragraph",
+                "text": (
+                    "<b>Authority:</b> This procedure is authorized under IRC &#167;6001 (Records), Treasury Regulation &#167;1.6001-1 "
+                    "(Records and their retention), and Circular 230 (Standards for tax practitioners)."
+                ),
+            },
+        ],
+    },
+    {
+        "id": "principles",
+        "heading": "2. CORE AUDIT DEFENSE PRINCIPLES",
+        "new_page": False,
+        "space_before": 16,
+        "blocks": [
+            {
+                "type": "table",
+                "style": "data_spacious",
+                "col_widths": [140, 360],
+                "header": ["Principle", "Description"],
+                "rows": [
+                    [
+                        "Centralized Communication",
+                        "All IRS communication is handled exclusively by the Audit Defense Team (Admin + CTO). "
+                        "No direct staff-to-IRS contact is permitted.",
+                    ],
+                    [
+                        "Written Responses Only",
+                        "All IRS responses are provided in writing with documented delivery. Verbal responses are prohibited "
+                        "unless explicitly authorized by legal counsel.",
+                    ],
+                    [
+                        "No Admissions of Liability",
+                        "Staff are trained to never admit fault, speculate about corrections, or volunteer additional "
+                        "information beyond what is directly requested.",
+                    ],
+                    [
+                        "24-72 Hour Buffer",
+                        "No response is sent within 24 hours of receipt. This ensures review, legal analysis, and quality control. "
+                        "Responses are sent within 72 hours or deadline, whichever is sooner.",
+                    ],
+                ],
+            },
+        ],
+    },
+    {
+        "id": "classification",
+        "heading": "3. IRS NOTICE CLASSIFICATION &amp; RESPONSE TIMELINE",
+        "blocks": [
+            {
+                "type": "paragraph",
+                "text": (
+                    "All IRS notices must be immediately classified by the Audit Defense Team. Classification determines "
+                    "response timeline, escalation, and required documentation."
+                ),
+            },
+            {"type": "spacer", "height": 12},
+            {
+                "type": "table",
+                "style": "data",
+                "col_widths": [120, 120, 130, 130],
+                "header": ["Classification", "Examples", "Response Deadline", "Escalation"],
+                "rows": classification_rows(),
+            },
+        ],
+    },
+    {
+        "id": "receipt",
+        "heading": "4. NOTICE RECEIPT &amp; LOGGING PROCEDURES",
+        "blocks": [
+            {
+                "type": "bullets",
+                "title": "Step 1: Receipt &amp; Initial Review (Same Day)",
+                "items": [
+                    "Any staff member receiving an IRS notice must immediately notify the Admin",
+                    "Notice is logged in centralized Notice Tracking Spreadsheet with timestamp",
+                    "Notice is scanned and securely stored in shared drive",
+                ],
+            },
+            {"type": "spacer", "height": 12},
+            {
+                "type": "bullets",
+                "title": "Step 2: Classification (Within 2 Hours)",
+                "items": [
+                    "Admin classifies notice using Notice Classification Matrix (Section 3)",
+                    "Response deadline is calculated and entered into Notice Log",
+                    "If HIGH RISK or PENALTY NOTICE: CTO and legal counsel are notified within 2 hours",
+                    "Client is notified of notice receipt and planned response timeline",
+                ],
+            },
+            {"type": "spacer", "height": 12},
+            {
+                "type": "bullets",
+                "title": "Step 3: Evidence Gathering (Within 24 Hours)",
+                "items": [
+                    "Audit Defense Team retrieves engagement letter, tax return, and workpapers",
+                    "Review for completeness, accuracy, and discrepancies with IRS question",
+                    "Identify any missing documentation and request from client if needed",
+                    "All evidence is organized and indexed in Notice folder",
+                ],
+            },
+            {"type": "spacer", "height": 12},
+            {
+                "type": "bullets",
+                "title": "Step 4: Response Preparation (Within 48-72 Hours)",
+                "items": [
+                    "CTO prepares draft response using approved templates and scripts",
+                    "Response is reviewed for accuracy and consistency with prior positions",
+                    "Client is consulted on any changes to prior positions",
+                    "Legal counsel reviews if penalties or fraud allegations present",
+                    "Final response is approved by Admin/CTO before mailing",
+                ],
+            },
+        ],
+    },
+    {
+        "id": "authorization",
+        "heading": "5. STAFFING &amp; COMMUNICATION AUTHORIZATION MATRIX",
+        "blocks": [
+            {
+                "type": "table",
+                "style": "data",
+                "col_widths": [100, 130, 220],
+                "header": ["Role", "Authorization Level", "Permitted Actions"],
+                "rows": [
+                    ["Preparers", "NONE", "Must escalate any IRS communication to Admin."],
+                    ["Staff", "LIMITED", "May receive/acknowledge receipt. Must immediately escalate to Audit Defense Team."],
+                    ["CTO", "FULL", "Manages all aspects: receive, classify, respond, escalate, interface with legal counsel."],
+                    ["Legal Counsel", "ADVISORY", "Consults on penalty notices, criminal referrals, fraud allegations. Reviews responses."],
+                ],
+            },
+        ],
+    },
+    {
+        "id": "retention",
+        "heading": "6. EVIDENCE RETENTION &amp; DOCUMENT MANAGEMENT",
+        "blocks": [
+            {
+                "type": "paragraph",
+                "text": (
+                    "<b>Retention Policy Summary:</b> All tax records, workpapers, engagement letters, correspondence, and IRS acknowledgments "
+                    "must be retained for a minimum of <b>seven (7) years</b> from the later of: (a) tax return filing date, or (b) client "
+                    "engagement termination."
+                ),
+            },
+            {"type": "spacer", "height": 12},
+            {
+                "type": "table",
+                "style": "data",
+                "col_widths": [150, 120, 180],
+                "header": ["Document Type", "Retention Period", "Storage Location"],
+                "rows": [
+                    ["Tax Returns &amp; Forms", "7 years", "Secure server + encrypted backup"],
+                    ["Workpapers &amp; Schedules", "7 years", "Secure server + encrypted backup"],
+                    ["Engagement Letters", "7 years", "Client file + CRM system"],
+                    ["IRS Correspondence", "7 years", "Compliance folder + backup DB"],
+                ],
+            },
+        ],
+    },
+    {
+        "id": "scripts",
+        "heading": "7. APPROVED IRS COMMUNICATION SCRIPTS",
+        "blocks": [
+            {
+                "type": "paragraph",
+                "text": (
+                    "<b>Script #1: Notice Receipt Acknowledgment</b><br/>"
+                    "<i>\"Thank you for contacting Ross Tax Prep &amp; Bookkeeping LLC. All IRS correspondence and inquiries are "
+                    "handled by our compliance team. Please submit requests in writing to our office address.\"</i>"
+                ),
+            },
+            {"type": "spacer", "height": 12},
+            {
+                "type": "paragraph",
+                "text": f"<b>Script #2: Standard Response Cover Letter</b><br/><i>\"{RESPONSE_LETTER_SCRIPT}\"</i>",
+            },
+            {"type": "spacer", "height": 12},
+            {
+                "type": "bullets",
+                "style": "warning",
+                "title": "PROHIBITED PHRASES:",
+                "items": [
+                    "\"We made a mistake...\" (admission of error)",
+                    "\"The client didn't provide...\" (shifting blame)",
+                    "\"We weren't aware of...\" (lack of diligence)",
+                    "\"We assumed...\" (speculation)",
+                    "Any verbal responses or admissions to IRS agents",
+                ],
+            },
+        ],
+    },
+    {
+        "id": "escalation",
+        "heading": "8. ESCALATION THRESHOLDS &amp; TRIGGERS",
+        "blocks": [
+            {
+                "type": "table",
+                "style": "data",
+                "col_widths": [130, 220, 100],
+                "header": ["Trigger", "Action", "Timeline"],
+                "rows": trigger_rows(),
+            },
+        ],
+    },
+    {
+        "id": "training",
+        "heading": "9. STAFF TRAINING &amp; COMPLIANCE",
+        "blocks": [
+            {
+                "type": "bullets",
+                "title": "Required Training:",
+                "items": [
+                    "All staff must complete IRS Audit Defense Training before handling client files",
+                    "Training covers: Notice classification, escalation procedures, approved scripts",
+                    "Annual refresher training required for all staff",
+                    "New staff must pass quiz (80% minimum) before unsupervised client access",
+                ],
+            },
+            {"type": "spacer", "height": 12},
+            {
+                "type": "bullets",
+                "title": "Monitoring &amp; Compliance:",
+                "items": [
+                    "All IRS communications logged in centralized tracking system",
+                    "Monthly audit of Notice Log to verify proper classification",
+                    "Quarterly compliance review with all staff",
+                    "Any violation of these procedures results in disciplinary action",
+                ],
+            },
+            {"type": "spacer", "height": 12},
+            {
+                "type": "paragraph",
+                "text": (
+                    "<b>Confidentiality &amp; Privilege:</b><br/>"
+                    "All IRS notices, responses, and audit work are considered attorney work product. "
+                    "Staff are prohibited from discussing audit matters with anyone except authorized personnel (CTO, Admin, legal counsel)."
+                ),
+            },
+        ],
+    },
+    {
+        "id": "post_audit",
+        "heading": "10. POST-AUDIT REVIEW &amp; REMEDIATION",
+        "blocks": [
+            {
+                "type": "paragraph",
+                "text": (
+                    "Upon resolution of any IRS notice, the Audit Defense Team must conduct a comprehensive review to identify root causes."
+                ),
+            },
+            {"type": "spacer", "height": 12},
+            {
+                "type": "bullets",
+                "title": "Post-Audit Review Checklist:",
+                "items": [
+                    "Verify IRS determination is fully satisfied",
+                    "Analyze root cause: Return position, inadequate documentation, preparer error, or client misstatement",
+                    "Assess exposure: Would this issue affect other prior-year returns",
+                    "Update procedures: If preparer error, update SOPs",
+                    "Update workpaper: Document conclusion and any changes accepted by IRS",
+                    "Client communication: Explain outcome and lessons learned",
+                    "Firm learning: Memorialize finding in quality control database",
+                ],
+            },
+        ],
+    },
+    {
+        "id": "emergency",
+        "heading": "11. EMERGENCY CONTACT PROTOCOLS",
+        "blocks": [
+            {
+                "type": "paragraph",
+                "text": "In the event of a critical IRS matter, breach, or emergency, notify the following contacts in order:",
+            },
+            {"type": "spacer", "height": 12},
+            {
+                "type": "table",
+                "style": "data_centered",
+                "col_widths": [80, 140, 140, 140],
+                "header": ["Priority", "Contact", "Role", "Method"],
+                "rows": [
+                    ["1", "CTO / Admin", "Incident Commander", "Phone + Email"],
+                    ["2", "CEO", "Executive", "Phone + Email"],
+                    ["3", "External Legal Counsel", "Attorney", "Direct dial (on file)"],
+                ],
+            },
+            {"type": "spacer", "height": 24},
+            {
+                "type": "paragraph",
+                "style": "warning",
+                "text": "<b>Do NOT discuss audit matters with anyone not listed above without explicit authorization from CTO.</b>",
+            },
+        ],
+    },
+    {
+        "id": "footer",
+        "blocks": [
+            {"type": "spacer", "height": 12},
+            {
+                "type": "table",
+                "style": "footer",
+                "col_widths": [200, 150, 150],
+                "rows": [
+                    [
+                        "<b>Document:</b> IRS Audit Defense Playbook",
+                        "<b>Effective:</b> {effective_date}",
+                        "<b>Classification:</b> CONFIDENTIAL",
+                    ],
+                ],
+            },
+        ],
+    },
+]
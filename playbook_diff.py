@@ -0,0 +1,429 @@
+#!/usr/bin/env python3
+"""
+Change logs between two versions of the playbook content.
+
+When compliance edits the content (a threshold in the Section 3
+classification matrix, a retention period, a script) the playbook is
+re-issued with a record of what changed. ``diff_sections`` compares two
+section models in time linear in their size:
+
+- every section, block, table row and bullet item is hashed;
+- sections are matched by id, blocks by their type and table header or
+  bullet title, rows by their first cell and items by position, each with
+  one dictionary lookup;
+- only sections whose hash differs are walked further, and unchanged
+  items are skipped by hash before anything is compared cell by cell.
+
+``render_change_log`` lays the changes out as a short PDF in the playbook's
+styles. ``reissue`` rebuilds the playbook from the new content through a
+``playbook_fragments.FragmentCache``, so only the page runs of changed
+sections are laid out again.
+
+    python playbook_diff.py HEAD~1                     # git revision of playbook_content.py
+    python playbook_diff.py old_content.py new_content.py
+    python generate_irs_audit_defense_playbook.py --diff HEAD~1 --fragments
+
+Requires pypdf for ``reissue`` (``pip install pypdf``).
+"""
+
+import argparse
+import hashlib
+import importlib.util
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from typing import List, Optional
+from xml.sax.saxutils import escape, unescape
+
+import generate_irs_audit_defense_playbook as playbook
+import playbook_content
+
+CHANGE_COL_WIDTHS = [60, 136, 160, 160]
+
+
+@dataclass
+class Change:
+    section_id: str
+    section: str  # heading, or the section id for sections without one
+    kind: str  # "added", "removed" or "changed"
+    where: str  # markup, like ``old`` and ``new``
+    old: Optional[str] = None
+    new: Optional[str] = None
+
+
+@dataclass
+class ContentDiff:
+    changes: List[Change] = field(default_factory=list)
+    sections: int = 0
+    compared: int = 0  # sections whose hash differed and were walked
+    elapsed: float = 0.0
+
+    @property
+    def changed_sections(self):
+        """Ids of the sections with changes, in order of first change."""
+        return list(dict.fromkeys(change.section_id for change in self.changes))
+
+
+def content_hash(value):
+    """Hash of any JSON-serializable part of the section model."""
+    return hashlib.sha256(json.dumps(value, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _match(old, new, key):
+    """
+    Pair up ``old`` and ``new`` items in linear time: identical items (by
+    hash) first, then the rest by ``key(item, position)``. Returns
+    ``(old, new)`` pairs for changed items, then added and removed items.
+    """
+    by_hash = defaultdict(deque)
+    for i, item in enumerate(old):
+        by_hash[content_hash(item)].append(i)
+    matched = set()
+    unmatched = []
+    for j, item in enumerate(new):
+        candidates = by_hash.get(content_hash(item))
+        if candidates:
+            matched.add(candidates.popleft())
+        else:
+            unmatched.append(j)
+
+    by_key = defaultdict(deque)
+    for i, item in enumerate(old):
+        if i not in matched:
+            by_key[key(item, i)].append(i)
+    changed, added = [], []
+    for j in unmatched:
+        candidates = by_key.get(key(new[j], j))
+        if candidates:
+            i = candidates.popleft()
+            matched.add(i)
+            changed.append((old[i], new[j]))
+        else:
+            added.append(new[j])
+    removed = [item for i, item in enumerate(old) if i not in matched]
+    return changed, added, removed
+
+
+def _plain(value):
+    if isinstance(value, list):
+        return " | ".join(value)
+    return value
+
+
+def _block_key(block, position):
+    kind = block.get("type")
+    if kind == "table":
+        return kind, tuple(block.get("header") or ())
+    if kind == "bullets":
+        return kind, block.get("title")
+    if kind in ("info_table", "toc", "client_info"):
+        return kind
+    return kind, block.get("style"), position
+
+
+def _block_label(block):
+    kind = block.get("type")
+    if kind == "table" and block.get("header"):
+        return f"table ({', '.join(block['header'])})"
+    if kind == "bullets":
+        return f"list “{block.get('title')}”"
+    return kind.replace("_", " ")
+
+
+def _block_summary(block):
+    if block["type"] in ("paragraph", "bullets"):
+        return playbook.block_text(block)
+    if "rows" in block:
+        return f"{len(block['rows'])} rows"
+    return None
+
+
+def _row_key(row, position):
+    return row[0] if row else position
+
+
+def _item_key(item, position):
+    return position
+
+
+class _Differ:
+    def __init__(self):
+        self.changes = []
+
+    def add(self, section, kind, where, old=None, new=None):
+        label = section.get("heading") or escape(section["id"])
+        self.changes.append(Change(section["id"], label, kind, where, _plain(old), _plain(new)))
+
+    def rows(self, section, where, old_rows, new_rows, key, noun, plain=False):
+        if plain:
+            # Plain-text cells (info tables) become markup like every other change.
+            old_rows, new_rows = ([[escape(cell) for cell in row] for row in rows] for rows in (old_rows, new_rows))
+        changed, added, removed = _match(old_rows, new_rows, key)
+        for old, new in changed:
+            if isinstance(old, list):
+                header = f"{noun} “{old[0]}”" if old else noun
+                cells = [c for c in range(max(len(old), len(new))) if old[c:c + 1] != new[c:c + 1]]
+                self.add(
+                    section, "changed", f"{where}, {header}",
+                    [old[c] for c in cells if c < len(old)], [new[c] for c in cells if c < len(new)],
+                )
+            else:
+                self.add(section, "changed", f"{where}, {noun}", old, new)
+        for row in added:
+            self.add(section, "added", f"{where}, {noun}", new=row)
+        for row in removed:
+            self.add(section, "removed", f"{where}, {noun}", old=row)
+
+    def block(self, section, old, new):
+        where = _block_label(new)
+        kind = new.get("type")
+        if kind == "paragraph":
+            if old.get("text") != new.get("text"):
+                self.add(section, "changed", where, old.get("text"), new.get("text"))
+        elif kind == "bullets":
+            self.rows(section, where, old.get("items", []), new.get("items", []), _item_key, "item")
+        elif kind in ("table", "info_table"):
+            self.rows(section, where, old.get("rows", []), new.get("rows", []), _row_key, "row", kind == "info_table")
+        for name in sorted(set(old) | set(new)):
+            if name in ("text", "items", "rows", "type") or old.get(name) == new.get(name):
+                continue
+            self.add(
+                section, "changed", f"{where}, {name.replace('_', ' ')}",
+                escape(str(old.get(name))), escape(str(new.get(name))),
+            )
+
+    def section(self, old, new):
+        for name in sorted(set(old) | set(new)):
+            if name in ("id", "blocks") or old.get(name) == new.get(name):
+                continue
+            if name == "heading":
+                self.add(new, "changed", "heading", old.get(name), new.get(name))
+            else:
+                self.add(new, "changed", name.replace("_", " "), escape(str(old.get(name))), escape(str(new.get(name))))
+        changed, added, removed = _match(old["blocks"], new["blocks"], _block_key)
+        for old_block, new_block in changed:
+            self.block(new, old_block, new_block)
+        for block in added:
+            self.add(new, "added", _block_label(block), new=_block_summary(block))
+        for block in removed:
+            self.add(new, "removed", _block_label(block), old=_block_summary(block))
+
+
+def diff_sections(old_sections, new_sections):
+    """Compare two section models; returns a ContentDiff."""
+    started = time.perf_counter()
+    differ = _Differ()
+    report = ContentDiff(sections=len(new_sections))
+    old_by_id = {section["id"]: section for section in old_sections}
+    new_ids = set()
+    for section in new_sections:
+        new_ids.add(section["id"])
+        old = old_by_id.get(section["id"])
+        if old is None:
+            differ.add(section, "added", "section", new=section.get("heading"))
+        elif content_hash(old) != content_hash(section):
+            report.compared += 1
+            differ.section(old, section)
+    for section in old_sections:
+        if section["id"] not in new_ids:
+            differ.add(section, "removed", "section", old=section.get("heading"))
+    report.changes = differ.changes
+    report.elapsed = time.perf_counter() - started
+    return report
+
+
+def load_sections(source):
+    """
+    The SECTIONS of a content version: a path to a content module, or a git
+    revision of ``playbook_content.py`` (e.g. ``HEAD~1``).
+    """
+    if os.path.isfile(source):
+        path, cleanup = source, False
+    else:
+        directory, name = os.path.split(os.path.abspath(playbook_content.__file__))
+        try:
+            text = subprocess.run(
+                ["git", "show", f"{source}:./{name}"], cwd=directory, check=True, capture_output=True,
+            ).stdout
+        except (OSError, subprocess.CalledProcessError) as e:
+            raise ValueError(f"{source!r} is neither a content file nor a git revision of playbook_content.py") from e
+        fd, path = tempfile.mkstemp(suffix=".py")
+        with os.fdopen(fd, "wb") as f:
+            f.write(text)
+        cleanup = True
+    try:
+        spec = importlib.util.spec_from_file_location(f"_playbook_content_{abs(hash(source))}", path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    finally:
+        if cleanup:
+            os.unlink(path)
+    if not hasattr(module, "SECTIONS"):
+        raise ValueError(f"{source!r} defines no SECTIONS; is it a playbook content module?")
+    return module.SECTIONS
+
+
+def change_log_flowables(diff, old_label, new_label, options=None):
+    """Flowables for the change log: a summary, then one table of changes per section."""
+    from reportlab.platypus import Paragraph, Spacer, Table
+
+    options = options or playbook.PlaybookOptions()
+    styles = playbook.get_styles()
+    table_styles = playbook.get_table_styles()
+    paragraph = playbook.get_paragraph_cache().paragraph
+    body = styles["BodyStyle"]
+
+    content = [
+        Paragraph("CHANGE LOG", styles["TitleStyle"]),
+        Paragraph(escape(playbook.DOCUMENT_TITLE), styles["SubtitleStyle"]),
+    ]
+    summary = Table(
+        [
+            ["Previous version:", old_label],
+            ["New version:", new_label],
+            ["Effective Date:", options.effective_date_text()],
+            ["Changes:", f"{len(diff.changes)} in {len(diff.changed_sections)} of {diff.sections} sections"],
+        ],
+        colWidths=[150, 300],
+    )
+    summary.setStyle(table_styles["info"])
+    content += [summary, Spacer(1, 18)]
+    if not diff.changes:
+        content.append(Paragraph("No content changes.", body))
+        return content
+
+    by_section = defaultdict(list)
+    for change in diff.changes:
+        by_section[change.section_id].append(change)
+    header = [Paragraph(f"<b>{cell}</b>", styles["Normal"]) for cell in ("Change", "Where", "Before", "After")]
+    for section_id, changes in by_section.items():
+        content.append(Paragraph(changes[0].section, styles["HeaderStyle"]))
+        rows = [header]
+        for change in changes:
+            rows.append([
+                paragraph(change.kind.capitalize(), body),
+                paragraph(change.where, body),
+                paragraph(change.old or "", body),
+                paragraph(change.new or "", body),
+            ])
+        table = Table(rows, colWidths=CHANGE_COL_WIDTHS, repeatRows=1)
+        table.setStyle(table_styles["data"])
+        content += [table, Spacer(1, 12)]
+    return content
+
+
+def render_change_log(output, diff, old_label, new_label, options=None):
+    """Write the change log PDF to ``output`` (a path or binary stream, or None for bytes)."""
+    options = options or playbook.PlaybookOptions()
+    buf = io.BytesIO()
+    playbook.render(change_log_flowables(diff, old_label, new_label, options), buf, None, options)
+    return playbook.write_output(buf.getbuffer(), output)
+
+
+def change_log_path(output):
+    """``playbook.pdf`` -> ``playbook_changes.pdf``."""
+    stem, ext = os.path.splitext(output)
+    return f"{stem}_changes{ext or '.pdf'}"
+
+
+def reissue(output, sections, options=None, fragments=None):
+    """
+    Rebuild the playbook from ``sections`` into ``output``, laying out only the
+    page runs not already in ``fragments`` (default: the on-disk fragment
+    cache); returns the number of runs rendered.
+    """
+    from playbook_cache import RenderCache
+    from playbook_fragments import FragmentCache
+
+    fragments = fragments or FragmentCache(RenderCache(playbook.fragment_cache_dir()))
+    saved, saved_localized = playbook._compiled, dict(playbook._localized)
+    playbook._compiled = playbook.compile_playbook(sections)
+    playbook._localized.clear()
+    misses = fragments.misses
+    try:
+        playbook.build_playbook(output, options, fragments=fragments)
+    finally:
+        playbook._compiled = saved
+        playbook._localized.clear()
+        playbook._localized.update(saved_localized)
+    return fragments.misses - misses
+
+
+def issue_revision(old, output, options=None, cache_dir=None, log=sys.stdout):
+    """
+    Re-issue ``output`` from the current content with a change log against
+    ``old`` (see ``load_sections``) beside it; returns an exit status.
+    """
+    from playbook_cache import RenderCache
+    from playbook_check import check_sections
+    from playbook_fragments import FragmentCache
+
+    sections = playbook_content.SECTIONS
+    report = check_sections(sections)
+    if not report.ok:
+        for problem in report.problems:
+            print(f"❌ {problem}", file=log)
+        return 1
+
+    started = time.perf_counter()
+    try:
+        old_sections = load_sections(old)
+    except ValueError as e:
+        print(f"❌ {e}", file=log)
+        return 1
+    diff = diff_sections(old_sections, sections)
+    print_diff(diff, log)
+    log_path = change_log_path(output)
+    render_change_log(log_path, diff, old, "working tree", options)
+    fragments = FragmentCache(RenderCache(playbook.fragment_cache_dir(cache_dir)))
+    rendered = reissue(output, sections, options, fragments)
+    elapsed = time.perf_counter() - started
+    print(f"✅ Re-issued {output} in {elapsed:.2f}s ({rendered} page run{'' if rendered == 1 else 's'} re-rendered)", file=log)
+    print(f"📄 Change log: {log_path}", file=log)
+    return 0
+
+
+def print_diff(diff, log=sys.stdout):
+    for change in diff.changes:
+        old, new = (unescape(text) if text else text for text in (change.old, change.new))
+        detail = {"changed": f": {old!r} -> {new!r}", "added": f": {new!r}", "removed": f": {old!r}"}[change.kind]
+        if detail == ": None":
+            detail = ""
+        print(f"✏️  {change.section_id}: {change.kind} {unescape(change.where)}{detail}", file=log)
+    print(
+        f"📝 {len(diff.changes)} change(s) in {len(diff.changed_sections)} of {diff.sections} sections "
+        f"({diff.elapsed * 1000:.1f}ms)",
+        file=log,
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Show what changed between two versions of the playbook content.")
+    parser.add_argument("old", help="previous content: a content module path or a git revision of playbook_content.py")
+    parser.add_argument("new", nargs="?", help="new content (default: the current playbook_content.py)")
+    parser.add_argument("--change-log", metavar="PATH", help="also write the change log as a PDF")
+    args = parser.parse_args(argv)
+
+    try:
+        old_sections = load_sections(args.old)
+        new_sections = load_sections(args.new) if args.new else playbook_content.SECTIONS
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+
+    diff = diff_sections(old_sections, new_sections)
+    print_diff(diff)
+    if args.change_log:
+        render_change_log(args.change_log, diff, args.old, args.new or "working tree")
+        print(f"📄 Change log: {args.change_log}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
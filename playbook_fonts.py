@@ -0,0 +1,183 @@
+"""
+Cached text measurement for laying out the playbook.
+
+Nearly all layout time goes to wrapping paragraphs: reportlab measures every
+word of every paragraph (and every table cell) with ``stringWidth``, which
+encodes the text and looks up each glyph on every call, and a paragraph that
+repeats is wrapped again from scratch. Two caches cut that work:
+
+- ``string_width`` measures text from a glyph-width table built once per
+  font (character to width in 1/1000 em) and remembers each
+  (font, size, text) it has measured;
+- ``line_break_paragraph_class`` is a Paragraph whose line breaks are
+  remembered per (font, size, text, width): a repeated paragraph wrapped
+  to a column it has been wrapped to before reuses the broken lines.
+
+Widths are computed with the same arithmetic as reportlab's own
+``stringWidth`` (integer glyph widths summed, then scaled by
+``0.001 * size``), and text the table cannot measure, such as characters
+outside the font's encoding, falls back to reportlab. Cached output is
+byte-identical to uncached output.
+
+Both caches live for the process, so batch workers and watch rebuilds keep
+them warm between documents. ``measured_text()`` routes the paragraph
+module's measurements through ``string_width`` for the duration of a build.
+Builds whose text does not repeat (streamed exports, the notice log) leave
+both off, since entries that are never reused would only grow memory with
+the page count.
+"""
+
+from contextlib import contextmanager
+
+# Entries kept per cache before it is emptied and refilled
+WORD_WIDTH_ENTRIES = 65536
+LINE_BREAK_ENTRIES = 8192
+
+_glyph_widths = {}
+_word_widths = {}
+_paragraph_class = None
+
+
+class TextMetricsStats:
+    """Hit and miss counts of the word-width and line-break caches."""
+
+    def __init__(self):
+        self.width_hits = 0
+        self.width_misses = 0
+        self.break_hits = 0
+        self.break_misses = 0
+
+    def as_dict(self):
+        return dict(vars(self))
+
+
+stats = TextMetricsStats()
+
+
+def glyph_widths(font_name):
+    """
+    ``{character: width in 1/1000 em}`` for every character ``font_name``
+    encodes as a single byte, or None for fonts measured another way
+    (TrueType, CID).
+    """
+    try:
+        return _glyph_widths[font_name]
+    except KeyError:
+        pass
+    from reportlab.pdfbase.pdfmetrics import Font, getFont
+
+    font = getFont(font_name)
+    table = None
+    if type(font) is Font and "UCS-2" not in font.encName:
+        table = {}
+        for code in range(256):
+            byte = bytes((code,))
+            try:
+                char = byte.decode(font.encName)
+                if char.encode(font.encName) != byte:
+                    continue
+            except UnicodeError:
+                continue
+            table[char] = font.widths[code]
+    _glyph_widths[font_name] = table
+    return table
+
+
+def _reportlab_width(text, font_name, font_size, encoding="utf8"):
+    from reportlab.pdfbase.pdfmetrics import getFont
+
+    return getFont(font_name).stringWidth(text, font_size, encoding=encoding)
+
+
+def string_width(text, font_name, font_size, encoding="utf8"):
+    """Drop-in replacement for ``reportlab.pdfbase.pdfmetrics.stringWidth``."""
+    if not isinstance(text, str):
+        return _reportlab_width(text, font_name, font_size, encoding)
+    key = (font_name, font_size, text)
+    width = _word_widths.get(key)
+    if width is not None:
+        stats.width_hits += 1
+        return width
+    stats.width_misses += 1
+    table = glyph_widths(font_name)
+    try:
+        width = sum(map(table.__getitem__, text)) * 0.001 * font_size
+    except (KeyError, TypeError):
+        width = _reportlab_width(text, font_name, font_size, encoding)
+    if len(_word_widths) >= WORD_WIDTH_ENTRIES:
+        _word_widths.clear()
+    _word_widths[key] = width
+    return width
+
+
+@contextmanager
+def measured_text(enabled=True):
+    """Measure paragraph text with ``string_width`` inside the block (if ``enabled``)."""
+    if not enabled:
+        yield
+        return
+    from reportlab.platypus import paragraph
+
+    measure = paragraph.stringWidth
+    paragraph.stringWidth = string_width
+    try:
+        yield
+    finally:
+        paragraph.stringWidth = measure
+
+
+def line_break_paragraph_class():
+    """
+    Paragraph subclass that reuses line breaks for a paragraph it has wrapped
+    before. Instances created with ``line_key`` (the source text) are
+    cached; ones without, such as the halves of a split paragraph, are
+    wrapped as usual.
+    """
+    global _paragraph_class
+    if _paragraph_class is None:
+        from collections import OrderedDict
+
+        from reportlab.platypus import Paragraph
+
+        breaks = OrderedDict()
+
+        class LineBreakParagraph(Paragraph):
+            def __init__(self, text, style=None, bulletText=None, frags=None, caseSensitive=1,
+                         encoding="utf8", line_key=None):
+                super().__init__(text, style, bulletText, frags, caseSensitive, encoding)
+                # Right-to-left drawing reverses the broken lines in place.
+                self._line_key = line_key if not self.style.wordWrap else None
+
+            def breakLines(self, width):
+                if self._line_key is None:
+                    return super().breakLines(width)
+                style = self.style
+                widths = tuple(width) if isinstance(width, (list, tuple)) else (width,)
+                key = (style.fontName, style.fontSize, self._line_key, widths, style, self.bulletText)
+                cached = breaks.get(key)
+                if cached is not None:
+                    breaks.move_to_end(key)
+                    stats.break_hits += 1
+                    bl_para, frags, self._width_max, self._splitLongWordCount, self._hyphenations = cached
+                    self.frags = list(frags)
+                    self.height = 0
+                    return bl_para
+                stats.break_misses += 1
+                bl_para = super().breakLines(width)
+                breaks[key] = (
+                    bl_para, tuple(self.frags), self._width_max, self._splitLongWordCount, self._hyphenations
+                )
+                if len(breaks) > LINE_BREAK_ENTRIES:
+                    breaks.popitem(last=False)
+                return bl_para
+
+        LineBreakParagraph.line_breaks = breaks
+        _paragraph_class = LineBreakParagraph
+    return _paragraph_class
+
+
+def clear():
+    """Empty both caches (the glyph tables are kept)."""
+    _word_widths.clear()
+    if _paragraph_class is not None:
+        _paragraph_class.line_breaks.clear()
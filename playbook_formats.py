@@ -0,0 +1,364 @@
+"""
+HTML and Markdown editions of the IRS Audit Defense Playbook.
+
+Both are emitted from the same section model the PDF is built from
+(``playbook_content.SECTIONS``), styled with the same brand colors, and
+without importing reportlab. The model is walked once: each text's
+paragraph markup is parsed once into runs, and every requested emitter
+receives the parsed runs, so producing the HTML and the Markdown together
+costs little more than producing either.
+
+    from playbook_formats import build_format, render_formats
+    html = build_format("html")                          # str
+    build_format("markdown", "playbook.md")              # write to a path
+    both = render_formats(formats=("html", "markdown"))  # {"html": ..., "markdown": ...}
+
+Outputs are cached in the render cache directory beside the PDFs, keyed by
+the section model, the placeholder values and the brand colors.
+"""
+
+import hashlib
+import html
+import json
+import re
+import xml.etree.ElementTree as ElementTree
+from html.entities import name2codepoint
+
+import generate_irs_audit_defense_playbook as playbook
+
+FORMATS = {"html": ".html", "markdown": ".md"}
+
+# Bump when the emitters' output changes, to invalidate cached editions.
+EMITTER_VERSION = "1"
+
+_HTML_ENTITY = re.compile(r"&(\w+);")
+_XML_ENTITIES = {"amp", "lt", "gt", "quot", "apos"}
+_MARKDOWN_SPECIAL = re.compile(r"([\\`*_\[\]<>|])")
+_MARKDOWN_LIST_START = re.compile(r"^(\d+)\.(\s)")
+
+
+def parse_markup(text):
+    """
+    Split reportlab paragraph markup into ``(text, bold, italic)`` runs;
+    each ``<br/>`` becomes a ``("\\n", False, False)`` run.
+    """
+    xml = _HTML_ENTITY.sub(
+        lambda m: m.group(0) if m.group(1) in _XML_ENTITIES or m.group(1) not in name2codepoint
+        else f"&#{name2codepoint[m.group(1)]};",
+        text,
+    )
+    runs = []
+
+    def add(value, bold, italic):
+        if runs and runs[-1][0] != "\n" and runs[-1][1:] == (bold, italic):
+            runs[-1] = (runs[-1][0] + value, bold, italic)
+        else:
+            runs.append((value, bold, italic))
+
+    def walk(element, bold, italic):
+        if element.tag in ("b", "strong"):
+            bold = True
+        elif element.tag in ("i", "em"):
+            italic = True
+        elif element.tag == "br":
+            runs.append(("\n", False, False))
+        if element.text:
+            add(element.text, bold, italic)
+        for child in element:
+            walk(child, bold, italic)
+            if child.tail:
+                add(child.tail, bold, italic)
+
+    walk(ElementTree.fromstring(f"<para>{xml}</para>"), False, False)
+    return runs
+
+
+def stylesheet():
+    """CSS for the HTML edition, in the PDF's brand colors."""
+    navy, gold, gray, red = playbook.BRAND_NAVY, playbook.BRAND_GOLD, playbook.LIGHT_GRAY, playbook.ACCENT_RED
+    return f"""\
+body {{ font-family: Helvetica, Arial, sans-serif; font-size: 10pt; line-height: 1.4; max-width: 52em; margin: 2em auto; padding: 0 1em; }}
+h1.title {{ color: {navy}; font-size: 24pt; text-align: center; margin-bottom: 0.25em; }}
+p.subtitle {{ color: {gold}; font-size: 12pt; text-align: center; }}
+h2, h3 {{ color: {navy}; }}
+h2 {{ font-size: 14pt; border-bottom: 2px solid {gold}; padding-bottom: 0.2em; margin-top: 2em; }}
+h3 {{ font-size: 12pt; }}
+p {{ text-align: justify; }}
+p.warning {{ color: {red}; font-weight: bold; text-align: left; }}
+table {{ border-collapse: collapse; width: 100%; margin: 0.5em 0 1em; font-size: 9pt; }}
+th, td {{ border: 0.5px solid grey; padding: 6px; text-align: left; vertical-align: top; }}
+table.data thead th {{ background: {navy}; color: white; }}
+table.data tbody tr:nth-child(even) {{ background: {gray}; }}
+table.info th {{ background: {gray}; color: {navy}; width: 33%; }}
+table.info td {{ color: {navy}; }}
+table.footer td {{ background: {gray}; color: {navy}; }}
+nav.toc ol {{ list-style: none; padding-left: 0; }}
+nav.toc a {{ color: {navy}; text-decoration: none; }}
+"""
+
+
+class HtmlEmitter:
+    def __init__(self, title, lang="en"):
+        self.parts = [
+            "<!DOCTYPE html>",
+            f'<html lang="{lang}">',
+            "<head>",
+            '<meta charset="utf-8">',
+            f"<title>{html.escape(title)}</title>",
+            f"<style>\n{stylesheet()}</style>",
+            "</head>",
+            "<body>",
+        ]
+
+    @staticmethod
+    def inline(runs):
+        out = []
+        for value, bold, italic in runs:
+            if value == "\n":
+                out.append("<br>")
+                continue
+            value = html.escape(value, quote=False)
+            if italic:
+                value = f"<em>{value}</em>"
+            if bold:
+                value = f"<strong>{value}</strong>"
+            out.append(value)
+        return "".join(out)
+
+    def heading(self, section_id, runs):
+        self.parts.append(f'<h2 id="section-{section_id}">{self.inline(runs)}</h2>')
+
+    def paragraph(self, runs, style):
+        if style == "title":
+            self.parts.append(f'<h1 class="title">{self.inline(runs)}</h1>')
+        elif style == "header":
+            self.parts.append(f"<h3>{self.inline(runs)}</h3>")
+        else:
+            cls = f' class="{style}"' if style != "body" else ""
+            self.parts.append(f"<p{cls}>{self.inline(runs)}</p>")
+
+    def bullets(self, title, items, style):
+        cls = f' class="{style}"' if style != "body" else ""
+        self.parts.append(f"<p{cls}>{self.inline(title)}</p>")
+        self.parts.append("<ul>" + "".join(f"<li>{self.inline(item)}</li>" for item in items) + "</ul>")
+
+    def table(self, header, rows, style):
+        cls = "footer" if style == "footer" else "data"
+        out = [f'<table class="{cls}">']
+        if header:
+            out.append("<thead><tr>" + "".join(f"<th>{self.inline(cell)}</th>" for cell in header) + "</tr></thead>")
+        out.append("<tbody>")
+        out.extend("<tr>" + "".join(f"<td>{self.inline(cell)}</td>" for cell in row) + "</tr>" for row in rows)
+        out.append("</tbody></table>")
+        self.parts.append("".join(out))
+
+    def info_table(self, rows):
+        out = ['<table class="info"><tbody>']
+        for label, value in rows:
+            out.append(f"<tr><th>{html.escape(label)}</th><td>{html.escape(value)}</td></tr>")
+        out.append("</tbody></table>")
+        self.parts.append("".join(out))
+
+    def toc(self, entries):
+        links = "".join(
+            f'<li><a href="#section-{section_id}">{html.escape(label)}</a></li>' for section_id, label in entries
+        )
+        self.parts.append(f'<nav class="toc"><ol>{links}</ol></nav>')
+
+    def finish(self):
+        return "\n".join(self.parts + ["</body>", "</html>", ""])
+
+
+class MarkdownEmitter:
+    def __init__(self, title, lang="en"):
+        self.parts = []
+
+    @staticmethod
+    def escape(value):
+        return _MARKDOWN_SPECIAL.sub(r"\\\1", value)
+
+    @classmethod
+    def inline(cls, runs, line_break="  \n"):
+        out = []
+        for value, bold, italic in runs:
+            if value == "\n":
+                out.append(line_break)
+                continue
+            # Keep surrounding spaces outside the emphasis markers.
+            stripped = value.strip()
+            if not stripped:
+                out.append(value)
+                continue
+            lead, trail = value[:len(value) - len(value.lstrip())], value[len(value.rstrip()):]
+            text = cls.escape(stripped)
+            if italic:
+                text = f"*{text}*"
+            if bold:
+                text = f"**{text}**"
+            out.append(lead + text + trail)
+        return "".join(out).strip(" ")
+
+    def _block(self, text):
+        # "1. Purpose" at the start of a line would become an ordered list.
+        self.parts.append(_MARKDOWN_LIST_START.sub(r"\1\\.\2", text))
+
+    def heading(self, section_id, runs):
+        self._block("## " + self.inline(runs, " "))
+
+    def paragraph(self, runs, style):
+        text = self.inline(runs)
+        if style == "title":
+            self._block("# " + self.inline(runs, " "))
+        elif style == "header":
+            self._block("### " + self.inline(runs, " "))
+        elif style == "subtitle":
+            self._block(f"*{text}*")
+        elif style == "warning":
+            self.parts.append("> " + text.replace("\n", "\n> "))
+        else:
+            self._block(text)
+
+    def bullets(self, title, items, style):
+        lines = [self.inline(title)]
+        lines.extend("- " + self.inline(item, "<br>") for item in items)
+        block = "\n".join([lines[0], ""] + lines[1:])
+        if style == "warning":
+            block = "> " + block.replace("\n", "\n> ")
+        self.parts.append(block)
+
+    def _pipe_table(self, header, rows):
+        def line(cells):
+            return "| " + " | ".join(cells) + " |"
+
+        lines = [line(header), line(["---"] * len(header))]
+        lines.extend(line(row) for row in rows)
+        self.parts.append("\n".join(lines))
+
+    def table(self, header, rows, style):
+        width = len(header or rows[0])
+        self._pipe_table(
+            [self.inline(cell, "<br>") for cell in header] if header else [" "] * width,
+            [[self.inline(cell, "<br>") for cell in row] for row in rows],
+        )
+
+    def info_table(self, rows):
+        self._pipe_table([" ", " "], [[f"**{self.escape(label)}**", self.escape(value)] for label, value in rows])
+
+    def toc(self, entries):
+        self.parts.append("\n".join(f"- {self.escape(label)}" for _section_id, label in entries))
+
+    def finish(self):
+        return "\n\n".join(self.parts) + "\n"
+
+
+EMITTERS = {"html": HtmlEmitter, "markdown": MarkdownEmitter}
+
+
+def content_sections(locale=None):
+    """The section model in ``locale``, translated directly rather than compiled for the PDF."""
+    from playbook_content import SECTIONS
+    from playbook_locales import localize_sections
+
+    return localize_sections(SECTIONS, locale)
+
+
+def render_formats(options=None, formats=tuple(FORMATS), sections=None):
+    """Emit every format in ``formats`` in one walk over the section model; returns ``{format: str}``."""
+    options = options or playbook.PlaybookOptions()
+    if sections is None:
+        sections = content_sections(options.locale)
+    values = playbook.placeholder_values(options)
+    emitters = [EMITTERS[fmt](playbook.DOCUMENT_TITLE, options.locale) for fmt in formats]
+
+    def parse(text):
+        return parse_markup(playbook._fill(text, values))
+
+    toc_entries = [
+        (section["id"], html.unescape(playbook.toc_label(section["heading"])))
+        for section in sections
+        if section.get("heading") and section.get("toc", True)
+    ]
+    for section in sections:
+        if section.get("heading"):
+            runs = parse(section["heading"])
+            for emitter in emitters:
+                emitter.heading(section["id"], runs)
+        for block in section["blocks"]:
+            kind = block["type"]
+            if kind == "paragraph":
+                runs = parse(block["text"])
+                for emitter in emitters:
+                    emitter.paragraph(runs, block.get("style", "body"))
+            elif kind == "bullets":
+                # As in the PDF (see block_text), the title is set in bold.
+                title = parse(f"<b>{block['title']}</b>")
+                items = [parse(item) for item in block["items"]]
+                for emitter in emitters:
+                    emitter.bullets(title, items, block.get("style", "body"))
+            elif kind == "table":
+                header = [parse(cell) for cell in block.get("header", ())]
+                rows = [[parse(cell) for cell in row] for row in block["rows"]]
+                for emitter in emitters:
+                    emitter.table(header, rows, block["style"])
+            elif kind in ("info_table", "client_info"):
+                if kind == "client_info":
+                    rows = playbook.client_info_rows(options) if options.personalized else []
+                else:
+                    rows = [[playbook._fill(cell, values) for cell in row] for row in block["rows"]]
+                if rows:
+                    for emitter in emitters:
+                        emitter.info_table(rows)
+            elif kind == "toc":
+                for emitter in emitters:
+                    emitter.toc(toc_entries)
+            elif kind != "spacer":
+                raise ValueError(f"Unknown block type: {kind!r}")
+    return {fmt: emitter.finish() for fmt, emitter in zip(formats, emitters)}
+
+
+def format_key(options=None, sections=None):
+    """Hash of everything the HTML and Markdown editions are made from."""
+    options = options or playbook.PlaybookOptions()
+    if sections is None:
+        sections = content_sections(options.locale)
+    brand = [playbook.BRAND_NAVY, playbook.BRAND_GOLD, playbook.LIGHT_GRAY, playbook.ACCENT_RED]
+    client = playbook.client_info_rows(options) if options.personalized else []
+    payload = [EMITTER_VERSION, brand, playbook.placeholder_values(options), client, sections]
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def build_format(fmt, output=None, options=None, cache=None, sections=None):
+    """
+    Produce the ``fmt`` edition ("html" or "markdown") and write it to
+    ``output`` (a path or text stream), or return it as a str when
+    ``output`` is None.
+
+    With a ``playbook_cache.RenderCache`` as ``cache``, a miss renders every
+    format in one pass and stores them all, so the other edition of the same
+    content is then served from the cache too.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format: {fmt!r} (expected one of {', '.join(FORMATS)})")
+
+    text = None
+    key = None
+    if cache is not None:
+        key = format_key(options, sections)
+        data = cache.get(key, FORMATS[fmt])
+        if data is not None:
+            text = data.decode("utf-8")
+    if text is None:
+        rendered = render_formats(options, tuple(FORMATS), sections)
+        if key is not None:
+            for name, value in rendered.items():
+                cache.put(key, value.encode("utf-8"), FORMATS[name])
+        text = rendered[fmt]
+
+    if output is None:
+        return text
+    if hasattr(output, "write"):
+        output.write(text)
+    else:
+        with open(output, "w", encoding="utf-8") as f:
+            f.write(text)
+    return None
@@ -0,0 +1,124 @@
+"""
+Fragment-spliced builds of the IRS Audit Defense Playbook.
+
+Every section of the playbook starts after a ``PageBreak()``, so the content
+list splits into independently laid-out page runs. Each run is rendered once,
+keyed by the same content hash as the render cache, and later builds reuse it;
+only runs whose content changed (the cover page with its effective date, the
+client-specific Script #2, the footer) are rendered again. The runs are then
+spliced in order into one PDF with the cover render's document metadata,
+and the runs' outline entries are rebuilt against the spliced page numbers.
+
+Requires pypdf (``pip install pypdf``).
+"""
+
+import io
+from collections import OrderedDict
+
+import generate_irs_audit_defense_playbook as playbook
+from playbook_cache import cache_key
+
+
+def split_segments(content):
+    """Split a flowable list at ``PageBreak``s into non-empty page runs."""
+    from reportlab.platypus import PageBreak
+
+    segment = []
+    for flowable in content:
+        if isinstance(flowable, PageBreak):
+            if segment:
+                yield segment
+            segment = []
+        else:
+            segment.append(flowable)
+    if segment:
+        yield segment
+
+
+class FragmentCache:
+    """
+    Rendered page runs, held in memory (parsed) and optionally on disk.
+
+    ``disk`` is a ``playbook_cache.RenderCache`` used to share fragments
+    between processes and runs.
+    """
+
+    def __init__(self, disk=None, max_entries=256):
+        self.disk = disk
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+
+    def get(self, segment, metrics=None, options=None):
+        """
+        Return a ``PdfReader`` over the rendered ``segment``, rendering it on a miss.
+
+        Renders are recorded into ``metrics`` when given; ``options`` selects
+        compact output.
+        """
+        from pypdf import PdfReader
+
+        key = cache_key(segment, playbook.cache_settings(options))
+        reader = self._memory.get(key)
+        if reader is not None:
+            self._memory.move_to_end(key)
+            self.hits += 1
+            return reader
+
+        data = self.disk.get(key) if self.disk is not None else None
+        if data is None:
+            self.misses += 1
+            buf = io.BytesIO()
+            playbook.render(segment, buf, metrics, options)
+            data = buf.getvalue()
+            if self.disk is not None:
+                self.disk.put(key, data)
+        else:
+            self.hits += 1
+
+        reader = PdfReader(io.BytesIO(data))
+        self._memory[key] = reader
+        if len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+        return reader
+
+
+def splice(content, fragments, metrics=None, options=None, page_log=None):
+    """
+    Render ``content`` run by run through ``fragments``; returns the spliced PDF as a memoryview.
+
+    The spliced page of every section heading is recorded into ``page_log``.
+    """
+    from pypdf import PdfWriter
+
+    writer = PdfWriter()
+    metadata = None
+    offset = 0
+    for segment in split_segments(content):
+        # Layout consumes the segment list, so note its headings first.
+        sections = {f.title: f.section_id for f in segment if hasattr(f, "section_id")}
+        reader = fragments.get(segment, metrics, options)
+        if metadata is None:
+            metadata = dict(reader.metadata or {})
+        for page in reader.pages:
+            writer.add_page(page)
+        for entry in reader.outline:
+            page = offset + reader.get_destination_page_number(entry)
+            writer.add_outline_item(entry.title, page)
+            if page_log is not None and entry.title in sections:
+                page_log[sections[entry.title]] = page + 1
+        offset += len(reader.pages)
+    if len(writer.outline):
+        writer.page_mode = "/UseOutlines"
+
+    metadata = metadata or {}
+    metadata["/Title"] = playbook.DOCUMENT_TITLE
+    metadata["/Author"] = playbook.DOCUMENT_AUTHOR
+    writer.add_metadata(metadata)
+    # Each run carries its own copy of the font and resource objects; keep one.
+    writer.compress_identical_objects()
+
+    buf = io.BytesIO()
+    writer.write(buf)
+    return buf.getbuffer()
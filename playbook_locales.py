@@ -0,0 +1,175 @@
+"""
+Locale catalogs for the IRS Audit Defense Playbook.
+
+A catalog maps English source text, exactly as it appears in
+``playbook_content.SECTIONS`` (paragraph markup included), to its
+translation. ``localize_sections`` swaps every catalogued string in a copy of
+the section model; anything without an entry stays in English, so a catalog
+can cover just the parts that must be translated. The Spanish catalog covers
+the cover page with its confidentiality notice, the Section 7 communication
+scripts, the table of contents heading and the footer.
+
+When the English text changes, its catalog entries stop matching;
+``stale_entries`` lists them (``--check`` reports them), so a translation
+is never silently dropped.
+
+Nothing here imports reportlab.
+"""
+
+DEFAULT_LOCALE = "en"
+
+CATALOGS = {
+    "es": {
+        # Cover page
+        "IRS AUDIT DEFENSE PLAYBOOK": "MANUAL DE DEFENSA ANTE AUDITORÍAS DEL IRS",
+        "Business Name:": "Razón social:",
+        "Location:": "Ubicación:",
+        "Killeen & Temple, Texas": "Killeen y Temple, Texas",
+        "Document Type:": "Tipo de documento:",
+        "Confidential | Internal Use Only": "Confidencial | Solo para uso interno",
+        "Effective Date:": "Fecha de vigencia:",
+        "Classification:": "Clasificación:",
+        "CONFIDENTIAL - Attorney-Client Privileged": "CONFIDENCIAL - Privilegio abogado-cliente",
+        "<b>CONFIDENTIALITY NOTICE</b>": "<b>AVISO DE CONFIDENCIALIDAD</b>",
+        (
+            "This document is privileged and confidential attorney work product and is intended solely for the use "
+            "of Ross Tax Prep &amp; Bookkeeping LLC and its authorized representatives. If you are not the intended "
+            "recipient, please do not read, distribute, or take action based on this document. Unauthorized disclosure "
+            "may waive attorney-client privilege."
+        ): (
+            "Este documento es producto de trabajo del abogado, privilegiado y confidencial, y está destinado "
+            "únicamente al uso de Ross Tax Prep &amp; Bookkeeping LLC y de sus representantes autorizados. Si usted "
+            "no es el destinatario previsto, no lea, distribuya ni tome ninguna medida con base en este documento. "
+            "La divulgación no autorizada puede implicar la renuncia al privilegio abogado-cliente."
+        ),
+        # Per-client summary (client_info_rows) and placeholder defaults
+        "Client:": "Cliente:",
+        "Notice Code:": "Código de notificación:",
+        "Notice Date:": "Fecha de notificación:",
+        "Response Deadline:": "Fecha límite de respuesta:",
+        "[CLIENT NAME]": "[NOMBRE DEL CLIENTE]",
+        "[NOTICE CODE]": "[CÓDIGO DE NOTIFICACIÓN]",
+        # Table of contents
+        "TABLE OF CONTENTS": "ÍNDICE",
+        # Section 7
+        "7. APPROVED IRS COMMUNICATION SCRIPTS": "7. GUIONES APROBADOS PARA LA COMUNICACIÓN CON EL IRS",
+        (
+            "<b>Script #1: Notice Receipt Acknowledgment</b><br/>"
+            "<i>\"Thank you for contacting Ross Tax Prep &amp; Bookkeeping LLC. All IRS correspondence and inquiries are "
+            "handled by our compliance team. Please submit requests in writing to our office address.\"</i>"
+        ): (
+            "<b>Guion n.º 1: Acuse de recibo de la notificación</b><br/>"
+            "<i>\"Gracias por comunicarse con Ross Tax Prep &amp; Bookkeeping LLC. Toda la correspondencia y las "
+            "consultas del IRS las atiende nuestro equipo de cumplimiento. Envíe sus solicitudes por escrito a la "
+            "dirección de nuestra oficina.\"</i>"
+        ),
+        (
+            "<b>Script #2: Standard Response Cover Letter</b><br/>"
+            "<i>\"On behalf of {client_name}, we hereby respond to your {notice_code} as follows: "
+            "[INSERT RESPONSE / ATTACHMENTS].\"</i>"
+        ): (
+            "<b>Guion n.º 2: Carta de presentación de respuesta estándar</b><br/>"
+            "<i>\"En nombre de {client_name}, por medio de la presente respondemos a su {notice_code} de la "
+            "siguiente manera: [INSERTAR RESPUESTA / ANEXOS].\"</i>"
+        ),
+        "PROHIBITED PHRASES:": "FRASES PROHIBIDAS:",
+        "\"We made a mistake...\" (admission of error)": "\"Cometimos un error...\" (admisión de error)",
+        "\"The client didn't provide...\" (shifting blame)": "\"El cliente no proporcionó...\" (culpar a otros)",
+        "\"We weren't aware of...\" (lack of diligence)": "\"No estábamos al tanto de...\" (falta de diligencia)",
+        "\"We assumed...\" (speculation)": "\"Supusimos que...\" (especulación)",
+        "Any verbal responses or admissions to IRS agents": "Cualquier respuesta verbal o admisión ante agentes del IRS",
+        # Footer
+        "<b>Document:</b> IRS Audit Defense Playbook": "<b>Documento:</b> Manual de Defensa ante Auditorías del IRS",
+        "<b>Effective:</b> {effective_date}": "<b>Vigencia:</b> {effective_date}",
+        "<b>Classification:</b> CONFIDENTIAL": "<b>Clasificación:</b> CONFIDENCIAL",
+    },
+}
+
+# Strings that come from code rather than SECTIONS; exempt from stale_entries.
+_CODE_STRINGS = {
+    "Client:", "Notice Code:", "Notice Date:", "Response Deadline:", "[CLIENT NAME]", "[NOTICE CODE]",
+}
+
+MONTHS = {
+    "es": [
+        "enero", "febrero", "marzo", "abril", "mayo", "junio",
+        "julio", "agosto", "septiembre", "octubre", "noviembre", "diciembre",
+    ],
+}
+
+LOCALES = (DEFAULT_LOCALE,) + tuple(CATALOGS)
+
+
+def check_locale(locale):
+    """Return ``locale`` (None means the default), or raise ValueError if it has no catalog."""
+    locale = locale or DEFAULT_LOCALE
+    if locale not in LOCALES:
+        raise ValueError(f"Unknown locale: {locale!r} (expected one of {', '.join(LOCALES)})")
+    return locale
+
+
+def translate(text, locale):
+    """``text`` in ``locale``, or unchanged when the catalog has no entry for it."""
+    if locale is None or locale == DEFAULT_LOCALE:
+        return text
+    return CATALOGS[locale].get(text, text)
+
+
+def format_date(value, locale):
+    """A date as the playbook prints it: "January 15, 2026" / "15 de enero de 2026"."""
+    if locale in MONTHS:
+        return f"{value.day} de {MONTHS[locale][value.month - 1]} de {value.year}"
+    return value.strftime("%B %d, %Y")
+
+
+def _localize_block(block, locale):
+    block = dict(block)
+    for key in ("text", "title"):
+        if key in block:
+            block[key] = translate(block[key], locale)
+    if "items" in block:
+        block["items"] = [translate(item, locale) for item in block["items"]]
+    for key in ("header", "rows"):
+        if key in block:
+            rows = block[key] if key == "rows" else [block[key]]
+            rows = [[translate(cell, locale) for cell in row] for row in rows]
+            block[key] = rows if key == "rows" else rows[0]
+    return block
+
+
+def localize_sections(sections, locale):
+    """A copy of ``sections`` with every catalogued string translated into ``locale``."""
+    locale = check_locale(locale)
+    if locale == DEFAULT_LOCALE:
+        return sections
+    localized = []
+    for section in sections:
+        section = dict(section)
+        if "heading" in section:
+            section["heading"] = translate(section["heading"], locale)
+        section["blocks"] = [_localize_block(block, locale) for block in section["blocks"]]
+        localized.append(section)
+    return localized
+
+
+def _source_strings(sections):
+    for section in sections:
+        if "heading" in section:
+            yield section["heading"]
+        for block in section["blocks"]:
+            for key in ("text", "title"):
+                if key in block:
+                    yield block[key]
+            yield from block.get("items", ())
+            yield from block.get("header", ())
+            for row in block.get("rows", ()):
+                yield from row
+
+
+def stale_entries(locale, sections=None):
+    """Catalog entries for ``locale`` whose English source no longer appears in ``sections``."""
+    if sections is None:
+        from playbook_content import SECTIONS as sections
+
+    present = set(_source_strings(sections))
+    return [text for text in CATALOGS[locale] if text not in present and text not in _CODE_STRINGS]
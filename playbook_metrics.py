@@ -0,0 +1,159 @@
+"""
+Build instrumentation for the IRS Audit Defense Playbook.
+
+A ``BuildMetrics`` collects, per playbook section, the number of flowables,
+pages touched, placement attempts (``Frame.add`` calls, each of which wraps
+the flowable) and ``Frame.split`` calls, and wall time spent laying them out,
+plus totals for the build: wall time, bytes written, render-cache outcome,
+paragraph-cache hits and misses, and the process's peak RSS.
+``build_playbook(on_metrics=...)`` fills one in and hands it to the callback;
+``to_json()`` gives the machine-readable report.
+"""
+
+import json
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Dict, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def peak_rss_kb():
+    """
+    Peak resident set size of this process in KiB, or None where unknown.
+
+    On Linux this is VmHWM from /proc: ``ru_maxrss`` survives ``exec``, so a
+    child started from a large process would report its parent's peak.
+    """
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except (OSError, ValueError):
+        pass
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+
+@dataclass
+class SectionMetrics:
+    id: str
+    flowables: int = 0
+    pages: int = 0
+    wrap_calls: int = 0  # Frame.add calls; each wraps the flowable once
+    split_calls: int = 0
+    layout_seconds: float = 0.0
+
+
+@dataclass
+class BuildMetrics:
+    sections: Dict[str, SectionMetrics] = field(default_factory=dict)
+    mode: str = "direct"
+    cache: Optional[str] = None
+    bytes_written: int = 0
+    total_seconds: float = 0.0
+    peak_rss_kb: Optional[int] = None
+    layout_passes: int = 1
+    paragraphs_parsed: int = 0
+    paragraphs_reused: int = 0
+    _section_of: Dict[int, str] = field(default_factory=dict, repr=False)
+    _pages: Dict[str, set] = field(default_factory=dict, repr=False)
+    _renders: int = field(default=0, repr=False)
+    _started: float = field(default_factory=time.perf_counter, repr=False)
+
+    def assign(self, section, flowables):
+        """Attribute ``flowables`` to ``section``; used as the ``on_section`` hook of CompiledPlaybook."""
+        section_id = section["id"]
+        metrics = self.sections.setdefault(section_id, SectionMetrics(section_id))
+        metrics.flowables += len(flowables)
+        for f in flowables:
+            self._section_of[id(f)] = section_id
+
+    def restart(self):
+        """Discard per-section figures before another layout pass; totals keep running."""
+        self.sections.clear()
+        self._section_of.clear()
+        self._pages.clear()
+        self.layout_passes += 1
+
+    def section_for(self, flowable, current):
+        """The section a flowable belongs to; split parts and page breaks stay with ``current``."""
+        section_id = self._section_of.get(id(flowable))
+        if section_id is None:
+            return current
+        return self.sections[section_id]
+
+    def page_touched(self, section, page):
+        self._pages.setdefault(section.id, set()).add((self._renders, page))
+
+    def finish(self, bytes_written):
+        self.bytes_written = bytes_written
+        self.total_seconds = time.perf_counter() - self._started
+        for section_id, pages in self._pages.items():
+            self.sections[section_id].pages = len(pages)
+        self.peak_rss_kb = peak_rss_kb()
+
+    def to_dict(self):
+        data = {k: v for k, v in asdict(self).items() if not k.startswith("_")}
+        data["sections"] = list(data["sections"].values())
+        return data
+
+    def to_json(self, indent=2):
+        return json.dumps(self.to_dict(), indent=indent)
+
+    def slowest(self, n=3):
+        """The ``n`` sections with the most layout time."""
+        return sorted(self.sections.values(), key=lambda s: s.layout_seconds, reverse=True)[:n]
+
+
+def instrumented_doc_template(metrics):
+    """Return a SimpleDocTemplate subclass that records layout metrics into ``metrics``."""
+    from reportlab.platypus import ActionFlowable, PageBreak, SimpleDocTemplate
+
+    class InstrumentedDocTemplate(SimpleDocTemplate):
+        def build(self, flowables, **kwargs):
+            metrics._renders += 1
+            self._metrics_current = None
+            self._metrics_frames = set()
+            super().build(flowables, **kwargs)
+
+        def _instrument_frame(self, frame):
+            add, split = frame.add, frame.split
+
+            def counted_add(*args, **kwargs):
+                if self._metrics_current is not None:
+                    self._metrics_current.wrap_calls += 1
+                return add(*args, **kwargs)
+
+            def counted_split(*args, **kwargs):
+                if self._metrics_current is not None:
+                    self._metrics_current.split_calls += 1
+                return split(*args, **kwargs)
+
+            frame.add, frame.split = counted_add, counted_split
+            self._metrics_frames.add(id(frame))
+
+        def handle_flowable(self, flowables):
+            flowable = flowables[0]
+            section = metrics.section_for(flowable, self._metrics_current)
+            self._metrics_current = section
+            frame = getattr(self, "frame", None)
+            if frame is not None and id(frame) not in self._metrics_frames:
+                self._instrument_frame(frame)
+
+            start = time.perf_counter()
+            super().handle_flowable(flowables)
+            if section is not None:
+                section.layout_seconds += time.perf_counter() - start
+                if not isinstance(flowable, (PageBreak, ActionFlowable)):
+                    metrics.page_touched(section, self.page)
+
+    return InstrumentedDocTemplate
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Notice Log report for Ross Tax Prep & Bookkeeping LLC.
+
+Section 4 of the playbook has every notice logged in the Notice Tracking
+Spreadsheet; this renders that log as a branded PDF from either a CSV export
+(``migration-data/csv/returns_TEMPLATE.csv`` columns) or a local SQLite copy of
+the D1 database (the ``returns`` table joined to ``clients``, or the
+``audit_log`` table written by ``src/utils/audit.ts``).
+
+Rows are read through a generator and laid out in fixed-size chunks, each its
+own table with a repeating header row. Layout pulls chunks on demand and
+writes finished pages out in parts (see ``playbook_stream.stream_build``), so
+only a handful of rows and one part's pages are held at any time, however
+many the source has.
+
+    python playbook_notice_log.py --csv migration-data/csv/returns_TEMPLATE.csv -o notice_log.pdf
+    python playbook_notice_log.py --sqlite ross.db [--table audit_log] [--chunk-rows 40] -o -
+
+Requires pypdf (``pip install pypdf``).
+"""
+
+import argparse
+import csv
+import itertools
+import os
+import sqlite3
+import sys
+import time
+from datetime import date
+from xml.sax.saxutils import escape
+
+import generate_irs_audit_defense_playbook as playbook
+
+DEFAULT_CHUNK_ROWS = 40
+FETCH_SIZE = 500
+
+# Columns per source: (header, width in points, key in the row dicts).
+# Widths add up to the 516pt LETTER frame.
+REPORTS = {
+    "returns": {
+        "title": "Notice Log: Returns",
+        "columns": [
+            ("Client", 170, "client_name"),
+            ("Tax Year", 66, "tax_year"),
+            ("Return Type", 90, "return_type"),
+            ("Status", 90, "status"),
+            ("Date", 100, "date"),
+        ],
+        "query": (
+            "SELECT c.name AS client_name, r.tax_year, '' AS return_type, r.status, r.updated_at AS date "
+            "FROM returns r LEFT JOIN clients c ON c.id = r.client_id ORDER BY r.id"
+        ),
+    },
+    "audit_log": {
+        "title": "Notice Log: Audit Trail",
+        "columns": [
+            ("Logged At", 100, "created_at"),
+            ("Action", 90, "action"),
+            ("Entity", 90, "entity"),
+            ("Staff", 86, "user_email"),
+            ("Details", 150, "details"),
+        ],
+        "query": (
+            "SELECT created_at, action, entity || COALESCE(' #' || entity_id, '') AS entity, "
+            "user_email, details FROM audit_log ORDER BY created_at, id"
+        ),
+    },
+}
+
+
+def iter_csv_rows(path):
+    """Yield one dict per row of a returns CSV export; ``date_filed`` is reported as ``date``."""
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        for row in csv.DictReader(f):
+            row.setdefault("date", row.get("date_filed", ""))
+            yield row
+
+
+def iter_sqlite_rows(path, table="returns", fetch_size=FETCH_SIZE):
+    """Yield one dict per row of ``table`` from a SQLite database, opened read-only."""
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    conn.row_factory = sqlite3.Row
+    try:
+        cursor = conn.execute(REPORTS[table]["query"])
+        while True:
+            batch = cursor.fetchmany(fetch_size)
+            if not batch:
+                break
+            for row in batch:
+                yield dict(row)
+    finally:
+        conn.close()
+
+
+def chunked(rows, size):
+    """Yield lists of at most ``size`` consecutive items from ``rows``."""
+    it = iter(rows)
+    while True:
+        chunk = list(itertools.islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def report_flowables(rows, report="returns", chunk_rows=DEFAULT_CHUNK_ROWS, source=None, counter=None):
+    """
+    Yield the report's flowables: title, then one table per ``chunk_rows`` rows.
+
+    ``counter``, when given, is a one-item list that receives the running row count.
+    """
+    from reportlab.platypus import Paragraph, Spacer, Table
+
+    spec = REPORTS[report]
+    styles = playbook.get_styles()
+    table_style = playbook.get_table_styles()["data"]
+    cell_style = styles["Normal"]
+    header = [name for name, _width, _key in spec["columns"]]
+    col_widths = [width for _name, width, _key in spec["columns"]]
+    keys = [key for _name, _width, key in spec["columns"]]
+
+    yield Paragraph(spec["title"], styles["TitleStyle"])
+    subtitle = f"Generated {date.today().strftime('%B %d, %Y')}"
+    if source:
+        subtitle += f" from {escape(os.path.basename(source))}"
+    yield Paragraph(subtitle, styles["SubtitleStyle"])
+    yield Spacer(1, 12)
+
+    total = 0
+    for chunk in chunked(rows, chunk_rows):
+        data = [header]
+        data.extend(
+            # Every cell is unique: parse it directly rather than through the shared ParagraphCache.
+            [Paragraph(escape(str(row.get(key) or "")), cell_style) for key in keys]
+            for row in chunk
+        )
+        t = Table(data, colWidths=col_widths, repeatRows=1)
+        t.setStyle(table_style)
+        total += len(chunk)
+        if counter is not None:
+            counter[0] = total
+        yield t
+
+    if not total:
+        yield Paragraph("No entries.", styles["BodyStyle"])
+
+
+def build_report(rows, output, report="returns", chunk_rows=DEFAULT_CHUNK_ROWS, source=None):
+    """Render the report for ``rows`` (any iterable of dicts) to a path or binary file; returns the row count."""
+    from playbook_stream import stream_build
+
+    counter = [0]
+    flowables = report_flowables(rows, report, chunk_rows, source, counter)
+    title = REPORTS[report]["title"]
+    if hasattr(output, "write"):
+        stream_build(flowables, output, title=title)
+    else:
+        with open(output, "wb") as f:
+            stream_build(flowables, f, title=title)
+    return counter[0]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render the Notice Log report from CSV or SQLite.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--csv", help="returns CSV export (client_name, tax_year, return_type, status, date_filed)")
+    source.add_argument("--sqlite", help="local SQLite copy of the database")
+    parser.add_argument("--table", choices=sorted(REPORTS), default="returns", help="table to report with --sqlite")
+    parser.add_argument("-o", "--output", default=os.path.join(playbook.output_dir, "Notice_Log_ROSS_TAX_PREP.pdf"),
+                        help="output PDF path, or - for stdout")
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS, help="rows per table chunk")
+    args = parser.parse_args(argv)
+
+    if args.csv:
+        rows, report, path = iter_csv_rows(args.csv), "returns", args.csv
+    else:
+        rows, report, path = iter_sqlite_rows(args.sqlite, args.table), args.table, args.sqlite
+
+    to_stdout = args.output == "-"
+    started = time.perf_counter()
+    count = build_report(rows, sys.stdout.buffer if to_stdout else args.output, report, args.chunk_rows, path)
+    elapsed = time.perf_counter() - started
+
+    log = sys.stderr if to_stdout else sys.stdout
+    print(f"✅ Notice Log generated: {count} rows", file=log)
+    if not to_stdout:
+        print(f"📁 Location: {args.output}", file=log)
+    print(f"⏱️  Elapsed: {elapsed:.2f}s", file=log)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
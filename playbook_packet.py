@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+Evidence packets for IRS notice responses.
+
+Section 4, Step 3 bundles the engagement letter, return and workpapers behind
+a cover letter. ``build_packet`` renders the front matter with the playbook's
+styles:
+
+- a branded cover with the client's notice summary;
+- the Script #2 cover letter (``playbook_content.RESPONSE_LETTER_SCRIPT``),
+  answering with the enclosed documents;
+- an evidence index listing each document with its page range in the packet;
+
+and appends the source PDFs after it. Sources are memory-mapped rather than
+read, and their objects are copied to the output one at a time by a
+``playbook_stream.StreamingPdfWriter``, which forgets each object once it is
+written. Memory is bounded by the largest single object, not by the packet
+length, so a 500-page packet costs about what a 5-page one does and many
+packets can be assembled side by side.
+
+A packet manifest is JSON (one packet) or JSONL (one packet per line):
+
+    {"client_name": "Jane Doe", "notice_code": "CP2000",
+     "notice_date": "2026-01-05", "classification": "INFORMATION REQUEST",
+     "documents": [
+         {"title": "IRS Acknowledgements", "path": "migration-data/Old IRS Acknowledgements-Print.pdf"},
+         "migration-data/akn.pdf"
+     ],
+     "output": "jane_doe_cp2000_packet.pdf"}
+
+A document given as a bare path is indexed under its file name. Relative
+paths are resolved against the manifest's directory. With ``--encrypt`` each
+packet is encrypted for its ``recipient`` (default: the client) and signed
+(see ``playbook_protect.py``); the packet is then assembled in memory, since
+encryption needs the whole file, rather than streamed to disk in plaintext.
+
+    python playbook_packet.py packets.jsonl --output-dir packets/
+
+Requires pypdf (``pip install pypdf``).
+"""
+
+import argparse
+import gc
+import io
+import json
+import mmap
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import List
+from xml.sax.saxutils import escape
+
+import generate_irs_audit_defense_playbook as playbook
+from playbook_batch import BatchFailure, BatchReport, options_from_record, output_name, read_manifest, record_output
+from playbook_content import RESPONSE_LETTER_SCRIPT, RESPONSE_PLACEHOLDER
+
+PACKET_TITLE = "Evidence Packet"
+# What the cover letter answers with, in place of Script #2's placeholder
+ENCLOSURES_RESPONSE = "the enclosed documents, listed in the evidence index"
+INDEX_COL_WIDTHS = [24, 180, 176, 50, 86]
+
+
+@dataclass
+class PacketDocument:
+    title: str
+    path: str
+    pages: int = 0
+    first_page: int = 0  # 1-based page of the packet where the document starts
+
+    @property
+    def page_range(self):
+        if self.pages <= 1:
+            return str(self.first_page)
+        return f"{self.first_page}-{self.first_page + self.pages - 1}"
+
+
+@dataclass
+class PacketReport:
+    output: str
+    pages: int
+    front_pages: int
+    documents: List[PacketDocument]
+
+
+def read_packets(path):
+    """Packet records from a JSON file (one packet, or a list of them) or a JSONL file."""
+    if path.lower().endswith(".json"):
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        return data if isinstance(data, list) else [data]
+    return list(read_manifest(path))
+
+
+def packet_documents(entries, base_dir=None):
+    """PacketDocuments for manifest ``documents`` entries: paths, or dicts with ``path`` and optional ``title``."""
+    documents = []
+    for entry in entries:
+        if isinstance(entry, str):
+            entry = {"path": entry}
+        path = entry["path"]
+        if base_dir and not os.path.isabs(path):
+            path = os.path.join(base_dir, path)
+        title = entry.get("title") or os.path.splitext(os.path.basename(path))[0]
+        documents.append(PacketDocument(title, path))
+    return documents
+
+
+@contextmanager
+def mapped_reader(path):
+    """A pypdf PdfReader over a read-only memory map of ``path``; the map is closed on exit."""
+    from pypdf import PdfReader
+
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+        reader = PdfReader(view)
+        try:
+            yield reader
+        finally:
+            # pypdf keeps a reference to the stream; drop the reader (and its
+            # reference cycles) before the map is closed under it.
+            del reader
+            gc.collect()
+
+
+def cover_letter_text(options):
+    """Script #2, filled in for the client and answering with the enclosed documents."""
+    values = playbook.placeholder_values(options)
+    script = RESPONSE_LETTER_SCRIPT.replace(RESPONSE_PLACEHOLDER, ENCLOSURES_RESPONSE)
+    return f"<i>\"{playbook._fill(script, values)}\"</i>"
+
+
+def front_matter(options, documents, page_log=None):
+    """Flowables for the cover, cover letter and evidence index."""
+    from reportlab.platypus import PageBreak, Paragraph, Spacer, Table
+
+    styles = playbook.get_styles()
+    table_styles = playbook.get_table_styles()
+    body = styles["BodyStyle"]
+
+    content = [
+        Spacer(1, 60),
+        Paragraph(PACKET_TITLE.upper(), styles["TitleStyle"]),
+        Paragraph(escape(playbook.DOCUMENT_AUTHOR), styles["SubtitleStyle"]),
+        playbook.heading_anchor("cover", "Cover Letter", page_log),
+        Spacer(1, 12),
+    ]
+    info = Table(playbook.client_info_rows(options), colWidths=[150, 300])
+    info.setStyle(table_styles["info"])
+    content += [
+        info,
+        Spacer(1, 30),
+        Paragraph(options.effective_date_text(), body),
+        Paragraph("Internal Revenue Service", body),
+        Spacer(1, 6),
+        Paragraph(cover_letter_text(options), body),
+        Paragraph(
+            f"Enclosed: {len(documents)} document{'' if len(documents) == 1 else 's'}, "
+            f"{sum(d.pages for d in documents)} pages.",
+            body,
+        ),
+        Spacer(1, 18),
+        Paragraph("Sincerely,", body),
+        Paragraph(f"<b>{escape(playbook.DOCUMENT_AUTHOR)}</b>", body),
+        PageBreak(),
+        Paragraph("EVIDENCE INDEX", styles["HeaderStyle"]),
+        playbook.heading_anchor("index", "Evidence Index", page_log),
+    ]
+
+    header_style = styles["Normal"]
+    header = ["#", "Document", "File", "Pages", "Packet Pages"]
+    rows = [[Paragraph(f"<b>{cell}</b>", header_style) for cell in header]]
+    for number, document in enumerate(documents, start=1):
+        rows.append([
+            Paragraph(cell, body)
+            for cell in (
+                str(number),
+                escape(document.title),
+                escape(os.path.basename(document.path)),
+                str(document.pages),
+                document.page_range,
+            )
+        ])
+    index = Table(rows, colWidths=INDEX_COL_WIDTHS, repeatRows=1)
+    index.setStyle(table_styles["data"])
+    content.append(index)
+    return content
+
+
+def render_front_matter(options, documents):
+    """Render the front matter, numbering the documents after it; returns (PDF bytes, page count)."""
+    from pypdf import PdfReader
+
+    front_pages = 2
+    for _layout_pass in range(playbook.MAX_LAYOUT_PASSES):
+        first = front_pages + 1
+        for document in documents:
+            document.first_page = first
+            first += document.pages
+        buf = io.BytesIO()
+        playbook.render(front_matter(options, documents), buf, None, options)
+        pages = len(PdfReader(buf).pages)
+        if pages == front_pages:
+            break
+        # A long index ran onto more pages: shift the page ranges and lay out again.
+        front_pages = pages
+    return buf.getvalue(), front_pages
+
+
+def build_packet(output, options, documents):
+    """
+    Write the evidence packet for ``options`` (the client) and ``documents``
+    (PacketDocuments) to ``output``, a path or binary stream; returns a PacketReport.
+    """
+    from pypdf import PdfReader
+    from playbook_stream import StreamingPdfWriter
+
+    for document in documents:
+        with mapped_reader(document.path) as reader:
+            document.pages = len(reader.pages)
+    front, front_pages = render_front_matter(options, documents)
+
+    def assemble(out):
+        writer = StreamingPdfWriter(out)
+        writer.add_part(PdfReader(io.BytesIO(front)))
+        for document in documents:
+            with mapped_reader(document.path) as reader:
+                start = writer.page_count
+                writer.add_part(reader, outline=False)
+            writer.add_outline_item(document.title, start)
+        title = f"{PACKET_TITLE}: {options.client_name}" if options.client_name else PACKET_TITLE
+        writer.close({"/Title": title, "/Author": playbook.DOCUMENT_AUTHOR})
+        return writer.page_count
+
+    if hasattr(output, "write"):
+        pages = assemble(output)
+    else:
+        with open(output, "wb") as f:
+            pages = assemble(f)
+    return PacketReport(output if isinstance(output, str) else "", pages, front_pages, documents)
+
+
+def _init_worker(protect=False):
+    playbook.warm()
+    if protect:
+        from playbook_protect import load_keys
+
+        load_keys()
+
+
+def _build_one(index, record, path, base_dir, effective_date, compact, previews=False, protect=False):
+    try:
+        options = options_from_record(record, effective_date)
+        options.compact = compact
+        documents = packet_documents(record.get("documents") or (), base_dir)
+        if protect:
+            from playbook_protect import protect_pdf, record_recipient
+
+            buf = io.BytesIO()
+            report = build_packet(buf, options, documents)
+            protect_pdf(buf.getvalue(), path, record_recipient(record))
+            return index, report.pages, None
+        report = build_packet(path, options, documents)
+        if previews:
+            from playbook_preview import build_previews
+
+            build_previews(path)
+        return index, report.pages, None
+    except Exception:
+        return index, 0, traceback.format_exc(limit=3).strip().splitlines()[-1]
+
+
+def packet_name(index, record):
+    """File name for a packet: the record's ``output``, or ``output_name`` with a ``_packet`` suffix."""
+    name = record_output(record)
+    if name:
+        return name
+    return output_name(index, record).replace(".pdf", "_packet.pdf")
+
+
+def run_packets(manifest, output_dir, workers=None, effective_date=None, compact=False, previews=False,
+                protect=False):
+    """
+    Build every packet in ``manifest`` into ``output_dir`` across a process
+    pool; returns a BatchReport. With ``previews`` each packet also gets page
+    thumbnails (see ``playbook_preview.py``); with ``protect`` each is
+    encrypted and signed instead (see ``playbook_protect.py``).
+    """
+    if protect:
+        from playbook_protect import load_keys, require_cipher
+
+        if previews:
+            raise ValueError("page previews of encrypted documents would be stored unencrypted")
+        load_keys()
+        require_cipher()
+    if previews:
+        from playbook_preview import require_renderer
+
+        require_renderer()
+    os.makedirs(output_dir, exist_ok=True)
+    base_dir = os.path.dirname(os.path.abspath(manifest))
+    records = read_packets(manifest)
+    report = BatchReport(total=len(records))
+    paths = [os.path.join(output_dir, packet_name(i, r)) for i, r in enumerate(records)]
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(protect,)) as pool:
+        futures = [
+            pool.submit(_build_one, i, record, paths[i], base_dir, effective_date, compact, previews, protect)
+            for i, record in enumerate(records)
+        ]
+        for future in as_completed(futures):
+            index, _pages, error = future.result()
+            if error is None:
+                report.succeeded += 1
+                report.outputs.append(paths[index])
+            else:
+                report.failures.append(BatchFailure(index, records[index].get("client_name") or "", error))
+    report.elapsed = time.perf_counter() - start
+
+    report.outputs.sort()
+    report.failures.sort(key=lambda f: f.index)
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Assemble evidence packets: cover letter, index and source PDFs.")
+    parser.add_argument("manifest", help="JSON or JSONL packet manifest")
+    parser.add_argument("--output-dir", default=".", help="directory for the packets (default: current directory)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--effective-date", type=playbook.parse_date, help="date of the cover letter (YYYY-MM-DD, default: today)")
+    parser.add_argument("--compact", action="store_true", help="compress the front matter and write reproducible bytes")
+    parser.add_argument("--previews", action="store_true", help="also write page thumbnails (requires pypdfium2 and Pillow)")
+    parser.add_argument("--encrypt", action="store_true", help="encrypt each packet for its recipient and sign it (requires ENCRYPTION_KEY)")
+    args = parser.parse_args(argv)
+
+    try:
+        report = run_packets(
+            args.manifest, args.output_dir, args.workers, args.effective_date, args.compact, args.previews, args.encrypt
+        )
+    except ValueError as e:
+        parser.error(str(e))
+    print(f"✅ Packets complete: {report.succeeded}/{report.total} packets")
+    print(f"📁 Output: {args.output_dir}")
+    print(f"⏱️  Elapsed: {report.elapsed:.2f}s ({report.docs_per_sec:.1f} packets/sec)")
+    for failure in report.failures:
+        print(f"❌ Packet {failure.index} ({failure.client_name}): {failure.error}")
+    return 1 if report.failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,220 @@
+"""
+Parallel builds of the IRS Audit Defense Playbook.
+
+Every top-level section starts after a ``PageBreak()``, so the document
+splits into page runs that lay out independently. ``parallel_playbook``
+renders each run in a worker process and stitches the pages together in
+order:
+
+- heading pages recorded by each run are offset into the stitched page
+  numbering, which feeds the table of contents and the merged outline;
+- when the table of contents printed stale page numbers, only the run
+  holding it is laid out again;
+- every page after the cover is stamped with a running header (document
+  title and current section) and a "Page N of M" footer, which no single
+  run could know.
+
+Each run is a complete PDF with its own font and resource objects; the
+stitched file keeps one copy of each and recompresses the page streams
+pypdf decodes while merging. It is still somewhat larger than a
+single-process build: the running headers and footers add a content stream
+to every page, and the objects dropped while stitching stay behind as free
+cross-reference entries.
+
+    from playbook_parallel import parallel_playbook
+    parallel_playbook("playbook.pdf", workers=8)
+
+Requires pypdf (``pip install pypdf``).
+"""
+
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+from xml.sax.saxutils import unescape
+
+import generate_irs_audit_defense_playbook as playbook
+
+# Running header and footer, placed inside the 48pt page margins
+FURNITURE_FONT = ("Helvetica", 8)
+HEADER_OFFSET = 30
+FOOTER_OFFSET = 24
+
+_compiled = None
+
+
+def section_runs(sections):
+    """Group section indexes into page runs: a new run at every section that starts a new page."""
+    runs = []
+    for i, section in enumerate(sections):
+        if not runs or section.get("new_page", True):
+            runs.append([i])
+        else:
+            runs[-1].append(i)
+    return runs
+
+
+def _init_worker(sections=None):
+    global _compiled
+    playbook.warm()
+    if sections is not None:
+        _compiled = playbook.compile_playbook(sections)
+
+
+def _render_run(indexes, options, toc_pages):
+    """Lay out one page run; returns (PDF bytes or None if the run is empty, heading pages within the run)."""
+    compiled = _compiled or playbook.get_compiled(options.locale)
+    page_log = {}
+    flowables = []
+    run = [compiled.sections[i] for i in indexes]
+    for _section, section_flowables in compiled.iter_sections(options, toc_pages, page_log, run):
+        flowables.extend(section_flowables)
+    if not flowables:
+        return None, page_log
+    buf = io.BytesIO()
+    playbook.render(flowables, buf, None, options)
+    return buf.getvalue(), page_log
+
+
+def page_furniture(headers, options=None):
+    """
+    One overlay page per entry of ``headers`` (the section title running on
+    that page, or None for no furniture) with the header and the page footer.
+    """
+    from reportlab.lib import colors
+    from reportlab.pdfgen.canvas import Canvas
+
+    settings = playbook.doc_settings(options)
+    width, height = settings["pagesize"]
+    left, right = settings["leftMargin"], width - settings["rightMargin"]
+    epoch = options.creation_timestamp() if options is not None else None
+    canvas_class = playbook._timestamped_canvas(epoch) if epoch is not None else Canvas
+    compact = dict(pageCompression=1, invariant=1) if epoch is not None else {}
+
+    buf = io.BytesIO()
+    canv = canvas_class(buf, pagesize=(width, height), **compact)
+    total = len(headers)
+    for number, header in enumerate(headers, start=1):
+        if header is not None:
+            canv.setFont(*FURNITURE_FONT)
+            canv.setFillColor(colors.HexColor(playbook.BRAND_NAVY))
+            canv.drawString(left, height - HEADER_OFFSET, playbook.DOCUMENT_TITLE)
+            canv.drawRightString(right, height - HEADER_OFFSET, header)
+            canv.setStrokeColor(colors.HexColor(playbook.BRAND_GOLD))
+            canv.setLineWidth(0.5)
+            canv.line(left, height - HEADER_OFFSET - 4, right, height - HEADER_OFFSET - 4)
+            canv.drawString(left, FOOTER_OFFSET, f"{playbook.DOCUMENT_AUTHOR} | Confidential")
+            canv.drawRightString(right, FOOTER_OFFSET, f"Page {number} of {total}")
+        canv.showPage()
+    canv.save()
+    return buf.getvalue()
+
+
+def running_headers(total, page_log, titles):
+    """The section title running on each of ``total`` pages; None on the cover and before the first heading."""
+    starts = sorted((page, section_id) for section_id, page in page_log.items())
+    headers = []
+    current = None
+    for page in range(1, total + 1):
+        while starts and starts[0][0] <= page:
+            current = titles[starts.pop(0)[1]]
+        headers.append(current if page > 1 else None)
+    return headers
+
+
+def stitch(runs, options=None, titles=None):
+    """
+    Join rendered runs (PDF bytes, in order) into one PDF with a merged
+    outline; returns ``(memoryview, page_log)``.
+    """
+    from pypdf import PdfReader, PdfWriter
+
+    writer = PdfWriter()
+    page_log = {}
+    metadata = None
+    offset = 0
+    for data, run_log in runs:
+        if data is None:
+            continue
+        reader = PdfReader(io.BytesIO(data))
+        if metadata is None:
+            metadata = dict(reader.metadata or {})
+        for page in reader.pages:
+            writer.add_page(page)
+        for entry in reader.outline:
+            writer.add_outline_item(entry.title, offset + reader.get_destination_page_number(entry))
+        for section_id, page in run_log.items():
+            page_log[section_id] = offset + page
+        offset += len(reader.pages)
+    if len(writer.outline):
+        writer.page_mode = "/UseOutlines"
+
+    if titles is not None:
+        headers = running_headers(offset, page_log, titles)
+        overlay = PdfReader(io.BytesIO(page_furniture(headers, options)))
+        for page, furniture, header in zip(writer.pages, overlay.pages, headers):
+            if header is not None:
+                page.merge_page(furniture)
+    # pypdf leaves merged and copied page streams uncompressed.
+    for page in writer.pages:
+        page.compress_content_streams()
+
+    metadata = metadata or {}
+    metadata["/Title"] = playbook.DOCUMENT_TITLE
+    metadata["/Author"] = playbook.DOCUMENT_AUTHOR
+    writer.add_metadata(metadata)
+    # Each run carries its own copy of the font and resource objects; keep one.
+    writer.compress_identical_objects()
+
+    buf = io.BytesIO()
+    writer.write(buf)
+    return buf.getbuffer(), page_log
+
+
+def parallel_playbook(output=None, options=None, sections=None, workers=None, page_numbers=None, as_view=False):
+    """
+    Render the playbook with its page runs laid out in ``workers`` processes
+    (default: CPU count) and write it to ``output`` as ``build_playbook`` does.
+
+    ``sections`` replaces the playbook's own section model. With the default
+    sections, heading pages are remembered in ``page_numbers`` (default:
+    ``page_number_cache()``) so the table of contents is usually right the
+    first time.
+    """
+    options = options or playbook.PlaybookOptions()
+    model = playbook.compile_playbook(sections) if sections is not None else playbook.get_compiled(options.locale)
+    layout = toc_pages = None
+    if sections is None:
+        page_numbers = page_numbers or playbook.page_number_cache()
+        layout = playbook.layout_key(options)
+        toc_pages = page_numbers.get(layout)
+    toc_pages = toc_pages or {}
+
+    runs = section_runs(model.sections)
+    toc_runs = [
+        r for r, indexes in enumerate(runs)
+        if any(block["type"] == "toc" for i in indexes for block in model.sections[i]["blocks"])
+    ]
+    titles = {
+        section["id"]: unescape(playbook.toc_label(section["heading"]))
+        for section in model.sections
+        if section.get("heading")
+    }
+
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(
+        max_workers=min(workers, len(runs)), initializer=_init_worker, initargs=(sections,)
+    ) as pool:
+        rendered = list(pool.map(_render_run, runs, [options] * len(runs), [toc_pages] * len(runs)))
+        for layout_pass in range(playbook.MAX_LAYOUT_PASSES):
+            data, page_log = stitch(rendered, options, titles)
+            if page_log == toc_pages or not toc_runs or layout_pass == playbook.MAX_LAYOUT_PASSES - 1:
+                break
+            # Pagination moved: only the table of contents prints page numbers.
+            toc_pages = page_log
+            for r, result in zip(toc_runs, pool.map(_render_run, [runs[r] for r in toc_runs],
+                                                    [options] * len(toc_runs), [toc_pages] * len(toc_runs))):
+                rendered[r] = result
+
+    if layout is not None:
+        page_numbers.put(layout, page_log)
+    return playbook.write_output(data, output, as_view)
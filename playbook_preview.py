@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Page thumbnails for generated playbooks and evidence packets.
+
+``build_previews`` writes a PNG of every page of a PDF at each of
+``THUMBNAIL_WIDTHS`` for the staff portal. Pages are rasterized with
+PDFium (through pypdfium2), so thumbnails show what a PDF viewer shows:
+embedded and standard fonts, clipping, patterns, shading and images,
+including in the client documents of evidence packets. Each page is drawn
+once, at the largest width, and scaled down for the others.
+
+Thumbnails are content-addressed: each page is hashed from its boxes, its
+drawing operations and everything its resources reference, and its PNGs
+are stored under that hash in a ``previews`` directory next to the PDF (a
+``playbook_cache.RenderCache``, bounded in size like the render cache).
+Only pages whose hash has no PNGs yet are drawn; an unchanged page, or the
+same page in another client's playbook in that directory, is reused.
+``<name>.previews.json`` beside the PDF lists each page's hash and PNG
+files:
+
+    {"pdf": "playbook.pdf", "widths": [160, 320, 640],
+     "pages": [{"page": 1, "hash": "…", "files": {"160": "previews/….png", …}}, …]}
+
+    python playbook_preview.py playbook.pdf [more.pdf …]
+    python generate_irs_audit_defense_playbook.py --previews
+
+The PDF is read from disk once; pypdf hashes its pages and PDFium draws the
+ones without thumbnails from the same bytes.
+
+Requires pypdf, pypdfium2 and Pillow (``pip install pypdf pypdfium2 pillow``);
+``require_renderer`` checks for them before a batch starts.
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from typing import List
+
+PREVIEW_DIR = "previews"
+THUMBNAIL_WIDTHS = (160, 320, 640)
+# Part of every page hash: bump when drawing changes so old PNGs are redrawn.
+RENDERER_VERSION = "2"
+MAX_PREVIEW_BYTES = 512 * 1024 * 1024
+
+
+@dataclass
+class PreviewReport:
+    pdf: str
+    index: str
+    pages: int = 0
+    drawn: int = 0
+    reused: int = 0
+    elapsed: float = 0.0
+    hashes: List[str] = field(default_factory=list)
+
+
+def require_renderer():
+    """Raise ValueError unless the packages that draw thumbnails import."""
+    for module, package in (("pypdf", "pypdf"), ("pypdfium2", "pypdfium2"), ("PIL", "pillow")):
+        try:
+            __import__(module)
+        except ImportError:
+            raise ValueError(f"page previews require {package} (pip install {package})") from None
+
+
+def _object_digest(obj, memo):
+    """Digest of a PDF object with its references resolved and its streams' data included.
+
+    ``memo`` maps ``(idnum, generation)`` of objects already hashed to their
+    digest, so resources shared by many pages are hashed once per document;
+    a reference back to an object still being hashed counts as a marker.
+    """
+    from pypdf.generic import ArrayObject, DictionaryObject, IndirectObject, StreamObject
+
+    if isinstance(obj, IndirectObject):
+        key = (obj.idnum, obj.generation)
+        if key not in memo:
+            memo[key] = b"cycle"
+            memo[key] = _object_digest(obj.get_object(), memo)
+        return memo[key]
+    h = hashlib.sha256()
+    if isinstance(obj, DictionaryObject):
+        h.update(b"<<")
+        for name in sorted(obj):
+            if isinstance(obj, StreamObject) and name == "/Length":
+                continue
+            h.update(name.encode())
+            h.update(_object_digest(obj.raw_get(name), memo))
+        if isinstance(obj, StreamObject):
+            h.update(b"stream")
+            h.update(obj.get_data())
+    elif isinstance(obj, ArrayObject):
+        h.update(b"[")
+        for item in obj:
+            h.update(_object_digest(item, memo))
+    else:
+        h.update(f"{type(obj).__name__}:{obj!r}".encode())
+    return h.digest()
+
+
+def page_hash(page, memo=None):
+    """Hex digest of everything that determines how ``page`` is drawn.
+
+    That is its boxes, rotation and drawing operations, and the whole
+    ``/Resources`` tree: fonts with their embedded font files and encodings,
+    images and forms, graphics states, patterns, shadings and colour spaces.
+    Pass the same ``memo`` dict for every page of one document.
+    """
+    memo = {} if memo is None else memo
+    boxes = [list(map(float, box)) for box in (page.mediabox, page.cropbox)]
+    h = hashlib.sha256(f"{RENDERER_VERSION}|{boxes}|{page.rotation}".encode())
+    contents = page.get_contents()
+    if contents is not None:
+        h.update(contents.get_data())
+    for name in ("/Resources", "/Group"):
+        if name in page:
+            h.update(name.encode())
+            h.update(_object_digest(page.raw_get(name), memo))
+    return h.hexdigest()
+
+
+def draw_page(document, number, width):
+    """A Pillow image of page ``number`` (from 0) of a pypdfium2 ``document``, ``width`` pixels wide."""
+    page = document[number]
+    try:
+        return page.render(scale=width / page.get_width()).to_pil().convert("RGB")
+    finally:
+        page.close()
+
+
+def page_pngs(document, number, widths=THUMBNAIL_WIDTHS):
+    """``{width: PNG bytes}`` for page ``number``, drawn once at the largest width."""
+    from PIL import Image
+
+    master = draw_page(document, number, max(widths))
+    pngs = {}
+    for width in widths:
+        height = max(1, round(master.height * width / master.width))
+        image = master if width == master.width else master.resize((width, height), Image.LANCZOS)
+        buf = io.BytesIO()
+        image.save(buf, "PNG", optimize=True)
+        pngs[width] = buf.getvalue()
+    return pngs
+
+
+def index_path(pdf_path):
+    """``out/playbook.pdf`` -> ``out/playbook.previews.json``."""
+    return os.path.splitext(pdf_path)[0] + ".previews.json"
+
+
+def preview_cache(pdf_path, max_bytes=MAX_PREVIEW_BYTES):
+    """The content-addressed thumbnail store next to ``pdf_path``."""
+    from playbook_cache import RenderCache
+
+    return RenderCache(os.path.join(os.path.dirname(os.path.abspath(pdf_path)), PREVIEW_DIR), max_bytes)
+
+
+def build_previews(pdf_path, widths=THUMBNAIL_WIDTHS, cache=None):
+    """Write thumbnails of every page of ``pdf_path`` that has none yet, and its index; returns a PreviewReport."""
+    import pypdfium2
+    from pypdf import PdfReader
+
+    started = time.perf_counter()
+    cache = cache or preview_cache(pdf_path)
+    report = PreviewReport(pdf_path, index_path(pdf_path))
+    with open(pdf_path, "rb") as f:
+        data = f.read()
+    reader = PdfReader(io.BytesIO(data))
+    document = None
+    pages = []
+    memo = {}
+    try:
+        for number, page in enumerate(reader.pages, start=1):
+            digest = page_hash(page, memo)
+            suffixes = {width: f"-{width}.png" for width in widths}
+            missing = [w for w, suffix in suffixes.items() if not cache.touch(digest, suffix)]
+            if missing:
+                # Only opened when some page needs drawing.
+                document = document or pypdfium2.PdfDocument(data)
+                for width, png in page_pngs(document, number - 1, missing).items():
+                    cache.put(digest, png, suffixes[width], evict=False)
+                report.drawn += 1
+            else:
+                report.reused += 1
+            report.hashes.append(digest)
+            pages.append({
+                "page": number,
+                "hash": digest,
+                "files": {str(w): f"{PREVIEW_DIR}/{digest}{suffix}" for w, suffix in suffixes.items()},
+            })
+    finally:
+        if document is not None:
+            document.close()
+    if report.drawn:
+        cache.evict()
+    report.pages = len(pages)
+
+    index = {"pdf": os.path.basename(pdf_path), "widths": list(widths), "pages": pages}
+    directory = os.path.dirname(os.path.abspath(pdf_path))
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(index, f, indent=1)
+        os.replace(tmp, report.index)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+    report.elapsed = time.perf_counter() - started
+    return report
+
+
+def print_report(report, log=sys.stdout):
+    print(
+        f"🖼️  Previews: {report.pages} pages, {report.drawn} drawn, {report.reused} reused "
+        f"in {report.elapsed:.2f}s ({report.index})",
+        file=log,
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write page thumbnails for generated PDFs.")
+    parser.add_argument("pdf", nargs="+", help="PDF files")
+    parser.add_argument(
+        "--widths",
+        default=",".join(map(str, THUMBNAIL_WIDTHS)),
+        help="comma-separated thumbnail widths in pixels (default: %(default)s)",
+    )
+    args = parser.parse_args(argv)
+    widths = tuple(int(w) for w in args.widths.split(",") if w.strip())
+    for path in args.pdf:
+        print_report(build_previews(path, widths))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""
+Password protection and integrity signatures for generated documents.
+
+The playbook and evidence packets are marked "CONFIDENTIAL - Attorney-Client
+Privileged", and ``ENCRYPTION.md`` requires sensitive documents to be
+encrypted at rest. ``protect_pdf`` encrypts a rendered PDF (AES-256) with a
+password for its recipient and writes a detached signature beside it:
+
+    jane_doe.pdf
+    jane_doe.pdf.sig.json   {"file", "size", "sha256", "key_id", "signature"}
+
+The signature is an HMAC-SHA256 over the file name, size and SHA-256 of the
+encrypted file, so ``verify_signature`` detects a document that was altered,
+truncated or swapped for another client's.
+
+Everything derives from the platform's ``ENCRYPTION_KEY`` (64 hex characters,
+the same key ``src/middleware/data-protection.ts`` uses), which is never
+written anywhere:
+
+- a recipient's password is derived from the key and the recipient's name,
+  so staff can look it up again (``--password-for``) instead of storing it;
+- the owner password and the signing key are derived once per process.
+
+Batch workers load the keys when the pool starts (``load_keys``) and encrypt
+each document from the render buffer, so plaintext is never written to disk
+and the per-document cost is one pass of the cipher over the file. Encrypted
+files are not byte-reproducible: every encryption uses fresh random IVs.
+
+    python playbook_protect.py out/*.pdf --recipient "Jane Doe" [--workers N]
+    python playbook_protect.py out/*.pdf --manifest clients.csv   # batch or packet output
+    python playbook_protect.py --verify out/*.pdf
+    python playbook_protect.py --password-for "Jane Doe"
+    python generate_irs_audit_defense_playbook.py --manifest clients.csv --encrypt
+
+Requires pypdf and cryptography (``pip install pypdf cryptography``); pypdf
+needs cryptography for AES, so ``require_cipher`` checks for it before any
+worker starts. Verifying signatures and looking up passwords need neither.
+"""
+
+import argparse
+import base64
+import hashlib
+import hmac
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+
+from playbook_batch import BatchFailure, BatchReport
+
+KEY_ENV = "ENCRYPTION_KEY"
+ALGORITHM = "AES-256"
+SIGNATURE_SUFFIX = ".sig.json"
+# Characters of a recipient password (base32, 5 bits each)
+PASSWORD_LENGTH = 16
+
+_keys = None
+
+
+@dataclass(frozen=True)
+class ProtectionKeys:
+    """Secrets derived from ENCRYPTION_KEY; see ``load_keys``."""
+
+    password_key: bytes
+    owner_password: str
+    signing_key: bytes
+    key_id: str  # identifies the key in signatures without revealing it
+
+    @classmethod
+    def from_key(cls, key):
+        def derive(label):
+            return hmac.new(key, label.encode("ascii"), hashlib.sha256).digest()
+
+        return cls(
+            password_key=derive("playbook-pdf-user-password"),
+            owner_password=base64.b32encode(derive("playbook-pdf-owner-password")).decode("ascii").rstrip("="),
+            signing_key=derive("playbook-pdf-signature"),
+            key_id=hashlib.sha256(derive("playbook-key-id")).hexdigest()[:16],
+        )
+
+
+def load_keys():
+    """
+    Derive the protection keys from ENCRYPTION_KEY, once per process; raises
+    ValueError if it is missing or not 32 bytes of hex.
+    """
+    global _keys
+    if _keys is None:
+        try:
+            key = bytes.fromhex(os.environ.get(KEY_ENV, ""))
+        except ValueError:
+            key = b""
+        if len(key) != 32:
+            raise ValueError(f"{KEY_ENV} must be set to a 256-bit key in hex (64 characters)")
+        _keys = ProtectionKeys.from_key(key)
+    return _keys
+
+
+def require_cipher(algorithm=ALGORITHM):
+    """Raise ValueError unless the packages that encrypt with ``algorithm`` import."""
+    try:
+        import pypdf  # noqa: F401
+    except ImportError:
+        raise ValueError("encryption requires pypdf (pip install pypdf)") from None
+    if algorithm.startswith("AES"):
+        try:
+            import cryptography  # noqa: F401
+        except ImportError:
+            raise ValueError(f"{algorithm} encryption requires cryptography (pip install cryptography)") from None
+
+
+def recipient_password(recipient, keys=None):
+    """The password that opens documents for ``recipient`` (case and surrounding spaces ignored)."""
+    keys = keys or load_keys()
+    name = " ".join(recipient.split()).casefold().encode("utf-8")
+    digest = hmac.new(keys.password_key, name, hashlib.sha256).digest()
+    return base64.b32encode(digest).decode("ascii")[:PASSWORD_LENGTH]
+
+
+def record_recipient(record):
+    """The recipient of a manifest row's document: its ``recipient`` column, else the client name."""
+    recipient = (record.get("recipient") or record.get("client_name") or "").strip()
+    if not recipient:
+        raise ValueError("no recipient or client_name to derive the document password from")
+    return recipient
+
+
+def manifest_recipients(manifest):
+    """
+    ``{file name: recipient}`` for the documents a batch or packet manifest
+    produces, so files protected after the fact get the password the build
+    itself would have used (see ``record_recipient``).
+    """
+    from playbook_batch import output_name
+    from playbook_packet import packet_name, read_packets
+
+    recipients = {}
+    for index, record in enumerate(read_packets(manifest)):
+        try:
+            recipient = record_recipient(record)
+        except ValueError:
+            continue
+        for name in (output_name(index, record), packet_name(index, record)):
+            recipients.setdefault(name, recipient)
+    return recipients
+
+
+def signature_path(path):
+    """``jane_doe.pdf`` -> ``jane_doe.pdf.sig.json``."""
+    return path + SIGNATURE_SUFFIX
+
+
+def _signed_fields(name, size, sha256):
+    return f"{name}\n{size}\n{sha256}".encode("utf-8")
+
+
+def sign(path, data, keys=None):
+    """Write the detached signature of ``data``, the contents of ``path``; returns it as a dict."""
+    keys = keys or load_keys()
+    name = os.path.basename(path)
+    sha256 = hashlib.sha256(data).hexdigest()
+    signature = {
+        "file": name,
+        "size": len(data),
+        "sha256": sha256,
+        "algorithm": "HMAC-SHA256",
+        "key_id": keys.key_id,
+        "signature": hmac.new(keys.signing_key, _signed_fields(name, len(data), sha256), hashlib.sha256).hexdigest(),
+    }
+    _write_atomic(signature_path(path), (json.dumps(signature, indent=2) + "\n").encode("utf-8"))
+    return signature
+
+
+def verify_signature(path, keys=None):
+    """Return None if ``path`` matches its detached signature, or what is wrong with it."""
+    keys = keys or load_keys()
+    try:
+        with open(signature_path(path), encoding="utf-8") as f:
+            signature = json.load(f)
+    except FileNotFoundError:
+        return "no signature"
+    except ValueError:
+        return "unreadable signature"
+    if signature.get("key_id") != keys.key_id:
+        return f"signed with another key ({signature.get('key_id')})"
+    hasher = hashlib.sha256()
+    size = 0
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            hasher.update(chunk)
+            size += len(chunk)
+    name = os.path.basename(path)
+    expected = hmac.new(keys.signing_key, _signed_fields(name, size, hasher.hexdigest()), hashlib.sha256).hexdigest()
+    if not hmac.compare_digest(expected, str(signature.get("signature", ""))):
+        return "signature mismatch"
+    return None
+
+
+def _write_atomic(path, data):
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=".protect-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def encrypt_pdf(data, recipient, keys=None, algorithm=ALGORITHM):
+    """``data`` (PDF bytes) encrypted with ``recipient``'s password; returns the new bytes."""
+    from pypdf import PdfReader, PdfWriter
+
+    keys = keys or load_keys()
+    writer = PdfWriter(clone_from=PdfReader(io.BytesIO(data)))
+    writer.encrypt(recipient_password(recipient, keys), keys.owner_password, algorithm=algorithm)
+    buf = io.BytesIO()
+    writer.write(buf)
+    return buf.getvalue()
+
+
+def protect_pdf(data, path, recipient, keys=None, algorithm=ALGORITHM):
+    """
+    Encrypt ``data`` (PDF bytes) for ``recipient``, write it to ``path`` and
+    sign it; returns the signature dict.
+    """
+    keys = keys or load_keys()
+    encrypted = encrypt_pdf(data, recipient, keys, algorithm)
+    _write_atomic(path, encrypted)
+    return sign(path, encrypted, keys)
+
+
+def protect_file(path, recipient, keys=None, algorithm=ALGORITHM):
+    """Encrypt and sign the PDF at ``path`` in place; returns the signature dict."""
+    with open(path, "rb") as f:
+        data = f.read()
+    return protect_pdf(data, path, recipient, keys, algorithm)
+
+
+def _init_worker():
+    load_keys()
+
+
+def _protect_one(index, path, recipient, algorithm):
+    try:
+        protect_file(path, recipient, algorithm=algorithm)
+        return index, None
+    except Exception:
+        return index, traceback.format_exc(limit=3).strip().splitlines()[-1]
+
+
+def protect_files(paths, recipients, workers=None, algorithm=ALGORITHM):
+    """
+    Encrypt and sign existing PDFs in place across a process pool;
+    ``recipients`` pairs a recipient with each path. Returns a BatchReport
+    with the recipient in place of the client name.
+    """
+    # Fail before starting the pool if the key or the cipher is missing.
+    load_keys()
+    require_cipher(algorithm)
+    report = BatchReport(total=len(paths))
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        futures = [
+            pool.submit(_protect_one, i, path, recipients[i], algorithm)
+            for i, path in enumerate(paths)
+        ]
+        for future in as_completed(futures):
+            index, error = future.result()
+            if error is None:
+                report.succeeded += 1
+                report.outputs.append(paths[index])
+            else:
+                report.failures.append(BatchFailure(index, recipients[index], error))
+    report.elapsed = time.perf_counter() - start
+
+    report.outputs.sort()
+    report.failures.sort(key=lambda f: f.index)
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Encrypt and sign generated PDFs, or verify their signatures.")
+    parser.add_argument("paths", nargs="*", help="PDF files")
+    recipient_source = parser.add_mutually_exclusive_group()
+    recipient_source.add_argument("--recipient", help="recipient whose password opens the files")
+    recipient_source.add_argument(
+        "--manifest",
+        help="batch or packet manifest the files were built from; each file gets its row's recipient or client_name",
+    )
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--verify", action="store_true", help="check each file against its signature instead")
+    parser.add_argument("--password-for", metavar="RECIPIENT", help="print a recipient's document password")
+    args = parser.parse_args(argv)
+
+    try:
+        keys = load_keys()
+    except ValueError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+
+    if args.password_for:
+        print(recipient_password(args.password_for, keys))
+        return 0
+    if args.verify:
+        failed = 0
+        for path in args.paths:
+            problem = verify_signature(path, keys)
+            if problem:
+                failed += 1
+                print(f"❌ {path}: {problem}")
+            else:
+                print(f"✅ {path}")
+        return 1 if failed else 0
+
+    if args.recipient:
+        recipients = [args.recipient] * len(args.paths)
+    elif args.manifest:
+        by_name = manifest_recipients(args.manifest)
+        unknown = [path for path in args.paths if os.path.basename(path) not in by_name]
+        if unknown:
+            parser.error(f"not built from {args.manifest} (or the row has no recipient): {', '.join(unknown)}")
+        recipients = [by_name[os.path.basename(path)] for path in args.paths]
+    else:
+        parser.error("--recipient or --manifest is required to encrypt files")
+    try:
+        report = protect_files(args.paths, recipients, args.workers)
+    except ValueError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    print(f"🔒 Protected: {report.succeeded}/{report.total} documents")
+    print(f"⏱️  Elapsed: {report.elapsed:.2f}s ({report.docs_per_sec:.1f} docs/sec)")
+    for failure in report.failures:
+        print(f"❌ {args.paths[failure.index]}: {failure.error}")
+    return 1 if report.failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
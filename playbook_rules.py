@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Notice deadline and escalation rules engine.
+
+Evaluates the Section 3 classification matrix and the Section 8 escalation
+triggers (``playbook_content.CLASSIFICATION_RULES`` / ``TRIGGER_RULES``, the
+same tables the playbook prints) over whole columns of notices at once with
+NumPy, so a season's worth of notices is classified in one pass.
+
+Input columns (``evaluate`` takes a dict of array-likes, the CLI a CSV):
+
+    classification      one of the Section 3 classifications (required)
+    notice_date         YYYY-MM-DD (required)
+    amount              proposed change in tax, in dollars; "$5,000" is
+                        accepted (optional)
+    specified_deadline  deadline stated on the notice, YYYY-MM-DD (optional;
+                        honored for classifications marked "as specified")
+    penalty_amount, criminal_referral, fraud
+                        trigger columns (optional, see TRIGGER_RULES)
+
+    python playbook_rules.py notices.csv [-o deadlines.csv]
+
+Requires numpy.
+"""
+
+import argparse
+import csv
+import sys
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+from playbook_content import CLASSIFICATION_RULES, TRIGGER_RULES
+
+_TRUE = ("1", "true", "yes", "y", "x")
+REQUIRED_COLUMNS = ("classification", "notice_date")
+# How many problems an InvalidNotices message spells out.
+_SHOWN_PROBLEMS = 5
+
+
+class InvalidNotices(ValueError):
+    """Rows ``evaluate`` could not read.
+
+    ``problems`` lists every bad cell as ``(row, column, value, reason)``,
+    sorted by row index; ``row`` is None for a missing column.
+    """
+
+    def __init__(self, problems):
+        self.problems = sorted(problems, key=lambda problem: -1 if problem[0] is None else problem[0])
+        shown = "; ".join(
+            f"{_where(row)} {column} {value!r}: {reason}"
+            for row, column, value, reason in self.problems[:_SHOWN_PROBLEMS]
+        )
+        more = len(self.problems) - _SHOWN_PROBLEMS
+        super().__init__(f"{len(self.problems)} invalid notice value(s): {shown}" + (f"; and {more} more" if more > 0 else ""))
+
+
+def _where(row):
+    return "header" if row is None else f"row {row}"
+
+
+def _require_columns(columns):
+    missing = [(None, name, "", "missing required column") for name in REQUIRED_COLUMNS if name not in columns]
+    if missing:
+        raise InvalidNotices(missing)
+
+
+@dataclass
+class NoticeDecisions:
+    """Per-notice results of ``evaluate``, one array element per input row."""
+
+    deadline: np.ndarray           # datetime64[D]
+    escalate: np.ndarray           # bool
+    escalate_to: np.ndarray        # str; "" when the notice does not escalate
+                                   # (the most urgent trigger's when only triggers fired)
+    triggers: np.ndarray           # bool, shape (rows, len(TRIGGER_RULES))
+    respond_within_hours: np.ndarray  # float; inf when no trigger fired
+
+    def __len__(self):
+        return len(self.deadline)
+
+    def trigger_actions(self, row):
+        """The Section 8 actions fired for ``row``."""
+        return [rule["action"] for rule, fired in zip(TRIGGER_RULES, self.triggers[row]) if fired]
+
+
+class NoticeRules:
+    """Section 3 and Section 8 rule tables compiled into lookup arrays."""
+
+    def __init__(self, classification_rules=CLASSIFICATION_RULES, trigger_rules=TRIGGER_RULES):
+        self.classifications = [rule["classification"] for rule in classification_rules]
+        self._index = {name: i for i, name in enumerate(self.classifications)}
+        self._days = np.array([rule["deadline_days"] for rule in classification_rules], dtype="timedelta64[D]")
+        self._as_specified = np.array([rule["as_specified"] for rule in classification_rules])
+        # An immediate escalation is a threshold no amount can stay under.
+        self._threshold = np.array(
+            [-np.inf if rule["escalate_over"] is None else rule["escalate_over"] for rule in classification_rules],
+            dtype=float,
+        )
+        self._escalate_to = np.array([rule["escalate_to"] for rule in classification_rules] + [""])
+        self.trigger_rules = trigger_rules
+        self._hours = np.array([rule["within_hours"] for rule in trigger_rules], dtype=float)
+        self._trigger_to = np.array([rule.get("escalate_to", "") for rule in trigger_rules] + [""])
+
+    def classify(self, classification):
+        """Map classification names to rule indexes; raises InvalidNotices on unknown names."""
+        problems = []
+        idx = self._classify(classification, problems)
+        if problems:
+            raise InvalidNotices(problems)
+        return idx
+
+    def _classify(self, classification, problems):
+        classification = np.asarray(classification, dtype=str)
+        idx = np.full(len(classification), -1, dtype=np.intp)
+        for i, name in enumerate(self.classifications):
+            idx[classification == name] = i
+        for row in np.flatnonzero(idx < 0):
+            problems.append((int(row), "classification", str(classification[row]), "unknown notice classification"))
+        return idx
+
+    def evaluate(self, columns):
+        """Evaluate every notice in ``columns`` (a dict of equal-length array-likes).
+
+        Raises InvalidNotices listing every unreadable row rather than
+        stopping at the first.
+        """
+        _require_columns(columns)
+        problems = []
+        idx = self._classify(columns["classification"], problems)
+        n = len(idx)
+
+        deadline = _date_column(columns["notice_date"], n, "notice_date", problems, required=True) + self._days[idx]
+        specified = columns.get("specified_deadline")
+        if specified is not None:
+            specified = _date_column(specified, n, "specified_deadline", problems)
+            use = self._as_specified[idx] & ~np.isnat(specified)
+            deadline = np.where(use, specified, deadline)
+
+        amount = _float_column(columns.get("amount"), n, "amount", problems)
+        threshold = self._threshold[idx]
+        # NaN amounts compare false, so only immediate rules escalate them.
+        escalate = np.isneginf(threshold) | (amount > threshold)
+        escalate_to = self._escalate_to[np.where(escalate, idx, -1)]
+
+        triggers = np.zeros((n, len(self.trigger_rules)), dtype=bool)
+        for j, rule in enumerate(self.trigger_rules):
+            if rule["over"] is None:
+                triggers[:, j] = _bool_column(columns.get(rule["field"]), n)
+            else:
+                triggers[:, j] = _float_column(columns.get(rule["field"]), n, rule["field"], problems) > rule["over"]
+        if problems:
+            raise InvalidNotices(problems)
+
+        timed = np.where(triggers, self._hours, np.inf)
+        hours = timed.min(axis=1) if len(self.trigger_rules) else np.full(n, np.inf)
+        # Rows escalated only by a trigger go to the most urgent trigger's owner.
+        fired = triggers.any(axis=1)
+        urgent = np.where(fired, timed.argmin(axis=1), -1) if len(self.trigger_rules) else np.full(n, -1)
+        escalate_to = np.where(escalate, escalate_to, self._trigger_to[urgent])
+
+        return NoticeDecisions(deadline, escalate | fired, escalate_to, triggers, hours)
+
+
+def _date_column(values, n, name, problems, required=False):
+    values = np.asarray(values)
+    if values.dtype.kind not in "USO":
+        parsed = values.astype("datetime64[D]")
+        blank = np.isnat(parsed)
+    else:
+        text = np.char.strip(values.astype(str))
+        blank = text == ""
+        try:
+            parsed = np.where(blank, "NaT", text).astype("datetime64[D]")
+        except (TypeError, ValueError):
+            # Something in the column is not a date; parse row by row.
+            parsed = np.full(n, np.datetime64("NaT"), dtype="datetime64[D]")
+            for row in np.flatnonzero(~blank):
+                try:
+                    parsed[row] = np.datetime64(text[row], "D")
+                except (TypeError, ValueError):
+                    pass
+        # NumPy also reads "2026-01" and "2026" (as the first day); only a
+        # full date prints back as what was written.
+        bad = ~blank & (np.isnat(parsed) | (np.datetime_as_string(parsed, unit="D") != text))
+        for row in np.flatnonzero(bad):
+            problems.append((int(row), name, str(text[row]), "not a YYYY-MM-DD date"))
+        parsed[bad] = np.datetime64("NaT")
+    if required:
+        for row in np.flatnonzero(blank):
+            problems.append((int(row), name, "", "missing date"))
+    return parsed
+
+
+def _float_column(values, n, name, problems):
+    if values is None:
+        return np.full(n, np.nan)
+    values = np.asarray(values)
+    if values.dtype.kind not in "USO":
+        return values.astype(float)
+    text = np.char.strip(values.astype(str))
+    cleaned = np.char.replace(np.char.replace(text, "$", ""), ",", "")
+    cleaned = np.where(cleaned == "", "nan", cleaned)
+    try:
+        return cleaned.astype(float)
+    except ValueError:
+        pass
+    parsed = np.full(n, np.nan)
+    for row, value in enumerate(cleaned):
+        try:
+            parsed[row] = float(value)
+        except ValueError:
+            problems.append((row, name, str(text[row]), "not a dollar amount"))
+    return parsed
+
+
+def _bool_column(values, n):
+    if values is None:
+        return np.zeros(n, dtype=bool)
+    values = np.asarray(values)
+    if values.dtype.kind in "USO":
+        return np.isin(np.char.lower(np.char.strip(values.astype(str))), _TRUE)
+    return values.astype(bool)
+
+
+def read_columns(path):
+    """Read a notices CSV into a dict of string arrays, one per column."""
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f)
+        header = [name.strip() for name in next(reader)]
+        columns = list(zip(*reader)) or [()] * len(header)
+    return {name: np.array(column, dtype=str) for name, column in zip(header, columns)}
+
+
+def typed_columns(columns):
+    """Parse the date, amount and flag columns ``evaluate`` reads into typed arrays.
+
+    Raises InvalidNotices listing every cell that does not parse.
+    """
+    _require_columns(columns)
+    n = len(columns["classification"])
+    typed = dict(columns)
+    problems = []
+    for name in ("notice_date", "specified_deadline"):
+        if name in columns:
+            typed[name] = _date_column(columns[name], n, name, problems, required=name == "notice_date")
+    flags = {rule["field"] for rule in TRIGGER_RULES if rule["over"] is None}
+    for name in sorted({"amount"} | {rule["field"] for rule in TRIGGER_RULES}):
+        if name in columns:
+            if name in flags:
+                typed[name] = _bool_column(columns[name], n)
+            else:
+                typed[name] = _float_column(columns[name], n, name, problems)
+    if problems:
+        raise InvalidNotices(problems)
+    return typed
+
+
+def write_decisions(columns, decisions, output):
+    """Write the input columns plus deadline, escalation and trigger results as CSV."""
+    header = list(columns) + ["response_deadline", "escalate", "escalate_to", "respond_within_hours", "triggers"]
+    writer = csv.writer(output)
+    writer.writerow(header)
+    deadline = np.datetime_as_string(decisions.deadline, unit="D")
+    within = decisions.respond_within_hours
+    hours = np.where(np.isinf(within), "", np.where(np.isinf(within), 0, within).astype(int).astype(str))
+    triggers = ["; ".join(decisions.trigger_actions(i)) for i in range(len(decisions))]
+    rows = zip(*columns.values(), deadline, decisions.escalate, decisions.escalate_to, hours, triggers)
+    writer.writerows(rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compute notice response deadlines and escalations.")
+    parser.add_argument("notices", help="CSV of notices (classification, notice_date, amount, ...)")
+    parser.add_argument("-o", "--output", default="-", help="output CSV path (default: stdout)")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    columns = read_columns(args.notices)
+    try:
+        typed = typed_columns(columns)
+        parsed = time.perf_counter()
+        decisions = NoticeRules().evaluate(typed)
+    except InvalidNotices as e:
+        for row, column, value, reason in e.problems:
+            print(f"❌ {_where(row).capitalize()} ({column} {value!r}): {reason}", file=sys.stderr)
+        return 1
+    elapsed = time.perf_counter() - parsed
+
+    if args.output == "-":
+        write_decisions(columns, decisions, sys.stdout)
+    else:
+        with open(args.output, "w", newline="", encoding="utf-8") as f:
+            write_decisions(columns, decisions, f)
+    print(
+        f"⚖️  {len(decisions)} notices evaluated in {elapsed * 1000:.1f}ms "
+        f"(read {(parsed - started) * 1000:.0f}ms, {int(decisions.escalate.sum())} escalated)",
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
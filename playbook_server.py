@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+Local HTTP render service for the IRS Audit Defense Playbook.
+
+Keeps a pool of worker processes that have already imported reportlab and
+built the style sheets, so a request pays only for layout. Binds to loopback
+only and needs nothing beyond the standard library and reportlab.
+
+    python playbook_server.py [--port 8787] [--workers N] [--queue-size N] [--fragments]
+
+Endpoints:
+
+    GET  /healthz   {"status": "ok", "workers": N, "queued": n, "queue_size": N}
+    POST /render    JSON body with client_name, notice_code, notice_date,
+                    classification and effective_date (all optional)
+    GET  /render    the same fields as query parameters
+
+``/render`` answers ``application/pdf``. When ``queue_size`` renders are
+already waiting, new requests are refused with ``503`` and ``Retry-After``
+instead of piling up. Bodies over ``MAX_BODY`` are refused with ``413``. If
+a worker process dies, the pool is replaced and the render tried once more.
+"""
+
+import argparse
+import asyncio
+import ipaddress
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from urllib.parse import parse_qsl, urlsplit
+
+import generate_irs_audit_defense_playbook as playbook
+import playbook_batch
+
+MAX_BODY = 64 * 1024
+CHUNK_SIZE = 64 * 1024
+
+# Request fields, each an optional string
+RECORD_FIELDS = ("client_name", "notice_code", "notice_date", "classification", "effective_date")
+
+REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+    503: "Service Unavailable",
+}
+
+
+class BadRequest(Exception):
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def _check_loopback(host):
+    if host == "localhost":
+        return
+    try:
+        loopback = ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        loopback = False
+    if not loopback:
+        raise ValueError(f"Render server only binds to loopback addresses, not {host!r}")
+
+
+def record_problem(record):
+    """Why ``record`` cannot be rendered, or None; dates and classifications are checked by the render itself."""
+    for name in RECORD_FIELDS:
+        value = record.get(name)
+        if value is not None and not isinstance(value, str):
+            return f"{name} must be a string"
+    return None
+
+
+def _render(record):
+    effective = (record.get("effective_date") or "").strip()
+    return playbook_batch.render_record(record, playbook.parse_date(effective) if effective else None)
+
+
+class RenderServer:
+    """Loopback HTTP front end over a warm render pool with a bounded request queue."""
+
+    def __init__(self, host="127.0.0.1", port=8787, workers=None, queue_size=None, fragments=False):
+        _check_loopback(host)
+        self.host = host
+        self.port = port
+        self.workers = workers or os.cpu_count() or 1
+        self.queue_size = queue_size or self.workers * 4
+        self.fragments = fragments
+        self._pool = None
+        self._queue = None
+        self._dispatchers = []
+        self._server = None
+
+    def _new_pool(self):
+        # A worker forked from the running server would inherit its client
+        # sockets and hold connections open; the fork server is started
+        # with the first pool, before anything is listening.
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("forkserver") if "forkserver" in methods else None
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=playbook_batch._init_worker,
+            initargs=(self.fragments,),
+            mp_context=context,
+        )
+
+    async def start(self):
+        self._pool = self._new_pool()
+        # Start every worker now so the first requests don't pay for the import.
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self._pool, os.getpid) for _ in range(self.workers)))
+
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._dispatchers = [asyncio.create_task(self._dispatch()) for _ in range(self.workers)]
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        for task in self._dispatchers:
+            task.cancel()
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+
+    async def serve_forever(self):
+        """Serve until cancelled; call ``start()`` first."""
+        await self._server.serve_forever()
+
+    async def _run(self, record):
+        """Render ``record`` on the pool, replacing the pool once if a worker has died."""
+        loop = asyncio.get_running_loop()
+        for attempt in range(2):
+            pool = self._pool
+            try:
+                return await loop.run_in_executor(pool, _render, record)
+            except BrokenProcessPool:
+                # Every dispatcher sees the same broken pool; only the first replaces it.
+                if self._pool is pool:
+                    self._pool = self._new_pool()
+                    pool.shutdown(wait=False, cancel_futures=True)
+                if attempt:
+                    raise
+
+    async def _dispatch(self):
+        while True:
+            record, future = await self._queue.get()
+            try:
+                if not future.cancelled():
+                    pdf = await self._run(record)
+                    if not future.cancelled():
+                        future.set_result(pdf)
+            except Exception as exc:
+                if not future.cancelled():
+                    future.set_exception(exc)
+            finally:
+                self._queue.task_done()
+
+    async def render(self, record):
+        """Queue a render; raises ``asyncio.QueueFull`` when the queue is at capacity."""
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((record, future))
+        return await future
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                request = await self._read_request(reader)
+                if request is None:
+                    break
+                method, target, headers, body = request
+                keep_alive = headers.get("connection", "").lower() != "close"
+                await self._respond(writer, method, target, body, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except BadRequest as exc:
+            await self._send_json(writer, exc.status, {"error": str(exc)}, keep_alive=False)
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader):
+        line = await reader.readline()
+        if not line:
+            return None
+        try:
+            method, target, _version = line.decode("latin-1").split()
+        except ValueError:
+            raise BadRequest("malformed request line") from None
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        try:
+            length = int(headers.get("content-length") or 0)
+        except ValueError:
+            raise BadRequest("invalid Content-Length") from None
+        if length < 0:
+            raise BadRequest("invalid Content-Length")
+        if length > MAX_BODY:
+            raise BadRequest("request body too large", 413)
+        body = await reader.readexactly(length) if length else b""
+        return method, target, headers, body
+
+    async def _respond(self, writer, method, target, body, keep_alive):
+        url = urlsplit(target)
+        if url.path == "/healthz":
+            await self._send_json(writer, 200, {
+                "status": "ok",
+                "workers": self.workers,
+                "queued": self._queue.qsize(),
+                "queue_size": self.queue_size,
+            }, keep_alive)
+            return
+        if url.path != "/render":
+            await self._send_json(writer, 404, {"error": "not found"}, keep_alive)
+            return
+
+        if method == "GET":
+            record = dict(parse_qsl(url.query))
+        elif method == "POST":
+            try:
+                record = json.loads(body or b"{}")
+            except ValueError:
+                await self._send_json(writer, 400, {"error": "body must be JSON"}, keep_alive)
+                return
+            if not isinstance(record, dict):
+                await self._send_json(writer, 400, {"error": "body must be a JSON object"}, keep_alive)
+                return
+        else:
+            await self._send_json(writer, 405, {"error": "use GET or POST"}, keep_alive)
+            return
+        problem = record_problem(record)
+        if problem:
+            await self._send_json(writer, 400, {"error": problem}, keep_alive)
+            return
+
+        try:
+            pdf = await self.render(record)
+        except asyncio.QueueFull:
+            await self._send_json(writer, 503, {"error": "render queue full"}, keep_alive, {"Retry-After": "1"})
+            return
+        except ValueError as exc:
+            await self._send_json(writer, 400, {"error": str(exc)}, keep_alive)
+            return
+        except Exception as exc:
+            await self._send_json(writer, 500, {"error": f"{type(exc).__name__}: {exc}"}, keep_alive)
+            return
+
+        await self._send(writer, 200, "application/pdf", pdf, keep_alive, {
+            "Content-Disposition": 'inline; filename="IRS_Audit_Defense_Playbook_ROSS_TAX_PREP.pdf"',
+        })
+
+    async def _send_json(self, writer, status, payload, keep_alive, extra_headers=None):
+        body = json.dumps(payload).encode()
+        await self._send(writer, status, "application/json", body, keep_alive, extra_headers)
+
+    async def _send(self, writer, status, content_type, body, keep_alive, extra_headers=None):
+        headers = {
+            "Content-Type": content_type,
+            "Content-Length": str(len(body)),
+            "Connection": "keep-alive" if keep_alive else "close",
+        }
+        headers.update(extra_headers or {})
+        head = f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+        head += "".join(f"{k}: {v}\r\n" for k, v in headers.items()) + "\r\n"
+        writer.write(head.encode("latin-1"))
+        view = memoryview(body)
+        for start in range(0, len(view), CHUNK_SIZE):
+            writer.write(view[start:start + CHUNK_SIZE])
+            await writer.drain()
+        await writer.drain()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve IRS Audit Defense Playbook renders on loopback.")
+    parser.add_argument("--host", default="127.0.0.1", help="loopback address to bind (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--workers", type=int, default=None, help="render processes (default: CPU count)")
+    parser.add_argument("--queue-size", type=int, default=None, help="renders allowed to wait (default: 4 per worker)")
+    parser.add_argument("--fragments", action="store_true", help="splice cached static sections (requires pypdf)")
+    args = parser.parse_args(argv)
+
+    server = RenderServer(args.host, args.port, args.workers, args.queue_size, args.fragments)
+
+    async def run():
+        await server.start()
+        print(f"🖨️  Playbook render server on http://{server.host}:{server.port} ({server.workers} workers)")
+        try:
+            await server.serve_forever()
+        finally:
+            await server.close()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
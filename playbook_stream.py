@@ -0,0 +1,369 @@
+"""
+Low-memory streaming builds of the IRS Audit Defense Playbook.
+
+A normal build holds the whole flowable list and every finished page in
+memory until the PDF is written. For very long documents (firm-wide binders
+of client notices, appendices and evidence indexes) ``stream_playbook``
+instead:
+
+- pulls flowables from a generator, compiling one section at a time, through
+  a paused-and-resumed ``FlowableStream``;
+- lays them out in parts of ``part_pages`` pages, each its own small PDF with
+  page numbering continued from the previous part;
+- copies each finished part's pages straight to the output and forgets them.
+
+Peak memory is set by the part size, not the document length. The output
+keeps one page tree and one outline; only the cross-reference offsets and the
+list of page object numbers (a few bytes per page) grow with length.
+
+The table of contents prints the pages recorded by the previous build of the
+same layout; a streamed build is never laid out twice.
+
+Requires pypdf (``pip install pypdf``).
+"""
+
+import gc
+import io
+from array import array
+from collections import deque
+
+import generate_irs_audit_defense_playbook as playbook
+
+DEFAULT_PART_PAGES = 50
+WRITE_SLICE = 1024
+
+_part_template = None
+
+
+def part_doc_template():
+    """SimpleDocTemplate that pauses its FlowableStream after ``part_pages`` pages."""
+    global _part_template
+    if _part_template is None:
+        from reportlab.platypus import SimpleDocTemplate
+
+        class PartDocTemplate(SimpleDocTemplate):
+            def build(self, stream, part_pages, **kwargs):
+                self._stream = stream
+                self._part_pages = part_pages
+                self.pages_done = 0
+                super().build(stream, **kwargs)
+
+            def afterPage(self):
+                self.pages_done += 1
+                if self.pages_done >= self._part_pages:
+                    self._stream.paused = True
+
+        _part_template = PartDocTemplate
+    return _part_template
+
+
+def _part_canvas(base, first_page):
+    class PartCanvas(base):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self._pageNumber = first_page
+
+    return PartCanvas
+
+
+# Page attributes a page may inherit from its ancestors in the page tree
+# (PDF 1.7, Table 30); a page re-parented under a new /Pages node keeps them
+# only if they are copied onto it.
+INHERITABLE_PAGE_KEYS = ("/Resources", "/MediaBox", "/CropBox", "/Rotate")
+
+
+def _copy_direct(obj):
+    """Copy of the direct dictionaries and arrays in ``obj``; indirect references are shared."""
+    from pypdf.generic import ArrayObject, DictionaryObject
+
+    if isinstance(obj, DictionaryObject):
+        return DictionaryObject({k: _copy_direct(v) for k, v in dict.items(obj)})
+    if isinstance(obj, ArrayObject):
+        return ArrayObject(_copy_direct(v) for v in list.__iter__(obj))
+    return obj
+
+
+def _inherited_attributes(page):
+    """
+    ``{key: value}`` of the inheritable attributes ``page`` takes from its
+    ancestors. Values are copies, since every page renumbers its own in place.
+    """
+    inherited = {}
+    seen = set()
+    parent = dict.get(page, "/Parent")
+    while parent is not None:
+        key = (parent.idnum, parent.generation) if hasattr(parent, "idnum") else id(parent)
+        if key in seen:
+            break
+        seen.add(key)
+        node = parent.get_object()
+        for name in INHERITABLE_PAGE_KEYS:
+            if name not in page and name not in inherited and name in node:
+                inherited[name] = _copy_direct(dict.__getitem__(node, name))
+        parent = dict.get(node, "/Parent")
+    return inherited
+
+
+class StreamingPdfWriter:
+    """
+    Writes a PDF to ``out`` part by part: each part's pages, and everything
+    they reference, are written as soon as the part is added.
+    """
+
+    CATALOG = 1
+    PAGES = 2
+    OUTLINES = 3
+
+    def __init__(self, out):
+        self.out = out
+        self.pos = 0
+        self._offsets = array("Q", [0, 0, 0, 0])
+        self._kids = array("Q")
+        # Outline items are written as they arrive; each waits only for its successor's number.
+        self._outline_first = None
+        self._outline_pending = None
+        self._outline_count = 0
+        self._info = None
+        self._write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+
+    @property
+    def page_count(self):
+        return len(self._kids)
+
+    def _write(self, data):
+        self.out.write(data)
+        self.pos += len(data)
+
+    def _allocate(self):
+        self._offsets.append(0)
+        return len(self._offsets) - 1
+
+    def _write_object(self, num, obj):
+        buf = io.BytesIO()
+        obj.write_to_stream(buf)
+        self._offsets[num] = self.pos
+        self._write(b"%d 0 obj\n" % num + buf.getvalue() + b"\nendobj\n")
+
+    def add_part(self, reader, outline=True):
+        """Append every page of ``reader`` (a pypdf PdfReader), with its outline entries if ``outline``."""
+        from pypdf.generic import ArrayObject, DictionaryObject, IndirectObject, NameObject
+
+        mapping = {}
+        queue = deque()
+
+        def remap(obj):
+            if isinstance(obj, IndirectObject):
+                key = (obj.idnum, obj.generation)
+                if key not in mapping:
+                    mapping[key] = self._allocate()
+                    queue.append(obj)
+                return IndirectObject(mapping[key], 0, None)
+            if isinstance(obj, DictionaryObject):
+                for k, v in list(dict.items(obj)):
+                    dict.__setitem__(obj, k, remap(v))
+            elif isinstance(obj, ArrayObject):
+                for i, v in enumerate(list.__iter__(obj)):
+                    list.__setitem__(obj, i, remap(v))
+            return obj
+
+        first = len(self._kids)
+        page_ids = set()
+        for page in reader.pages:
+            ref = page.indirect_reference
+            page_ids.add((ref.idnum, ref.generation))
+            self._kids.append(remap(ref).idnum)
+
+        parent = IndirectObject(self.PAGES, 0, None)
+        while queue:
+            ref = queue.popleft()
+            obj = reader.get_object(ref)
+            is_page = (ref.idnum, ref.generation) in page_ids
+            if is_page:
+                inherited = _inherited_attributes(obj)
+                dict.pop(obj, "/Parent", None)
+                for name, value in inherited.items():
+                    dict.__setitem__(obj, NameObject(name), value)
+            remap(obj)
+            if is_page:
+                dict.__setitem__(obj, NameObject("/Parent"), parent)
+            self._write_object(mapping[(ref.idnum, ref.generation)], obj)
+            # Written and renumbered: nothing will look it up again, so don't
+            # let the reader's cache hold every content stream of a long file.
+            reader.resolved_objects.pop((ref.generation, ref.idnum), None)
+
+        if outline:
+            for entry in reader.outline:
+                if not isinstance(entry, list):
+                    self.add_outline_item(str(entry.title), first + reader.get_destination_page_number(entry))
+        if self._info is None and reader.metadata is not None:
+            self._info = {k: v for k, v in reader.metadata.items()}
+
+    def add_outline_item(self, title, page_index):
+        """Add a top-level outline entry for the page at ``page_index`` (0-based) of the output."""
+        self._add_outline_item(title, self._kids[page_index])
+
+    def _add_outline_item(self, title, page):
+        num = self._allocate()
+        if self._outline_pending is None:
+            self._outline_first = num
+        else:
+            self._write_outline_item(*self._outline_pending, next_num=num)
+        self._outline_pending = (num, title, page, self._outline_pending[0] if self._outline_pending else None)
+        self._outline_count += 1
+
+    def _write_outline_item(self, num, title, page, prev_num, next_num=None):
+        from pypdf.generic import ArrayObject, DictionaryObject, IndirectObject, NameObject, TextStringObject
+
+        item = DictionaryObject({
+            NameObject("/Title"): TextStringObject(title),
+            NameObject("/Parent"): IndirectObject(self.OUTLINES, 0, None),
+            NameObject("/Dest"): ArrayObject([IndirectObject(page, 0, None), NameObject("/Fit")]),
+        })
+        if prev_num is not None:
+            item[NameObject("/Prev")] = IndirectObject(prev_num, 0, None)
+        if next_num is not None:
+            item[NameObject("/Next")] = IndirectObject(next_num, 0, None)
+        self._write_object(num, item)
+
+    def close(self, info=None):
+        """Write the page tree, outline, catalog, document info and cross-reference table."""
+        from pypdf.generic import (
+            DictionaryObject,
+            IndirectObject,
+            NameObject,
+            NumberObject,
+            TextStringObject,
+        )
+
+        def ref(num):
+            return IndirectObject(num, 0, None)
+
+        catalog = DictionaryObject({
+            NameObject("/Type"): NameObject("/Catalog"),
+            NameObject("/Pages"): ref(self.PAGES),
+        })
+        outlines = DictionaryObject({NameObject("/Type"): NameObject("/Outlines")})
+        if self._outline_pending is not None:
+            self._write_outline_item(*self._outline_pending)
+            outlines[NameObject("/First")] = ref(self._outline_first)
+            outlines[NameObject("/Last")] = ref(self._outline_pending[0])
+            outlines[NameObject("/Count")] = NumberObject(self._outline_count)
+            catalog[NameObject("/Outlines")] = ref(self.OUTLINES)
+            catalog[NameObject("/PageMode")] = NameObject("/UseOutlines")
+        self._write_object(self.OUTLINES, outlines)
+
+        # The page tree and xref table are the only parts that grow with the
+        # document; write them in slices instead of building them whole.
+        self._offsets[self.PAGES] = self.pos
+        self._write(b"%d 0 obj\n<< /Type /Pages /Count %d /Kids [" % (self.PAGES, len(self._kids)))
+        for start in range(0, len(self._kids), WRITE_SLICE):
+            self._write(b"".join(b"%d 0 R " % num for num in self._kids[start:start + WRITE_SLICE]))
+        self._write(b"] >>\nendobj\n")
+        self._write_object(self.CATALOG, catalog)
+
+        info_dict = dict(self._info or {})
+        info_dict.update(info or {})
+        info_num = self._allocate()
+        self._write_object(info_num, DictionaryObject({
+            NameObject(k): v if hasattr(v, "write_to_stream") else TextStringObject(v)
+            for k, v in info_dict.items()
+        }))
+
+        xref = self.pos
+        self._write(b"xref\n0 %d\n0000000000 65535 f \n" % len(self._offsets))
+        for start in range(1, len(self._offsets), WRITE_SLICE):
+            self._write(b"".join(b"%010d 00000 n \n" % offset for offset in self._offsets[start:start + WRITE_SLICE]))
+        self._write(
+            b"trailer\n<< /Size %d /Root %d 0 R /Info %d 0 R >>\nstartxref\n%d\n%%%%EOF\n"
+            % (len(self._offsets), self.CATALOG, info_num, xref)
+        )
+
+
+def stream_build(flowables, out, options=None, part_pages=DEFAULT_PART_PAGES, on_part=None, title=None):
+    """
+    Lay out ``flowables`` (any iterable) part by part into the binary stream ``out``.
+
+    ``on_part(pages_so_far)`` is called after each part is written. ``title``
+    replaces the playbook's document title. Returns the page count.
+    """
+    from pypdf import PdfReader
+    from reportlab import rl_config
+    from reportlab.pdfgen.canvas import Canvas
+
+    from playbook_fonts import measured_text
+
+    stream = playbook.FlowableStream(flowables)
+    # Streamed documents rarely repeat their text: cache no markup, line
+    # breaks or word widths, so memory stays flat however many pages are laid out.
+    paragraphs = playbook.ParagraphCache(max_entries=0, text_metrics=False)
+    writer = StreamingPdfWriter(out)
+    doc_class = part_doc_template()
+    settings = playbook.doc_settings(options)
+    if title is not None:
+        settings["title"] = title
+    epoch = options.creation_timestamp() if options is not None else None
+    base_canvas = playbook._timestamped_canvas(epoch) if epoch is not None else Canvas
+
+    use_a85 = rl_config.useA85
+    if epoch is not None:
+        # As in render(): compact builds write raw Flate streams.
+        rl_config.useA85 = 0
+    # The scope covers the whole loop: the stream pulls the next part's
+    # flowables (and so builds their paragraphs) before each part is laid out.
+    try:
+        with playbook.paragraph_cache(paragraphs), measured_text(paragraphs.text_metrics):
+            while True:
+                stream.paused = False
+                if not len(stream):
+                    break
+                buf = io.BytesIO()
+                doc = doc_class(buf, **settings)
+                doc.build(stream, part_pages, canvasmaker=_part_canvas(base_canvas, writer.page_count + 1))
+                writer.add_part(PdfReader(buf))
+                # The finished part's document, canvas and reader are reference
+                # cycles; free them now rather than whenever the collector gets to it.
+                del doc, buf
+                gc.collect()
+                if on_part is not None:
+                    on_part(writer.page_count)
+    finally:
+        rl_config.useA85 = use_a85
+
+    writer.close({"/Title": settings["title"], "/Author": settings["author"]})
+    return writer.page_count
+
+
+def stream_playbook(output=None, options=None, sections=None, part_pages=DEFAULT_PART_PAGES, page_numbers=None):
+    """
+    Stream the playbook to ``output`` (a path, a binary stream, or None for bytes).
+
+    ``sections`` may be any iterable of section dicts, e.g. a generator over a
+    large client export; it defaults to the playbook's own sections. With
+    the default sections, heading pages are remembered in ``page_numbers``
+    (default: ``page_number_cache()``) for the next build's table of contents.
+    """
+    options = options or playbook.PlaybookOptions()
+    compiled = playbook.get_compiled(options.locale)
+    toc_pages = layout = None
+    if sections is None:
+        page_numbers = page_numbers or playbook.page_number_cache()
+        layout = playbook.layout_key(options)
+        toc_pages = page_numbers.get(layout)
+    page_log = {} if layout is not None else None
+    flowables = compiled.iter_flowables(options, None, toc_pages, page_log, sections)
+
+    if output is None:
+        buf = io.BytesIO()
+        stream_build(flowables, buf, options, part_pages)
+        result = buf.getvalue()
+    elif hasattr(output, "write"):
+        stream_build(flowables, output, options, part_pages)
+        result = None
+    else:
+        with open(output, "wb") as f:
+            stream_build(flowables, f, options, part_pages)
+        result = None
+
+    if layout is not None:
+        page_numbers.put(layout, page_log)
+    return result
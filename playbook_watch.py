@@ -0,0 +1,129 @@
+"""
+Watch mode for the IRS Audit Defense Playbook.
+
+Polls the content source (``playbook_content.py``) and rebuilds the PDF each
+time it is saved. Sections are hashed to report which ones an edit touched;
+the rebuild goes through a ``playbook_fragments.FragmentCache``, so only the
+page runs whose content changed are laid out again and every other run's
+pages are reused. An edit that fails to import, fails ``playbook_check`` or
+fails to lay out (say, a table cell too tall for the page) is reported, the
+previous PDF is left in place, and watching continues.
+
+    python generate_irs_audit_defense_playbook.py --watch -o playbook.pdf
+
+Requires pypdf (``pip install pypdf``).
+"""
+
+import hashlib
+import importlib
+import importlib.util
+import json
+import os
+import sys
+import time
+
+import generate_irs_audit_defense_playbook as playbook
+import playbook_content
+
+# Seconds between checks of the content source's modification time
+POLL_INTERVAL = 0.25
+
+
+def section_hashes(sections):
+    """Map each section id to a hash of its definition."""
+    return {
+        section["id"]: hashlib.sha256(json.dumps(section, sort_keys=True).encode("utf-8")).hexdigest()
+        for section in sections
+    }
+
+
+def changed_sections(before, after):
+    """Ids of sections added or edited between two ``section_hashes`` maps, in document order, plus removed ones."""
+    changed = [section_id for section_id, digest in after.items() if before.get(section_id) != digest]
+    return changed + [section_id for section_id in before if section_id not in after]
+
+
+class Watcher:
+    """Rebuilds ``output`` from the current content source whenever it changes."""
+
+    def __init__(self, output, options=None, fragments=None, log=sys.stdout):
+        from playbook_fragments import FragmentCache
+
+        self.output = output
+        self.options = options or playbook.PlaybookOptions()
+        self.fragments = fragments or FragmentCache()
+        self.log = log
+        self.source = playbook_content.__file__
+        self.hashes = {}
+        self.mtime = None
+
+    def _source_mtime(self):
+        try:
+            return os.stat(self.source).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def rebuild(self):
+        """Reload the content and rebuild; returns the changed section ids, or None if the edit was rejected."""
+        from playbook_check import check_sections
+
+        started = time.perf_counter()
+        # The bytecode cache validates by whole-second mtime and size, which
+        # two quick saves of the same length would both match.
+        try:
+            os.remove(importlib.util.cache_from_source(self.source))
+        except OSError:
+            pass
+        try:
+            content = importlib.reload(playbook_content)
+        except Exception as e:
+            print(f"❌ {os.path.basename(self.source)}: {type(e).__name__}: {e}", file=self.log)
+            return None
+
+        report = check_sections(content.SECTIONS)
+        if not report.ok:
+            for problem in report.problems:
+                print(f"❌ {problem}", file=self.log)
+            return None
+
+        hashes = section_hashes(content.SECTIONS)
+        changed = changed_sections(self.hashes, hashes)
+        compiled = playbook._compiled
+        playbook._compiled = playbook.compile_playbook(content.SECTIONS)
+        playbook._localized.clear()
+
+        misses = self.fragments.misses
+        try:
+            # Laid out in full before anything is written, so a failure leaves the last good PDF.
+            playbook.build_playbook(self.output, self.options, fragments=self.fragments)
+        except Exception as e:
+            playbook._compiled = compiled
+            playbook._localized.clear()
+            print(f"❌ Rebuild failed, keeping the previous PDF: {type(e).__name__}: {e}", file=self.log)
+            return None
+        # Only a successful build moves the baseline that edits are reported against.
+        self.hashes = hashes
+        rendered = self.fragments.misses - misses
+        elapsed = time.perf_counter() - started
+        what = "all sections" if len(changed) == len(hashes) else ", ".join(changed) or "no section changes"
+        print(f"🔄 Rebuilt {self.output} in {elapsed:.2f}s: {what} ({rendered} page run{'' if rendered == 1 else 's'} re-rendered)", file=self.log)
+        return changed
+
+    def poll(self):
+        """Rebuild if the content source changed since the last poll; returns True if it did."""
+        mtime = self._source_mtime()
+        if mtime is None or mtime == self.mtime:
+            return False
+        self.mtime = mtime
+        self.rebuild()
+        return True
+
+    def run(self, interval=POLL_INTERVAL):
+        """Poll until interrupted."""
+        print(f"👀 Watching {self.source} (Ctrl+C to stop)", file=self.log)
+        try:
+            while True:
+                self.poll()
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,50 @@
+import dataclasses
+import os
+import subprocess
+import sys
+from datetime import date, datetime
+
+import pytest
+
+pytest.importorskip("reportlab")
+
+import generate_irs_audit_defense_playbook as playbook  # noqa: E402
+from conftest import EFFECTIVE_DATE  # noqa: E402
+
+
+def test_compact_builds_are_byte_identical(options):
+    first = playbook.build_playbook(options=options)
+    assert playbook.build_playbook(options=options) == first
+    assert bytes(playbook.build_playbook(options=options, as_view=True)) == first
+
+
+def test_compact_bytes_do_not_depend_on_the_process(tmp_path, options):
+    # A fresh interpreter with another hash seed lays out and writes the same file.
+    output = tmp_path / "playbook.pdf"
+    subprocess.run(
+        [sys.executable, "generate_irs_audit_defense_playbook.py", "--no-cache", "--compact",
+         "--effective-date", EFFECTIVE_DATE.isoformat(), "-o", str(output)],
+        check=True, capture_output=True, env=dict(os.environ, PYTHONHASHSEED="123"),
+        cwd=os.path.dirname(os.path.abspath(playbook.__file__)),
+    )
+    assert output.read_bytes() == playbook.build_playbook(options=options)
+
+
+def test_compact_output_is_smaller_and_dated_by_its_timestamp(options):
+    compact = playbook.build_playbook(options=options)
+    default = playbook.build_playbook(options=dataclasses.replace(options, compact=False))
+    assert len(compact) < len(default)
+    assert b"D:20260115000000" in compact
+
+    stamped = playbook.build_playbook(options=dataclasses.replace(options, timestamp=datetime(2026, 2, 1, 9, 30)))
+    assert b"D:20260201093000" in stamped
+    assert len(stamped) == len(compact)
+
+
+def test_personalized_builds_differ(options):
+    letter = dataclasses.replace(
+        options, client_name="Jane Doe", notice_code="CP2000", notice_date=date(2026, 1, 5),
+        classification="INFORMATION REQUEST",
+    )
+    assert playbook.build_playbook(options=letter) != playbook.build_playbook(options=options)
+    assert letter.response_deadline() == date(2026, 2, 4)
@@ -0,0 +1,30 @@
+import os
+
+import pytest
+
+from playbook_batch import output_name, run_batch
+from playbook_packet import packet_name
+
+
+@pytest.mark.parametrize("output, expected", [
+    ("jane.pdf", "jane.pdf"),
+    ("../../x.pdf", "x.pdf"),
+    ("/etc/x.pdf", "x.pdf"),
+    ("..\\..\\x.pdf", "x.pdf"),
+    ("reports/", "00003_Jane_Doe.pdf"),
+    ("..", "00003_Jane_Doe.pdf"),
+])
+def test_output_names_stay_in_the_output_directory(output, expected):
+    record = {"client_name": "Jane Doe", "output": output}
+    assert output_name(3, record) == expected
+    assert packet_name(3, record) == expected.replace("Doe.pdf", "Doe_packet.pdf")
+
+
+def test_batch_writes_only_inside_output_dir(tmp_path):
+    manifest = tmp_path / "clients.csv"
+    manifest.write_text("client_name,output\nJane Doe,../../escaped.pdf\nJohn Roe,\n")
+    out = tmp_path / "deep" / "out"
+    report = run_batch(str(manifest), str(out), workers=1)
+    assert report.succeeded == 2
+    assert sorted(os.listdir(out)) == ["00001_John_Roe.pdf", "escaped.pdf"]
+    assert not (tmp_path / "escaped.pdf").exists()
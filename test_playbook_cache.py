@@ -0,0 +1,51 @@
+import dataclasses
+import os
+import time
+
+import pytest
+
+pytest.importorskip("reportlab")
+
+import generate_irs_audit_defense_playbook as playbook  # noqa: E402
+from playbook_cache import RenderCache  # noqa: E402
+
+
+def test_unchanged_build_is_served_from_the_cache(cache_dir, options):
+    cache = RenderCache(str(cache_dir))
+    first = playbook.build_playbook(options=options, cache=cache)
+    # A first build may lay the table of contents out twice, looking up each pass.
+    misses = cache.misses
+    assert cache.hits == 0 and misses >= 1
+
+    assert playbook.build_playbook(options=options, cache=cache) == first
+    assert (cache.hits, cache.misses) == (1, misses)
+
+    # Anything that changes the output is a different key.
+    playbook.build_playbook(options=dataclasses.replace(options, client_name="Jane Doe"), cache=cache)
+    assert cache.hits == 1 and cache.misses > misses
+    assert first == playbook.build_playbook(options=options)
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = RenderCache(str(tmp_path), max_bytes=250)
+    for n, key in enumerate(("a", "b", "c")):
+        cache.put(key, bytes(100))
+        os.utime(tmp_path / f"{key}.pdf", (time.time() - 100 + n, time.time() - 100 + n))
+    assert sorted(os.listdir(tmp_path)) == ["b.pdf", "c.pdf"]
+
+    assert cache.get("b") == bytes(100)  # now the most recent
+    cache.put("d", bytes(100))
+    assert sorted(os.listdir(tmp_path)) == ["b.pdf", "d.pdf"]
+    assert cache.get("a") is None and cache.misses == 1
+
+
+def test_spliced_and_direct_builds_are_cached_apart(cache_dir, options):
+    pytest.importorskip("pypdf")
+    from playbook_fragments import FragmentCache
+
+    cache = RenderCache(str(cache_dir))
+    direct = playbook.build_playbook(options=options, cache=cache)
+    spliced = playbook.build_playbook(options=options, cache=cache, fragments=FragmentCache())
+    assert spliced != direct
+    assert spliced == playbook.build_playbook(options=options, fragments=FragmentCache())
+    assert playbook.build_playbook(options=options, cache=cache) == direct
@@ -0,0 +1,90 @@
+import copy
+import io
+
+import pytest
+
+import playbook_diff
+from playbook_content import CLASSIFICATION_RULES, SECTIONS, classification_rows
+from playbook_diff import diff_sections
+
+
+def table_sections(rows, shift=0):
+    """One section holding an ``rows``-row table; ``shift`` changes every value and rotates the order."""
+    body = [[f"R{i}", f"value {i + shift}"] for i in range(rows)]
+    if shift:
+        body = body[shift:] + body[:shift]
+    return [{"id": "big", "heading": "BIG", "blocks": [{"type": "table", "header": ["Code", "Value"], "rows": body}]}]
+
+
+def test_threshold_edit_is_reported_as_one_cell():
+    rules = copy.deepcopy(CLASSIFICATION_RULES)
+    rules[0]["escalate_over"] = 7500
+    new = copy.deepcopy(SECTIONS)
+    table = next(s for s in new if s["id"] == "classification")["blocks"][2]
+    table["rows"] = classification_rows(rules)
+
+    diff = diff_sections(SECTIONS, new)
+    assert diff.compared == 1
+    assert diff.changed_sections == ["classification"]
+    [change] = diff.changes
+    assert change.kind == "changed"
+    assert change.where.endswith("row “INFORMATION REQUEST”")
+    assert (change.old, change.new) == ("Manager review if &gt; $5K change", "Manager review if &gt; $7K change")
+
+
+def test_added_and_removed_sections():
+    new = [s for s in SECTIONS if s["id"] != "training"] + [{"id": "appendix", "heading": "APPENDIX", "blocks": []}]
+    diff = diff_sections(SECTIONS, new)
+    assert diff.compared == 0
+    assert [(c.section_id, c.kind) for c in diff.changes] == [("appendix", "added"), ("training", "removed")]
+    assert diff_sections(SECTIONS, copy.deepcopy(SECTIONS)).changes == []
+
+
+def test_diff_work_grows_linearly(monkeypatch):
+    # Every row changed and moved is the worst case for pairwise matching.
+    calls = {"hash": 0, "key": 0}
+    content_hash, row_key = playbook_diff.content_hash, playbook_diff._row_key
+
+    def counting_hash(value):
+        calls["hash"] += 1
+        return content_hash(value)
+
+    def counting_key(row, position):
+        calls["key"] += 1
+        return row_key(row, position)
+
+    monkeypatch.setattr(playbook_diff, "content_hash", counting_hash)
+    monkeypatch.setattr(playbook_diff, "_row_key", counting_key)
+
+    work = {}
+    for rows in (1000, 4000):
+        calls.update(hash=0, key=0)
+        diff = diff_sections(table_sections(rows), table_sections(rows, shift=7))
+        assert len(diff.changes) == rows
+        assert all(change.kind == "changed" for change in diff.changes)
+        work[rows] = calls["hash"] + calls["key"]
+    assert work[4000] <= 4 * work[1000] + 20
+
+
+def test_plain_text_cells_keep_their_characters_in_the_change_log():
+    PdfReader = pytest.importorskip("pypdf").PdfReader
+
+    new = copy.deepcopy(SECTIONS)
+    info = next(block for block in new[0]["blocks"] if block["type"] == "info_table")
+    info["rows"][2][1] = "Killeen & Temple, <Texas>"
+    diff = diff_sections(SECTIONS, new)
+    [change] = diff.changes
+    assert change.new == "Killeen &amp; Temple, &lt;Texas&gt;"
+
+    pdf = playbook_diff.render_change_log(None, diff, "HEAD", "working tree")
+    text = PdfReader(io.BytesIO(pdf)).pages[0].extract_text()
+    assert "Killeen & Temple, <Texas>" in text.replace("\n", " ")
+
+
+def test_content_without_sections_is_reported(tmp_path, capsys):
+    module = tmp_path / "notes.py"
+    module.write_text("NOTES = []\n")
+    with pytest.raises(ValueError, match="defines no SECTIONS"):
+        playbook_diff.load_sections(str(module))
+    assert playbook_diff.main([str(module)]) == 1
+    assert "❌" in capsys.readouterr().out
@@ -0,0 +1,34 @@
+import dataclasses
+
+import pytest
+
+pytest.importorskip("reportlab")
+
+import generate_irs_audit_defense_playbook as playbook  # noqa: E402
+import playbook_fonts  # noqa: E402
+from playbook_bench import text_metrics_comparison  # noqa: E402
+
+
+@pytest.mark.parametrize("changes", [{}, {"locale": "es"}, {"client_name": "Jane Doe", "notice_code": "CP2000"}])
+def test_text_metric_caches_do_not_change_the_bytes(options, changes):
+    options = dataclasses.replace(options, **changes)
+    outputs = []
+    for text_metrics in (False, True, True):  # uncached, cold, warm
+        if len(outputs) < 2:
+            playbook_fonts.clear()
+        with playbook.paragraph_cache(playbook.ParagraphCache(text_metrics=text_metrics)):
+            outputs.append(playbook.build_playbook(options=options))
+    assert outputs[1] == outputs[0]
+    assert outputs[2] == outputs[0]
+
+
+def test_bench_comparison_reports_identical_renders():
+    assert text_metrics_comparison(["stock"], repeat=2)["stock"]["identical"]
+
+
+def test_string_width_matches_reportlab():
+    from reportlab.pdfbase.pdfmetrics import stringWidth
+
+    for font in ("Helvetica", "Helvetica-Bold", "Times-Roman"):
+        for text in ("IRS Audit Defense", "Ross Tax Prep & Bookkeeping — §7602", ""):
+            assert playbook_fonts.string_width(text, font, 10.5) == stringWidth(text, font, 10.5)
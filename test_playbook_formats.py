@@ -0,0 +1,37 @@
+import subprocess
+import sys
+
+import generate_irs_audit_defense_playbook as playbook
+from playbook_cache import RenderCache
+from playbook_formats import build_format, content_sections, render_formats
+
+
+def test_web_editions_do_not_import_reportlab():
+    script = (
+        "import sys\n"
+        "from generate_irs_audit_defense_playbook import PlaybookOptions\n"
+        "from playbook_formats import build_format\n"
+        "build_format('html')\n"
+        "build_format('markdown', options=PlaybookOptions(locale='es'))\n"
+        "loaded = sorted(m for m in sys.modules if m.startswith('reportlab'))\n"
+        "assert not loaded, loaded\n"
+    )
+    subprocess.run([sys.executable, "-c", script], check=True)
+
+
+def test_editions_follow_the_locale():
+    english = render_formats(playbook.PlaybookOptions())
+    spanish = render_formats(playbook.PlaybookOptions(locale="es"))
+    assert "IRS AUDIT DEFENSE PLAYBOOK" in english["markdown"]
+    assert "MANUAL DE DEFENSA ANTE AUDITORÍAS DEL IRS" in spanish["markdown"]
+    assert 'lang="es"' in spanish["html"]
+    assert content_sections("es") != content_sections("en")
+
+
+def test_one_miss_caches_every_format(cache_dir):
+    cache = RenderCache(str(cache_dir))
+    html = build_format("html", cache=cache)
+    markdown = build_format("markdown", cache=cache)
+    assert cache.hits == 1
+    assert build_format("html", cache=cache) == html
+    assert markdown.startswith("# ")
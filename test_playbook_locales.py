@@ -0,0 +1,28 @@
+import pytest
+
+import generate_irs_audit_defense_playbook as playbook
+from playbook_batch import run_locales
+from playbook_locales import check_locale, localize_sections, translate
+
+
+@pytest.mark.parametrize("value, message", [(",", "at least one locale"), ("en,fr", "unknown locale(s) for --locales: fr")])
+def test_bad_locales_are_usage_errors(value, message, capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        playbook.main(["--locales", value])
+    assert exit_info.value.code == 2
+    assert message in capsys.readouterr().err
+
+
+def test_run_locales_rejects_bad_lists(tmp_path):
+    with pytest.raises(ValueError):
+        run_locales([], str(tmp_path / "playbook.pdf"))
+    with pytest.raises(ValueError):
+        run_locales(["fr"], str(tmp_path / "playbook.pdf"))
+
+
+def test_default_locale_is_untranslated():
+    from playbook_content import SECTIONS
+
+    assert check_locale(None) == "en"
+    assert localize_sections(SECTIONS, "en") is SECTIONS
+    assert translate("Sincerely,", "en") == "Sincerely,"
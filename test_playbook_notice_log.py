@@ -0,0 +1,64 @@
+import csv
+import subprocess
+import sys
+
+import pytest
+
+pytest.importorskip("pypdf")
+pytest.importorskip("reportlab")
+
+from pypdf import PdfReader  # noqa: E402
+
+from playbook_bench import RSS_TOLERANCE  # noqa: E402
+from playbook_notice_log import build_report, iter_csv_rows, main  # noqa: E402
+
+# Peak RSS in KiB of a report of ``rows`` synthetic returns, in a fresh process.
+RSS_SCRIPT = """
+import os, sys
+from playbook_metrics import peak_rss_kb
+from playbook_notice_log import build_report
+rows = ({"client_name": f"Client {i:06d} & Sons", "tax_year": "2025", "return_type": "1040",
+         "status": "filed", "date": "2026-01-15"} for i in range(int(sys.argv[1])))
+with open(os.devnull, "wb") as out:
+    build_report(rows, out)
+print(peak_rss_kb())
+"""
+
+
+def report_rss(rows):
+    result = subprocess.run([sys.executable, "-c", RSS_SCRIPT, str(rows)], check=True, capture_output=True, text=True)
+    return int(result.stdout)
+
+
+def test_every_row_is_reported_across_parts(tmp_path):
+    rows = [{"client_name": f"Client {i:04d} <LLC>", "tax_year": "2025", "status": "filed"} for i in range(1500)]
+    output = tmp_path / "log.pdf"
+    assert build_report(rows, str(output)) == 1500
+
+    reader = PdfReader(str(output))
+    assert len(reader.pages) > 50  # more than one streamed part
+    assert reader.metadata.title == "Notice Log: Returns"
+    text = "".join(page.extract_text() for page in reader.pages)
+    assert all(f"Client {i:04d} <LLC>" in text for i in range(1500))
+    # The header row repeats on every page.
+    assert all(page.extract_text().startswith("Client\nTax Year") for page in reader.pages[1:])
+
+
+def test_csv_report_from_the_command_line(tmp_path, capsys):
+    source = tmp_path / "returns.csv"
+    with open(source, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["client_name", "tax_year", "return_type", "status", "date_filed"])
+        writer.writerow(["Jane Doe", "2025", "1040", "filed", "2026-01-15"])
+    assert next(iter_csv_rows(str(source)))["date"] == "2026-01-15"
+    assert main(["--csv", str(source), "-o", str(tmp_path / "log.pdf")]) == 0
+    assert "1 rows" in capsys.readouterr().out
+    assert "Jane Doe" in PdfReader(str(tmp_path / "log.pdf")).pages[0].extract_text()
+
+
+def test_peak_rss_does_not_grow_with_rows():
+    # The smaller report already fills several parts. Holding every page
+    # until the end, as an unstreamed build does, grows about 16% over this range.
+    small, large = report_rss(1000), report_rss(8000)
+    growth = large / small - 1
+    assert growth <= RSS_TOLERANCE, f"peak RSS grew {growth:.1%} from 1000 to 8000 rows"
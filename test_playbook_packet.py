@@ -0,0 +1,85 @@
+from datetime import date
+
+import pytest
+
+pytest.importorskip("pypdf")
+pytest.importorskip("reportlab")
+
+from pypdf import PdfReader  # noqa: E402
+
+import generate_irs_audit_defense_playbook as playbook  # noqa: E402
+from playbook_packet import build_packet, packet_documents  # noqa: E402
+
+
+def inherited_pdf():
+    """
+    A two-page PDF, like a scanner's, whose pages carry no /MediaBox,
+    /Resources or /Rotate of their own: both inherit them from the /Pages
+    tree, the second through an intermediate node that adds a /CropBox.
+    """
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R 7 0 R] /Count 2 /MediaBox [0 0 300 400] /Rotate 90"
+        b" /Resources << /Font << /F1 4 0 R >> >> >>",
+        b"<< /Type /Page /Parent 2 0 R /Contents 5 0 R >>",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+        None,
+        b"<< /Type /Page /Parent 7 0 R /Contents 5 0 R >>",
+        b"<< /Type /Pages /Parent 2 0 R /Kids [6 0 R] /Count 1 /CropBox [10 10 290 390] >>",
+    ]
+    content = b"BT /F1 12 Tf 20 200 Td (Scanned receipt) Tj ET"
+    objects[4] = b"<< /Length %d >>\nstream\n%s\nendstream" % (len(content), content)
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+@pytest.fixture
+def options():
+    return playbook.PlaybookOptions(
+        effective_date=date(2026, 1, 15), client_name="Jane Doe", notice_code="CP2000", compact=True
+    )
+
+
+def test_packet_pages_keep_inherited_attributes(tmp_path, options):
+    source = tmp_path / "scan.pdf"
+    source.write_bytes(inherited_pdf())
+    output = tmp_path / "packet.pdf"
+
+    report = build_packet(str(output), options, packet_documents([str(source)]))
+
+    reader = PdfReader(str(output))
+    assert len(reader.pages) == report.front_pages + 2
+    for page in reader.pages[report.front_pages:]:
+        # The output's /Pages node has none of these: each must be on the page itself.
+        assert [float(v) for v in page["/MediaBox"]] == [0, 0, 300, 400]
+        assert page["/Rotate"] == 90
+        assert "/F1" in page["/Resources"]["/Font"]
+        assert "Scanned receipt" in page.extract_text()
+    assert "/CropBox" not in reader.pages[report.front_pages]
+    assert [float(v) for v in reader.pages[-1]["/CropBox"]] == [10, 10, 290, 390]
+
+
+def test_packet_index_and_outline(tmp_path, options):
+    source = tmp_path / "scan.pdf"
+    source.write_bytes(inherited_pdf())
+    output = tmp_path / "packet.pdf"
+
+    documents = packet_documents([{"title": "Receipts", "path": str(source)}, str(source)])
+    report = build_packet(str(output), options, documents)
+
+    assert [d.pages for d in report.documents] == [2, 2]
+    assert report.documents[0].first_page == report.front_pages + 1
+    assert report.documents[1].page_range == f"{report.front_pages + 3}-{report.front_pages + 4}"
+    reader = PdfReader(str(output))
+    titles = [item.title for item in reader.outline if not isinstance(item, list)]
+    assert titles == ["Cover Letter", "Evidence Index", "Receipts", "scan"]
+    assert reader.get_destination_page_number(reader.outline[2]) == report.front_pages
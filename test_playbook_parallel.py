@@ -0,0 +1,42 @@
+import io
+
+import pytest
+
+pytest.importorskip("pypdf")
+pytest.importorskip("reportlab")
+
+from pypdf import PdfReader  # noqa: E402
+
+import generate_irs_audit_defense_playbook as playbook  # noqa: E402
+from playbook_parallel import parallel_playbook  # noqa: E402
+
+# Headroom over a single-process build for the running headers and footers
+SIZE_OVERHEAD = 1.35
+
+
+def test_parallel_build_matches_direct_build(options):
+    direct = PdfReader(io.BytesIO(playbook.build_playbook(options=options)))
+    stitched = PdfReader(io.BytesIO(parallel_playbook(options=options, workers=2)))
+
+    assert len(stitched.pages) == len(direct.pages)
+    assert [item.title for item in stitched.outline] == [item.title for item in direct.outline]
+    assert stitched.pages[1].extract_text().endswith("Page 2 of %d\n" % len(direct.pages))
+
+
+def test_compact_parallel_build_is_reproducible(options):
+    assert bytes(parallel_playbook(options=options, workers=1)) == bytes(parallel_playbook(options=options, workers=3))
+
+
+def test_stitched_file_shares_fonts_and_compresses_pages(options):
+    direct = playbook.build_playbook(options=options)
+    stitched = bytes(parallel_playbook(options=options, workers=2))
+    reader = PdfReader(io.BytesIO(stitched))
+
+    fonts = set()
+    for page in reader.pages:
+        assert page["/Contents"].get_object()["/Filter"] == "/FlateDecode"
+        for ref in page["/Resources"]["/Font"].values():
+            fonts.add(ref.idnum)
+    base_fonts = {reader.get_object(idnum)["/BaseFont"] for idnum in fonts}
+    assert len(fonts) == len(base_fonts)
+    assert len(stitched) <= SIZE_OVERHEAD * len(direct), f"{len(stitched)} bytes vs {len(direct)}"
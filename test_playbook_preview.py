@@ -0,0 +1,76 @@
+import json
+
+import pytest
+
+pytest.importorskip("pypdf")
+pytest.importorskip("pypdfium2")
+pytest.importorskip("PIL")
+pytest.importorskip("reportlab")
+
+from PIL import Image  # noqa: E402
+
+import generate_irs_audit_defense_playbook as playbook  # noqa: E402
+from playbook_preview import build_previews, index_path  # noqa: E402
+
+
+def thumbnail(pdf, page, width):
+    with open(index_path(str(pdf)), encoding="utf-8") as f:
+        index = json.load(f)
+    return Image.open(pdf.parent / index["pages"][page]["files"][str(width)]).convert("RGB")
+
+
+def test_previews_are_drawn_once_per_page(tmp_path, options):
+    pdf = tmp_path / "playbook.pdf"
+    playbook.build_playbook(str(pdf), options)
+    first = build_previews(str(pdf), widths=(80, 160))
+    assert first.drawn == first.pages > 1
+    again = build_previews(str(pdf), widths=(80, 160))
+    assert again.drawn == 0 and again.reused == first.pages
+
+    cover = thumbnail(pdf, 0, 160)
+    assert cover.width == 160 and abs(cover.height - 160 * 11 / 8.5) <= 1
+    # The navy title is drawn as text, not as a grey bar.
+    assert any(r < 80 and b > r for _count, (r, g, b) in cover.getcolors(1 << 16))
+
+
+def test_images_and_clipping_are_rendered(tmp_path):
+    from reportlab.lib.utils import ImageReader
+    from reportlab.pdfgen.canvas import Canvas
+
+    pdf = tmp_path / "scan.pdf"
+    canvas = Canvas(str(pdf), pagesize=(200, 100))
+    canvas.drawImage(ImageReader(Image.new("RGB", (4, 4), (200, 0, 0))), 0, 0, 100, 100)
+    clip = canvas.beginPath()
+    clip.rect(100, 0, 50, 100)
+    canvas.clipPath(clip, stroke=0)
+    canvas.setFillColorRGB(0, 0, 1)
+    canvas.rect(100, 0, 100, 100, stroke=0, fill=1)
+    canvas.save()
+
+    build_previews(str(pdf), widths=(200,))
+    image = thumbnail(pdf, 0, 200)
+    red, blue, clipped = image.getpixel((50, 50)), image.getpixel((125, 50)), image.getpixel((175, 50))
+    assert red[0] > 150 and red[1] < 60
+    assert blue[2] > 150 and blue[0] < 60
+    assert clipped == (255, 255, 255)
+
+
+def test_page_hash_covers_boxes_and_graphics_states(tmp_path):
+    from pypdf import PdfReader
+    from reportlab.pdfgen.canvas import Canvas
+
+    from playbook_preview import page_hash
+
+    def page(alpha=0.5, cropbox=None):
+        pdf = tmp_path / "page.pdf"
+        canvas = Canvas(str(pdf), pagesize=(200, 100))
+        if cropbox:
+            canvas.setCropBox(cropbox)
+        canvas.setFillAlpha(alpha)  # drawn through an /ExtGState resource, not the content stream
+        canvas.rect(0, 0, 100, 100, stroke=0, fill=1)
+        canvas.save()
+        return page_hash(PdfReader(str(pdf)).pages[0])
+
+    assert page() == page()
+    assert page(alpha=0.8) != page()
+    assert page(cropbox=(0, 0, 100, 100)) != page()
@@ -0,0 +1,115 @@
+import importlib.util
+import json
+
+import pytest
+
+pytest.importorskip("pypdf")
+
+from pypdf import PdfReader  # noqa: E402
+
+import playbook_protect  # noqa: E402
+from playbook_batch import run_batch  # noqa: E402
+from playbook_protect import protect_pdf, recipient_password, require_cipher, signature_path, verify_signature  # noqa: E402
+
+# AES needs cryptography; RC4 lets the signature tests run without it.
+ALGORITHM = "AES-256" if importlib.util.find_spec("cryptography") else "RC4-128"
+
+
+@pytest.fixture(autouse=True)
+def keys(monkeypatch):
+    monkeypatch.setenv(playbook_protect.KEY_ENV, "11" * 32)
+    monkeypatch.setattr(playbook_protect, "_keys", None)
+    return playbook_protect.load_keys()
+
+
+@pytest.fixture
+def protected(tmp_path, options):
+    import generate_irs_audit_defense_playbook as playbook
+
+    path = str(tmp_path / "jane_doe.pdf")
+    protect_pdf(playbook.build_playbook(options=options), path, "Jane Doe", algorithm=ALGORITHM)
+    return path
+
+
+def test_protected_pdf_opens_with_recipient_password(protected):
+    reader = PdfReader(protected)
+    assert reader.is_encrypted
+    assert reader.decrypt(recipient_password("  jane  DOE ")) != 0
+    assert "IRS AUDIT DEFENSE PLAYBOOK" in reader.pages[0].extract_text()
+
+
+def test_signature_verifies(protected):
+    assert verify_signature(protected) is None
+    with open(signature_path(protected), encoding="utf-8") as f:
+        signature = json.load(f)
+    assert signature["file"] == "jane_doe.pdf"
+    assert "ENCRYPTION_KEY" not in json.dumps(signature)
+
+
+@pytest.mark.parametrize("tamper, problem", [
+    (lambda data: data[:-10], "signature mismatch"),
+    (lambda data: data.replace(b"/Encrypt", b"/Encrypq", 1), "signature mismatch"),
+])
+def test_altered_files_fail_verification(protected, tamper, problem):
+    with open(protected, "rb") as f:
+        data = f.read()
+    with open(protected, "wb") as f:
+        f.write(tamper(data))
+    assert verify_signature(protected) == problem
+
+
+def test_swapped_or_unsigned_files_fail_verification(protected, tmp_path, monkeypatch):
+    other = str(tmp_path / "john_roe.pdf")
+    with open(protected, "rb") as src, open(other, "wb") as dst:
+        dst.write(src.read())
+    assert verify_signature(other) == "no signature"
+    with open(signature_path(protected), "rb") as src, open(signature_path(other), "wb") as dst:
+        dst.write(src.read())
+    assert verify_signature(other) == "signature mismatch"
+
+    monkeypatch.setenv(playbook_protect.KEY_ENV, "22" * 32)
+    monkeypatch.setattr(playbook_protect, "_keys", None)
+    assert verify_signature(protected).startswith("signed with another key")
+
+
+@pytest.mark.skipif(importlib.util.find_spec("cryptography") is not None, reason="cryptography is installed")
+def test_missing_cipher_fails_before_the_pool_starts(tmp_path):
+    manifest = tmp_path / "clients.csv"
+    manifest.write_text("client_name\nJane Doe\n")
+    with pytest.raises(ValueError, match="requires cryptography"):
+        run_batch(str(manifest), str(tmp_path / "out"), protect=True)
+    require_cipher("RC4-128")
+
+
+def test_manifest_recipients_match_the_batch(tmp_path):
+    manifest = tmp_path / "clients.csv"
+    manifest.write_text("client_name,notice_code,recipient,output\nJane Doe,CP2000,,\nJohn Roe,,Roe Trust,roe.pdf\n,,,\n")
+    recipients = playbook_protect.manifest_recipients(str(manifest))
+    assert recipients["00000_Jane_Doe_CP2000.pdf"] == "Jane Doe"
+    assert recipients["00000_Jane_Doe_CP2000_packet.pdf"] == "Jane Doe"
+    assert recipients["roe.pdf"] == "Roe Trust"
+    assert "00002_client.pdf" not in recipients
+
+
+@pytest.mark.parametrize("args, message", [
+    ([], "--recipient or --manifest is required"),
+    (["--manifest", "MANIFEST"], "not built from"),
+])
+def test_cli_needs_a_recipient_for_every_file(protected, tmp_path, capsys, args, message):
+    manifest = tmp_path / "clients.csv"
+    manifest.write_text("client_name\nJohn Roe\n")
+    args = [str(manifest) if arg == "MANIFEST" else arg for arg in args]
+    with pytest.raises(SystemExit) as exit_info:
+        playbook_protect.main([protected] + args)
+    assert exit_info.value.code == 2
+    assert message in capsys.readouterr().err
+
+
+@pytest.mark.skipif(importlib.util.find_spec("cryptography") is None, reason="AES needs cryptography")
+def test_cli_derives_the_batch_password_from_the_manifest(tmp_path):
+    manifest = tmp_path / "clients.csv"
+    manifest.write_text("client_name,notice_code\nJane Doe,CP2000\n")
+    report = run_batch(str(manifest), str(tmp_path), workers=1)
+    [path] = report.outputs
+    assert playbook_protect.main([path, "--manifest", str(manifest), "--workers", "1"]) == 0
+    assert PdfReader(path).decrypt(recipient_password("Jane Doe")) != 0
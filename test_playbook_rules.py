@@ -0,0 +1,89 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from playbook_rules import InvalidNotices, NoticeRules, main, read_columns, typed_columns  # noqa: E402
+
+
+def evaluate(**columns):
+    return NoticeRules().evaluate({name: np.array(values) for name, values in columns.items()})
+
+
+def test_deadlines_and_matrix_escalation():
+    decisions = evaluate(
+        classification=["INFORMATION REQUEST", "INFORMATION REQUEST", "AUDIT NOTICE (High Risk)"],
+        notice_date=["2026-01-15", "2026-01-15", "2026-01-15"],
+        amount=["$4,999", "$5,000.01", ""],
+    )
+    assert list(np.datetime_as_string(decisions.deadline)) == ["2026-02-14", "2026-02-14", "2026-01-30"]
+    assert list(decisions.escalate) == [False, True, True]
+    assert list(decisions.escalate_to) == ["", "Manager review", "Legal counsel"]
+    assert np.isinf(decisions.respond_within_hours).all()
+
+
+def test_trigger_only_escalation_names_the_trigger_owner():
+    decisions = evaluate(
+        classification=["INFORMATION REQUEST"] * 3,
+        notice_date=["2026-01-15"] * 3,
+        amount=["100"] * 3,
+        penalty_amount=["20000", "20000", "0"],
+        criminal_referral=["no", "yes", "no"],
+    )
+    assert list(decisions.escalate) == [True, True, False]
+    assert list(decisions.escalate_to) == ["Legal counsel", "Criminal tax attorney", ""]
+    assert list(decisions.respond_within_hours[:2]) == [2, 0]
+
+
+def test_bad_rows_are_reported_by_index():
+    with pytest.raises(InvalidNotices) as error:
+        evaluate(
+            classification=["INFORMATION REQUEST", "PARKING TICKET", "INFORMATION REQUEST"],
+            notice_date=["2026-01-15", "2026-01-15", "2026-13-45"],
+            amount=["$5000", "five grand", "1"],
+        )
+    assert error.value.problems == [
+        (1, "classification", "PARKING TICKET", "unknown notice classification"),
+        (1, "amount", "five grand", "not a dollar amount"),
+        (2, "notice_date", "2026-13-45", "not a YYYY-MM-DD date"),
+    ]
+    assert isinstance(error.value, ValueError)
+
+
+def test_cli_reports_bad_rows(tmp_path, capsys):
+    notices = tmp_path / "notices.csv"
+    notices.write_text("classification,notice_date,amount\nINFORMATION REQUEST,2026-01-15,$6000\nINFORMATION REQUEST,soon,1\n")
+    assert main([str(notices)]) == 1
+    assert "❌ Row 1 (notice_date 'soon'): not a YYYY-MM-DD date" in capsys.readouterr().err
+
+    notices.write_text("classification,notice_date,amount\nINFORMATION REQUEST,2026-01-15,$6000\n")
+    decisions = NoticeRules().evaluate(typed_columns(read_columns(notices)))
+    assert list(decisions.escalate_to) == ["Manager review"]
+
+
+def test_blank_and_partial_dates_are_reported():
+    with pytest.raises(InvalidNotices) as error:
+        evaluate(
+            classification=["INFORMATION REQUEST"] * 4,
+            notice_date=["2026-01-15", "", "2026-01", "2026"],
+            specified_deadline=["", "", "2026-02-30", ""],
+        )
+    assert error.value.problems == [
+        (1, "notice_date", "", "missing date"),
+        (2, "notice_date", "2026-01", "not a YYYY-MM-DD date"),
+        (2, "specified_deadline", "2026-02-30", "not a YYYY-MM-DD date"),
+        (3, "notice_date", "2026", "not a YYYY-MM-DD date"),
+    ]
+
+
+@pytest.mark.parametrize("missing", ["classification", "notice_date"])
+def test_missing_required_columns(tmp_path, capsys, missing):
+    columns = {"classification": ["INFORMATION REQUEST"], "notice_date": ["2026-01-15"]}
+    del columns[missing]
+    with pytest.raises(InvalidNotices) as error:
+        evaluate(**columns)
+    assert error.value.problems == [(None, missing, "", "missing required column")]
+
+    notices = tmp_path / "notices.csv"
+    notices.write_text(",".join(columns) + "\n" + ",".join(v[0] for v in columns.values()) + "\n")
+    assert main([str(notices)]) == 1
+    assert f"❌ Header ({missing} ''): missing required column" in capsys.readouterr().err
@@ -0,0 +1,113 @@
+import asyncio
+import json
+import os
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+pytest.importorskip("reportlab")
+
+from playbook_server import MAX_BODY, RenderServer  # noqa: E402
+
+
+async def exchange(port, raw):
+    """Send one raw request; returns (status, headers, body)."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(raw)
+    await writer.drain()
+    data = await reader.read()
+    writer.close()
+    head, _, body = data.partition(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    headers = dict(line.split(": ", 1) for line in lines[1:])
+    return int(lines[0].split()[1]), headers, body
+
+
+def post(port, body, content_length=None):
+    if isinstance(body, (dict, list)):
+        body = json.dumps(body).encode()
+    length = len(body) if content_length is None else content_length
+    raw = f"POST /render HTTP/1.1\r\nConnection: close\r\nContent-Length: {length}\r\n\r\n".encode() + body
+    return exchange(port, raw)
+
+
+def get(port, target):
+    return exchange(port, f"GET {target} HTTP/1.1\r\nConnection: close\r\n\r\n".encode())
+
+
+def serve(test, pass_server=False, **kwargs):
+    async def run():
+        server = RenderServer(port=0, workers=1, **kwargs)
+        await server.start()
+        try:
+            await test(server if pass_server else server.port)
+        finally:
+            await server.close()
+
+    asyncio.run(run())
+
+
+def test_render_and_health():
+    async def test(port):
+        status, headers, body = await post(port, {"client_name": "Jane Doe", "notice_code": "CP2000"})
+        assert status == 200
+        assert headers["Content-Type"] == "application/pdf"
+        assert body.startswith(b"%PDF-")
+        status, _headers, body = await get(port, "/render?client_name=Jane+Doe")
+        assert status == 200 and body.startswith(b"%PDF-")
+        status, _headers, body = await get(port, "/healthz")
+        assert status == 200 and json.loads(body)["status"] == "ok"
+        status, _headers, _body = await get(port, "/nowhere")
+        assert status == 404
+
+    serve(test)
+
+
+@pytest.mark.parametrize("body, content_length, error", [
+    (b"{not json", None, "body must be JSON"),
+    (b"[1, 2]", None, "body must be a JSON object"),
+    ({"client_name": 5}, None, "client_name must be a string"),
+    ({"notice_date": "2026-13-45"}, None, "does not match format"),
+    (b"{}", "abc", "invalid Content-Length"),
+    (b"{}", -5, "invalid Content-Length"),
+])
+def test_bad_requests_get_400(body, content_length, error):
+    async def test(port):
+        status, _headers, response = await post(port, body, content_length)
+        assert status == 400
+        assert error in json.loads(response)["error"]
+
+    serve(test)
+
+
+def test_oversize_body_gets_413():
+    async def test(port):
+        status, _headers, response = await post(port, b"{}", MAX_BODY + 1)
+        assert status == 413
+        assert json.loads(response)["error"] == "request body too large"
+
+    serve(test)
+
+
+def test_dead_worker_is_replaced():
+    async def test(server):
+        # Kill the only worker the way the OOM killer would.
+        with pytest.raises(BrokenProcessPool):
+            await asyncio.get_running_loop().run_in_executor(server._pool, os._exit, 1)
+        status, _headers, body = await post(server.port, {"client_name": "Jane Doe"})
+        assert status == 200 and body.startswith(b"%PDF-")
+
+    serve(test, pass_server=True)
+
+
+def test_full_queue_gets_503():
+    async def test(port):
+        # One render in progress and one waiting fill the server; the rest are refused.
+        results = await asyncio.gather(*(post(port, {"client_name": f"Client {n}"}) for n in range(6)))
+        statuses = sorted(status for status, _headers, _body in results)
+        assert statuses[0] == 200
+        assert 503 in statuses
+        refused = next(headers for status, headers, _body in results if status == 503)
+        assert refused["Retry-After"] == "1"
+
+    serve(test, queue_size=1)
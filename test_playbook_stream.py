@@ -0,0 +1,43 @@
+import io
+
+import pytest
+
+pytest.importorskip("pypdf")
+pytest.importorskip("reportlab")
+
+from pypdf import PdfReader  # noqa: E402
+
+import generate_irs_audit_defense_playbook as playbook  # noqa: E402
+from playbook_bench import RSS_TOLERANCE, streamed_rss  # noqa: E402
+from playbook_stream import stream_playbook  # noqa: E402
+
+
+def outline(reader):
+    return [(item.title, reader.get_destination_page_number(item)) for item in reader.outline]
+
+
+@pytest.mark.parametrize("part_pages", [50, 2])
+def test_streamed_build_matches_direct_build(options, part_pages):
+    direct = PdfReader(io.BytesIO(playbook.build_playbook(options=options)))
+    streamed = PdfReader(io.BytesIO(stream_playbook(options=options, part_pages=part_pages)))
+
+    assert len(streamed.pages) == len(direct.pages)
+    for streamed_page, direct_page in zip(streamed.pages, direct.pages):
+        assert streamed_page.extract_text() == direct_page.extract_text()
+    assert outline(streamed) == outline(direct)
+    assert streamed.metadata.title == direct.metadata.title
+
+
+def test_streamed_build_writes_to_a_stream(options):
+    out = io.BytesIO()
+    assert stream_playbook(out, options) is None
+    assert out.getvalue() == stream_playbook(options=options)
+
+
+@pytest.mark.parametrize("pages", [2000, pytest.param(10000, marks=pytest.mark.slow)])
+def test_streamed_peak_rss_stays_flat(pages):
+    # Each size is built in a fresh process; see playbook_bench.py --rss.
+    # 10000 pages take a few minutes, so that size runs only with --run-slow.
+    rss = streamed_rss((10, pages))
+    growth = rss[pages] / rss[10] - 1
+    assert growth <= RSS_TOLERANCE, f"peak RSS grew {growth:.1%} from 10 to {pages} pages"
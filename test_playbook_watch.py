@@ -0,0 +1,91 @@
+import importlib.util
+import io
+import os
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("pypdf")
+pytest.importorskip("reportlab")
+
+from pypdf import PdfReader  # noqa: E402
+
+import generate_irs_audit_defense_playbook as playbook  # noqa: E402
+import playbook_content  # noqa: E402
+import playbook_watch  # noqa: E402
+from playbook_watch import Watcher  # noqa: E402
+
+PURPOSE = "All IRS notices must be immediately classified"
+SECTIONS = "SECTIONS = ["
+EXAMPLES = "CP2000, Math verification, Routine inquiry"
+
+
+@pytest.fixture
+def source(tmp_path, monkeypatch):
+    """A copy of the content module for the watcher to reload, so edits never touch the real one."""
+    path = tmp_path / "watched_content.py"
+    shutil.copy(playbook_content.__file__, path)
+    monkeypatch.syspath_prepend(str(tmp_path))  # importlib.reload looks the module up by name
+    spec = importlib.util.spec_from_file_location("watched_content", path)
+    module = importlib.util.module_from_spec(spec)
+    monkeypatch.setitem(sys.modules, "watched_content", module)
+    spec.loader.exec_module(module)
+    monkeypatch.setattr(playbook_watch, "playbook_content", module)
+    monkeypatch.setattr(playbook, "_compiled", None)
+    yield path
+    playbook._localized.clear()
+
+
+def edit(path, old, new):
+    text = path.read_text(encoding="utf-8")
+    assert old in text
+    path.write_text(text.replace(old, new, 1), encoding="utf-8")
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+def pdf_text(path):
+    return "".join(page.extract_text() for page in PdfReader(io.BytesIO(path.read_bytes())).pages)
+
+
+@pytest.fixture
+def watcher(source, tmp_path, options):
+    log = io.StringIO()
+    watcher = Watcher(str(tmp_path / "playbook.pdf"), options, log=log)
+    assert watcher.poll()
+    assert not watcher.poll()
+    return watcher
+
+
+def test_good_edit_rebuilds_only_what_changed(source, watcher):
+    edit(source, PURPOSE, "All IRS notices must be promptly classified")
+    assert watcher.poll()
+    assert "promptly classified" in pdf_text(Path(watcher.output))
+    assert watcher.log.getvalue().splitlines()[-1].startswith(f"🔄 Rebuilt {watcher.output}")
+    assert watcher.log.getvalue().splitlines()[-1].endswith(": classification (1 page run re-rendered)")
+
+
+@pytest.mark.parametrize("old, new, message", [
+    (SECTIONS, "SECTIONS = [[", "❌ watched_content.py: SyntaxError"),
+    (PURPOSE, PURPOSE + " <b>unclosed", "❌ classification"),
+    (EXAMPLES, "word " * 2500, "❌ Rebuild failed, keeping the previous PDF: LayoutError"),
+], ids=["import", "check", "layout"])
+def test_broken_edit_keeps_the_last_good_pdf(source, watcher, old, new, message):
+    output = Path(watcher.output)
+    good = output.read_bytes()
+    log_lines = len(watcher.log.getvalue().splitlines())
+
+    edit(source, old, new)
+    assert watcher.poll()
+    assert output.read_bytes() == good
+    report = watcher.log.getvalue().splitlines()[log_lines:]
+    assert report and report[0].startswith(message)
+    assert not any(line.startswith("🔄") for line in report)
+
+    # Fixing the edit rebuilds, and reports the change against the last good content.
+    edit(source, new, old)
+    assert watcher.poll()
+    assert watcher.log.getvalue().splitlines()[-1].endswith("no section changes (0 page runs re-rendered)")
+    assert output.read_bytes() == good